@@ -0,0 +1 @@
+"""Offline benchmarks for the treasury scanners: a mock RPC server and a harness."""
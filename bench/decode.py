@@ -0,0 +1,88 @@
+"""Compare full and slim decoding of getTransaction batch responses.
+
+Builds JSON-RPC batch responses from the mock history, decodes them with
+``json.loads`` and with the slim schema decoder (see ``treasury.schema``) and
+reports the parse time and the memory the decoded transactions hold, per
+transaction. It also checks that the extractors return the same records from
+either decoding.
+
+    python -m bench.decode --transactions 5000 --batch-size 100
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from treasury.config import TREASURY_WALLET
+from treasury.extract import analyze_transaction, extract_sol_transfers
+from treasury.schema import msgspec, reply_decoder
+
+from .mock_rpc import DEFAULT_FIXTURES, MockHistory, load_templates
+
+
+def batch_bodies(history, batch_size):
+    """Serialized batch responses covering the whole history"""
+    entries = history.signatures
+    return [json.dumps([{"jsonrpc": "2.0", "id": i, "result": history.transaction(entry["signature"])}
+                        for i, entry in enumerate(entries[start:start + batch_size])]).encode()
+            for start in range(0, len(entries), batch_size)]
+
+
+def measure(decode, bodies):
+    """Seconds to decode every body, and bytes held by the decoded results"""
+    gc.collect()
+    started = time.perf_counter()
+    for body in bodies:
+        decode(body)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    decoded = [decode(body) for body in bodies]
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, held, decoded
+
+
+def records(decoded):
+    found = []
+    for body in decoded:
+        for reply in body:
+            tx_data = reply["result"]
+            found.append((extract_sol_transfers(tx_data, TREASURY_WALLET), analyze_transaction(tx_data, TREASURY_WALLET)))
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare full and slim decoding of getTransaction responses")
+    parser.add_argument("--transactions", type=int, default=5000, help="transactions to decode")
+    parser.add_argument("--batch-size", type=int, default=100, help="transactions per batch response")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="recorded transactions (txns.json format)")
+    args = parser.parse_args(argv)
+    if msgspec is None:
+        print("msgspec is not installed, so slim decoding falls back to json.loads")
+        return 1
+
+    bodies = batch_bodies(MockHistory(load_templates(args.fixtures), args.transactions), args.batch_size)
+    size = sum(map(len, bodies))
+    print(f"{args.transactions} transactions in {len(bodies)} batches, {size / 1024 / 1024:.1f} MB of JSON\n")
+    print(f"{'decoder':<10}{'us/tx':>9}{'KB/tx held':>12}")
+    results = {}
+    for name, decode in (("json", json.loads), ("slim", reply_decoder())):
+        elapsed, held, decoded = measure(decode, bodies)
+        results[name] = (elapsed, held, records(decoded))
+        print(f"{name:<10}{elapsed / args.transactions * 1e6:>9.1f}{held / args.transactions / 1024:>12.2f}")
+
+    (full_time, full_held, full_records), (slim_time, slim_held, slim_records) = results.values()
+    print(f"\nslim decoding is {full_time / slim_time:.1f}x faster and holds {full_held / slim_held:.1f}x less memory")
+    if full_records != slim_records:
+        print("FAILED: the extractors returned different records from slim transactions")
+        return 1
+    print("The extractors returned identical records from both")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
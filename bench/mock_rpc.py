@@ -0,0 +1,480 @@
+"""Local mock Solana JSON-RPC server for offline benchmarks.
+
+Serves ``getBalance``, ``getSignaturesForAddress`` and ``getTransaction``
+(singly or as JSON-RPC batches) from a synthetic history built out of the
+recorded transactions in ``txns.json``: each synthetic signature gets a copy
+of one recorded transaction with its own signature, slot and block time, so
+the payloads have exactly the shapes the scanners parse. Every address shares
+the same history, newest first. Every slot up to the newest transaction's
+has a block holding a few signatures of other transactions, plus the
+history's transaction in that slot if there is one; ``getSlot``,
+``getFirstAvailableBlock``, ``getBlocksWithLimit`` and ``getBlock`` (with
+``"transactionDetails": "signatures"``) report them, and pagination accepts
+any of their signatures as ``before``/``until`` cursors, resolved within
+the block by transaction index as a node resolves them (or by signature
+bytes, with ``--block-order bytes``, to check what relies on either). ``"encoding": "base64"`` gets the transaction
+re-encoded to wire format (this needs solders); any other encoding gets the
+recorded jsonParsed payload. ``MockRpcServer.bytes_sent`` tallies the
+response bytes.
+
+The same URL also accepts WebSocket connections for ``logsSubscribe`` and
+``accountSubscribe``; ``MockRpcServer.emit`` lands new transactions at the
+head of the history and notifies subscribers, and ``drop_connections``
+simulates a provider disconnect.
+
+Latency, 429 responses, node errors and a batch size cap can be injected, all
+driven by a seeded RNG so runs are repeatable:
+
+    python -m bench.mock_rpc --transactions 5000 --latency 0.02 --rate-429 0.02
+
+``MockRpcServer`` can also run inside another process (see ``bench.run``).
+"""
+import argparse
+import asyncio
+import base64
+import bisect
+import copy
+import hashlib
+import json
+import os
+import random
+import threading
+from collections import Counter
+
+import base58
+from aiohttp import web
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "txns.json")
+DEFAULT_BALANCE = 24_271_238_714
+NEWEST_SLOT = 330_000_000
+NEWEST_BLOCK_TIME = 1_744_605_287
+# Signatures of other transactions in each transaction's block
+BLOCK_PADDING = 3
+
+
+def load_templates(path=DEFAULT_FIXTURES):
+    """Recorded transactions from a ``txns.json``-style dump ({"signature", "data"} items)"""
+    with open(path) as f:
+        return [item["data"] for item in json.load(f) if item.get("data")]
+
+
+def encode_transaction(tx):
+    """Re-encode a recorded jsonParsed transaction as a base64 ``getTransaction`` result.
+
+    Parsed System transfers are compiled back to their instruction data; other
+    parsed instructions, whose raw data jsonParsed drops, get empty data.
+    """
+    from solders.hash import Hash
+    from solders.instruction import CompiledInstruction
+    from solders.message import Message
+    from solders.pubkey import Pubkey
+    from solders.signature import Signature
+    from solders.transaction import Transaction
+
+    keys = [key for key in tx["transaction"]["message"]["accountKeys"]
+            if key.get("source", "transaction") == "transaction"]
+    index = {key["pubkey"]: i for i, key in enumerate(keys)}
+
+    def compile_instruction(instruction):
+        parsed = instruction.get("parsed")
+        if isinstance(parsed, dict) and instruction.get("program") == "system" and parsed.get("type") == "transfer":
+            info = parsed["info"]
+            accounts = [index[info["source"]], index[info["destination"]]]
+            data = (2).to_bytes(4, "little") + int(info["lamports"]).to_bytes(8, "little")
+        elif parsed is None:
+            accounts = [index[account] for account in instruction.get("accounts", [])]
+            data = base58.b58decode(instruction.get("data", ""))
+        else:
+            accounts, data = [], b""
+        return index[instruction["programId"]], accounts, data
+
+    message = Message.new_with_compiled_instructions(
+        sum(key["signer"] for key in keys),
+        sum(key["signer"] and not key["writable"] for key in keys),
+        sum(not key["signer"] and not key["writable"] for key in keys),
+        [Pubkey.from_string(key["pubkey"]) for key in keys],
+        Hash.from_string(tx["transaction"]["message"]["recentBlockhash"]),
+        [CompiledInstruction(program, data, bytes(accounts))
+         for program, accounts, data in map(compile_instruction, tx["transaction"]["message"]["instructions"])])
+    signatures = [Signature.from_string(signature) for signature in tx["transaction"]["signatures"]]
+    wire = bytes(Transaction.populate(message, signatures))
+
+    def compiled_json(instruction):
+        program, accounts, data = compile_instruction(instruction)
+        return {"programIdIndex": program, "accounts": accounts, "data": base58.b58encode(data).decode(),
+                "stackHeight": instruction.get("stackHeight")}
+
+    # Inner instructions come compiled too, as the json encoding renders them
+    meta = dict(tx["meta"])
+    meta["innerInstructions"] = [{"index": group["index"],
+                                  "instructions": [compiled_json(instruction) for instruction in group["instructions"]]}
+                                 for group in meta.get("innerInstructions") or []]
+    return {**tx, "meta": meta, "transaction": [base64.b64encode(wire).decode(), "base64"]}
+
+
+def synthetic_signature(index):
+    """Deterministic base58 signature for the index-th transaction"""
+    return base58.b58encode(hashlib.sha512(f"bench-{index}".encode()).digest()).decode()
+
+
+def padding_signature(slot, index):
+    """Deterministic base58 signature for another transaction in a slot's block; it ends with the slot"""
+    digest = hashlib.sha512(f"block-{slot}-{index}".encode()).digest()
+    return base58.b58encode(digest[:56] + slot.to_bytes(8, "big")).decode()
+
+
+class MockHistory:
+    """``count`` synthetic transactions, newest first, cycling through the templates.
+
+    Every ``failed_every``-th transaction is marked failed in both its
+    signature entry and its metadata. Each one sits at its own position among
+    its block's other signatures; ``block_order`` is how pagination orders
+    them within the slot, ``"index"`` as the block lists them (as nodes do)
+    or ``"bytes"`` by signature bytes.
+    """
+
+    def __init__(self, templates, count, failed_every=7, block_order="index"):
+        self.templates = templates
+        self.failed_every = failed_every
+        self.block_order = block_order
+        self.signatures = [self._entry(i, NEWEST_SLOT - i * 3, NEWEST_BLOCK_TIME - i * 2) for i in range(count)]
+        self.serial = {entry["signature"]: i for i, entry in enumerate(self.signatures)}
+        self._reindex()
+        self._transactions = {}
+        self._encoded = {}
+
+    def _entry(self, serial, slot, block_time):
+        failed = bool(self.failed_every) and serial % self.failed_every == self.failed_every - 1
+        return {
+            "signature": synthetic_signature(serial),
+            "slot": slot,
+            "blockTime": block_time,
+            "err": {"InstructionError": [0, "Custom"]} if failed else None,
+            "memo": None,
+            "confirmationStatus": "finalized"
+        }
+
+    def _reindex(self):
+        self.index = {entry["signature"]: i for i, entry in enumerate(self.signatures)}
+        self.slots = [entry["slot"] for entry in reversed(self.signatures)]  # Ascending
+
+    def add(self, count=1, block_time=None):
+        """Land ``count`` new transactions at the head of the history and return their entries"""
+        newest = self.signatures[0] if self.signatures else {"slot": NEWEST_SLOT, "blockTime": NEWEST_BLOCK_TIME}
+        added = []
+        for _ in range(count):
+            serial = len(self.serial)
+            entry = self._entry(serial, newest["slot"] + 3, block_time or newest["blockTime"] + 2)
+            self.serial[entry["signature"]] = serial
+            added.append(entry)
+            newest = entry
+        self.signatures[:0] = reversed(added)
+        self._reindex()
+        return added
+
+    def page(self, before=None, until=None, limit=1000):
+        start = self._older_than(before) if before else 0
+        end = self._older_than(until) - (until in self.index) if until else len(self.signatures)
+        return self.signatures[start:min(end, start + limit)]
+
+    @property
+    def head_slot(self):
+        return self.slots[-1] if self.slots else NEWEST_SLOT
+
+    def _older_than(self, signature):
+        """Index of the first entry older than a signature from the history or any block"""
+        if signature in self.index:
+            return self.index[signature] + 1
+        raw = base58.b58decode(signature)
+        slot = int.from_bytes(raw[-8:], "big")
+        # Entries are newest first and at most one per slot, so only the slot's own can be on either side
+        index = len(self.slots) - bisect.bisect_right(self.slots, slot)
+        if index < len(self.signatures) and self.signatures[index]["slot"] == slot and \
+                self._newer_in_block(self.signatures[index]["signature"], signature):
+            index += 1
+        return index
+
+    def _position(self, signature):
+        """Where a history entry sits among the other signatures of its block"""
+        return self.serial[signature] % (BLOCK_PADDING + 1)
+
+    def _newer_in_block(self, signature, other):
+        """Whether a history entry comes after another signature of its block"""
+        if self.block_order == "bytes":
+            return base58.b58decode(signature) > base58.b58decode(other)
+        slot = int.from_bytes(base58.b58decode(other)[-8:], "big")
+        padding = [padding_signature(slot, i) for i in range(BLOCK_PADDING)]
+        return self._position(signature) > padding.index(other)
+
+    def blocks(self, start, limit):
+        """Slots with a block, from ``start`` on, ascending"""
+        return list(range(start, min(start + limit, self.head_slot + 1)))
+
+    def block(self, slot):
+        """A slot's block with its signatures, or None past the newest slot"""
+        if slot > self.head_slot:
+            return None
+        signatures = [padding_signature(slot, i) for i in range(BLOCK_PADDING)]
+        index = len(self.slots) - bisect.bisect_right(self.slots, slot)
+        if index < len(self.signatures) and self.signatures[index]["slot"] == slot:
+            signature = self.signatures[index]["signature"]
+            signatures.insert(self._position(signature), signature)
+        return {"blockHeight": slot, "parentSlot": slot - 1, "signatures": signatures}
+
+    def transaction(self, signature, encoding="jsonParsed"):
+        if signature not in self.index:
+            return None
+        if encoding == "base64":
+            if signature not in self._encoded:
+                self._encoded[signature] = encode_transaction(self.transaction(signature))
+            return self._encoded[signature]
+        if signature not in self._transactions:
+            entry = self.signatures[self.index[signature]]
+            tx = copy.deepcopy(self.templates[self.serial[signature] % len(self.templates)])
+            tx["transaction"]["signatures"] = [signature]
+            tx["slot"] = entry["slot"]
+            tx["blockTime"] = entry["blockTime"]
+            tx["meta"]["err"] = entry["err"]
+            self._transactions[signature] = tx
+        return self._transactions[signature]
+
+
+class MockRpcServer:
+    """aiohttp JSON-RPC server over a ``MockHistory`` with injected faults.
+
+    ``latency`` (plus up to ``jitter``) is slept per HTTP request. Each
+    request is answered with HTTP 429 with probability ``rate_429``, and
+    each JSON-RPC item with a -32005 node error with probability
+    ``error_rate``. Batches larger than ``max_batch`` get HTTP 413.
+    ``counts`` tallies what was served, by method and outcome, and
+    ``http_requests`` the HTTP POSTs it came in (a batch is one).
+    """
+
+    def __init__(self, history, latency=0.0, jitter=0.0, rate_429=0.0, error_rate=0.0, max_batch=None,
+                 retry_after=None, balance=DEFAULT_BALANCE, seed=0):
+        self.history = history
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.error_rate = error_rate
+        self.max_batch = max_batch
+        self.retry_after = retry_after
+        self.balance = balance
+        self.random = random.Random(seed)
+        self.counts = Counter()
+        self.http_requests = 0
+        self.bytes_sent = 0
+        # Open WebSocket -> {subscription id: (method, params)}
+        self.subscribers = {}
+        self._next_subscription = 0
+        self.url = None
+        self._runner = None
+        self._thread = None
+        self._loop = None
+
+    def _answer(self, request):
+        method = request.get("method")
+        params = request.get("params") or []
+        reply = {"jsonrpc": "2.0", "id": request.get("id")}
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.counts[f"{method}:error"] += 1
+            reply["error"] = {"code": -32005, "message": "Node is behind by 42 slots"}
+            return reply
+
+        if method == "getBalance":
+            reply["result"] = {"context": {"slot": NEWEST_SLOT}, "value": self.balance}
+        elif method == "getSignaturesForAddress":
+            options = params[1] if len(params) > 1 else {}
+            reply["result"] = self.history.page(options.get("before"), options.get("until"),
+                                                options.get("limit", 1000))
+        elif method == "getTransaction":
+            options = params[1] if len(params) > 1 else {}
+            reply["result"] = self.history.transaction(params[0], options.get("encoding", "json"))
+        elif method == "getSlot":
+            reply["result"] = self.history.head_slot
+        elif method == "getFirstAvailableBlock":
+            reply["result"] = 0
+        elif method == "getBlocksWithLimit":
+            reply["result"] = self.history.blocks(params[0], params[1])
+        elif method == "getBlock":
+            block = self.history.block(params[0])
+            if block is None:
+                reply["error"] = {"code": -32004, "message": f"Block not available for slot {params[0]}"}
+                return reply
+            reply["result"] = block
+        else:
+            self.counts[f"{method}:unknown"] += 1
+            reply["error"] = {"code": -32601, "message": "Method not found"}
+            return reply
+        self.counts[method] += 1
+        return reply
+
+    async def handle(self, request):
+        self.http_requests += 1
+        body = await request.json()
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.rate_429 and self.random.random() < self.rate_429:
+            self.counts["http:429"] += 1
+            headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else None
+            return self._respond({"jsonrpc": "2.0", "error": {"code": 429, "message": "Too many requests"}},
+                                 status=429, headers=headers)
+
+        if isinstance(body, list):
+            if self.max_batch and len(body) > self.max_batch:
+                self.counts["http:413"] += 1
+                return self._respond({"error": "batch too large"}, status=413)
+            self.counts["batches"] += 1
+            return self._respond([self._answer(item) for item in body])
+        return self._respond(self._answer(body))
+
+    def _respond(self, payload, status=200, headers=None):
+        body = json.dumps(payload).encode()
+        self.bytes_sent += len(body)
+        return web.Response(body=body, status=status, headers=headers, content_type="application/json")
+
+    async def handle_ws(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.subscribers[ws] = {}
+        self.counts["ws:connect"] += 1
+        try:
+            async for message in ws:
+                if message.type != web.WSMsgType.TEXT:
+                    continue
+                call = json.loads(message.data)
+                reply = {"jsonrpc": "2.0", "id": call.get("id")}
+                if call.get("method") in ("logsSubscribe", "accountSubscribe"):
+                    self._next_subscription += 1
+                    self.subscribers[ws][self._next_subscription] = (call["method"], call.get("params") or [])
+                    self.counts[call["method"]] += 1
+                    reply["result"] = self._next_subscription
+                elif call.get("method") in ("logsUnsubscribe", "accountUnsubscribe"):
+                    reply["result"] = self.subscribers[ws].pop(call["params"][0], None) is not None
+                else:
+                    reply["error"] = {"code": -32601, "message": "Method not found"}
+                await ws.send_json(reply)
+        finally:
+            self.subscribers.pop(ws, None)
+        return ws
+
+    async def emit(self, count=1):
+        """Land new transactions and push notifications for them; return their entries"""
+        added = self.history.add(count)
+        for entry in added:
+            tx = self.history.transaction(entry["signature"])
+            keys = [key["pubkey"] if isinstance(key, dict) else key
+                    for key in tx["transaction"]["message"]["accountKeys"]]
+            for ws, subscriptions in list(self.subscribers.items()):
+                for subscription, (method, params) in subscriptions.items():
+                    if method == "logsSubscribe":
+                        value = {"signature": entry["signature"], "err": entry["err"],
+                                 "logs": tx["meta"].get("logMessages", [])}
+                        notification = "logsNotification"
+                    elif params and params[0] in keys and entry["err"] is None:
+                        # The account's balance after this transaction, as recorded
+                        value = {"lamports": tx["meta"]["postBalances"][keys.index(params[0])],
+                                 "owner": "11111111111111111111111111111111", "data": ["", "base64"],
+                                 "executable": False, "rentEpoch": 0}
+                        notification = "accountNotification"
+                    else:
+                        continue
+                    self.counts[f"ws:{notification}"] += 1
+                    await ws.send_json({"jsonrpc": "2.0", "method": notification, "params": {
+                        "result": {"context": {"slot": entry["slot"]}, "value": value},
+                        "subscription": subscription}})
+        return added
+
+    async def drop_connections(self):
+        """Close every WebSocket, as a provider restart would"""
+        for ws in list(self.subscribers):
+            await ws.close()
+
+    async def start(self, host="127.0.0.1", port=0):
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/", self.handle)
+        app.router.add_get("/", self.handle_ws)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{port}/"
+        return self.url
+
+    async def stop(self):
+        await self.drop_connections()
+        await self._runner.cleanup()
+
+    def start_in_thread(self, host="127.0.0.1", port=0):
+        """Serve from a background thread's event loop and return the URL"""
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start(host, port))
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=serve, name="mock-rpc", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.url
+
+    def stop_thread(self):
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+def add_server_arguments(parser):
+    """Mock history and fault-injection options, shared with the benchmark harness"""
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="recorded transactions (txns.json format)")
+    parser.add_argument("--transactions", type=int, default=2000, help="length of the synthetic history")
+    parser.add_argument("--failed-every", type=int, default=7, help="mark every Nth transaction failed (0: none)")
+    parser.add_argument("--block-order", choices=("index", "bytes"), default="index",
+                        help="how pagination orders signatures within a block (default: index, as nodes do)")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every HTTP request")
+    parser.add_argument("--jitter", type=float, default=0.01, help="extra random latency, up to this many seconds")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered with HTTP 429")
+    parser.add_argument("--retry-after", type=int, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with -32005")
+    parser.add_argument("--max-batch", type=int, help="reject JSON-RPC batches larger than this with HTTP 413")
+    parser.add_argument("--seed", type=int, default=0, help="seed for latency and fault injection")
+
+
+def server_from_args(args):
+    history = MockHistory(load_templates(args.fixtures), args.transactions, args.failed_every,
+                          args.block_order)
+    return MockRpcServer(history, latency=args.latency, jitter=args.jitter, rate_429=args.rate_429,
+                         error_rate=args.error_rate, max_batch=args.max_batch, retry_after=args.retry_after,
+                         seed=args.seed)
+
+
+async def serve_forever(server, host, port):
+    url = await server.start(host, port)
+    print(f"Mock Solana RPC serving {len(server.history.signatures)} transactions at {url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        print(dict(server.counts))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a synthetic Solana JSON-RPC history for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve_forever(server_from_args(args), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Measure the WebSocket monitor against the mock RPC server.
+
+The mock server and a ``TreasuryMonitor`` share one event loop. The mock
+lands ``--transactions`` new transactions ``--interval`` seconds apart and
+pushes notifications for them; the harness reports how long each took to
+come out of the monitor. Halfway through it drops every connection and lands
+``--missed`` more while the monitor is away, then checks that the reconnect
+backfill reported each of them exactly once.
+
+    python -m bench.monitor --transactions 50 --interval 0.05 --missed 10
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+
+from treasury.config import TREASURY_WALLET
+from treasury.monitor import TreasuryMonitor
+from treasury.rpc import RpcClient
+
+from .mock_rpc import DEFAULT_FIXTURES, MockHistory, MockRpcServer, load_templates
+from .run import percentile
+
+# How long to wait for the last records before calling them missing
+SETTLE_TIMEOUT = 10.0
+
+
+async def measure(transactions, interval, missed, latency):
+    history = MockHistory(load_templates(DEFAULT_FIXTURES), 100)
+    server = MockRpcServer(history, latency=latency)
+    url = await server.start()
+    emitted = {}
+    reported = Counter()
+    detected = {}
+    failed = set()
+
+    def extract(sig_data, tx_data):
+        # Every transaction counts here, not only those that move treasury SOL
+        return sig_data["signature"]
+
+    async def land(count):
+        for entry in await server.emit(count):
+            emitted[entry["signature"]] = time.perf_counter()
+            if entry["err"]:
+                failed.add(entry["signature"])
+
+    def expected():
+        return set(emitted) - failed
+
+    # "confirmed" fetches bypass the transaction cache, so there is none to open
+    async with RpcClient([url], cache=False) as client:
+        monitor = TreasuryMonitor(client, TREASURY_WALLET, urls=["ws" + url[len("http"):]], extract=extract)
+
+        async def consume():
+            async for signature in monitor.run():
+                reported[signature] += 1
+                detected.setdefault(signature, time.perf_counter() - emitted[signature])
+
+        consumer = asyncio.create_task(consume())
+        # Wait for the subscriptions and the starting watermark
+        while not server.subscribers or monitor.watermark is None:
+            await asyncio.sleep(0.01)
+        requests_before = sum(server.counts.values())
+
+        for i in range(transactions):
+            if missed and i == transactions // 2:
+                await server.drop_connections()
+                await land(missed)
+            await land(1)
+            await asyncio.sleep(interval)
+
+        deadline = time.perf_counter() + SETTLE_TIMEOUT
+        while not expected() <= set(reported) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+
+    await server.stop()
+    return {
+        "emitted": len(emitted),
+        "failed": len(failed),
+        "missing": sorted(expected() - set(reported)),
+        "duplicates": sorted(signature for signature, count in reported.items() if count > 1),
+        "backfilled": monitor.backfilled,
+        "latencies": [detected[signature] for signature in expected() if signature in detected],
+        "connections": monitor.connections,
+        "requests": sum(count for method, count in server.counts.items() if not method.startswith("ws:"))
+                    - requests_before
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the WebSocket monitor's detection latency and "
+                                                 "reconnect backfill against a mock RPC server")
+    parser.add_argument("--transactions", type=int, default=50, help="transactions landed while connected")
+    parser.add_argument("--interval", type=float, default=0.05, help="seconds between transactions")
+    parser.add_argument("--missed", type=int, default=10,
+                        help="transactions landed while the connection is down (0: never drop it)")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every HTTP request")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(measure(args.transactions, args.interval, args.missed, args.latency))
+    latencies = result["latencies"]
+    print(f"Landed {result['emitted']} transactions ({result['failed']} failed, skipped by the monitor) "
+          f"over {result['connections']} connections")
+    print(f"Detection latency: p50 {_ms(percentile(latencies, 50))} ms, p99 {_ms(percentile(latencies, 99))} ms, "
+          f"max {_ms(max(latencies, default=None))} ms")
+    print(f"{result['backfilled']} signatures backfilled after reconnecting, {result['requests']} HTTP requests")
+
+    problems = []
+    if result["missing"]:
+        problems.append(f"{len(result['missing'])} never reported, e.g. {result['missing'][0]}")
+    if result["duplicates"]:
+        problems.append(f"{len(result['duplicates'])} reported more than once, e.g. {result['duplicates'][0]}")
+    if problems:
+        print("\nFAILED: " + "; ".join(problems))
+        return 1
+    print("\nEvery transaction was reported exactly once")
+    return 0
+
+
+def _ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Run one ``treasury`` command with its RPC requests timed; started by ``bench.run``.
+
+Every ``RpcClient._post`` is timed, so latencies are as the scanner sees
+them, including the wait for a free connection slot. Instrumenting means
+importing ``treasury.rpc`` up front, so commands that never load aiohttp
+(``balance``) show its import cost in their RSS here. The timings, the
+command's own wall time and peak RSS are written as JSON to the file named
+by ``BENCH_STATS``.
+"""
+import json
+import os
+import resource
+import sys
+import time
+
+from treasury import rpc
+from treasury.cli import main
+
+
+def instrument(latencies):
+    post = rpc.RpcClient._post
+
+    async def timed_post(self, url, payload):
+        started = time.perf_counter()
+        try:
+            return await post(self, url, payload)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    rpc.RpcClient._post = timed_post
+
+
+def peak_rss_kb():
+    """High-water RSS of this process image.
+
+    ``ru_maxrss`` survives exec, so for a child forked from a large parent it
+    can report the parent's size; VmHWM only covers the current image.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+if __name__ == "__main__":
+    latencies = []
+    instrument(latencies)
+    started = time.perf_counter()
+    try:
+        status = main(sys.argv[1:])
+    finally:
+        with open(os.environ["BENCH_STATS"], "w") as f:
+            json.dump({"elapsed": time.perf_counter() - started, "latencies": latencies,
+                       "peak_rss_kb": peak_rss_kb()}, f)
+    sys.exit(status)
@@ -0,0 +1,113 @@
+"""Measure the memory held by transfer records as dicts and as compact records.
+
+Builds ``--records`` synthetic transfers, contributions and signature entries
+whose counterparties are drawn from ``--contributors`` distinct pubkeys, in
+the dict shapes the extractors return (parsed from JSON, so every string is
+its own object, as when they come off the wire). It then reports the bytes
+each list holds per record, as dicts and as the ``__slots__`` records of
+``treasury.records``, and the time to compare every counterparty against the
+treasury both ways.
+
+    python -m bench.records --records 100000 --contributors 300
+"""
+import argparse
+import gc
+import hashlib
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import base58
+
+from treasury.config import TREASURY_WALLET
+from treasury.extract import LAMPORTS_PER_SOL, format_timestamp
+from treasury.records import PUBKEYS, Contribution, SignatureRecord, Transfer
+
+from .mock_rpc import NEWEST_BLOCK_TIME, NEWEST_SLOT, synthetic_signature
+
+AMOUNTS = (250_000_000, 500_000_000, 1_000_000_000, 2_000_000_000)
+
+
+def pubkey(index):
+    return base58.b58encode(hashlib.sha256(f"contributor-{index}".encode()).digest()).decode()
+
+
+def synthetic_json(count, contributors, seed=0):
+    """JSON texts of (transfers, contributions, signature entries) in the extractors' shapes"""
+    rng = random.Random(seed)
+    senders = [pubkey(i) for i in range(contributors)]
+    transfers, contributions, entries = [], [], []
+    for i in range(count):
+        sender, lamports = rng.choice(senders), rng.choice(AMOUNTS)
+        signature, block_time = synthetic_signature(i), NEWEST_BLOCK_TIME - i * 2
+        transfers.append({
+            "timestamp": block_time, "formatted_time": format_timestamp(block_time), "signature": signature,
+            "balance_change": lamports / LAMPORTS_PER_SOL, "counterparty": sender, "is_system_transfer": True,
+            "description": f"Receive {lamports / LAMPORTS_PER_SOL} SOL from {sender}"
+        })
+        contributions.append({"sender": sender, "amount": lamports / LAMPORTS_PER_SOL,
+                              "time": format_timestamp(block_time), "timestamp": block_time, "signature": signature})
+        entries.append({"signature": signature, "slot": NEWEST_SLOT - i * 3, "blockTime": block_time, "err": None,
+                        "memo": None, "confirmationStatus": "finalized"})
+    return json.dumps(transfers), json.dumps(contributions), json.dumps(entries)
+
+
+def held_bytes(build):
+    """Bytes still allocated after ``build()`` returns, with its result kept alive"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return held, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the memory held by dict and compact transfer records")
+    parser.add_argument("--records", type=int, default=100_000, help="records of each kind")
+    parser.add_argument("--contributors", type=int, default=300, help="distinct counterparty pubkeys")
+    args = parser.parse_args(argv)
+
+    texts = synthetic_json(args.records, args.contributors)
+    rows = []
+    for name, convert, text in zip(("transfers", "contributions", "signatures"),
+                                   (Transfer.from_dict, Contribution.from_dict, SignatureRecord.from_entry), texts):
+        # Parsing gives every string its own object, as parsing a response does
+        dict_bytes, dicts = held_bytes(lambda: json.loads(text))
+        # Interned pubkeys and shared descriptions are built as the records are, so they are counted
+        compact_bytes, compact = held_bytes(lambda: [convert(record) for record in json.loads(text)])
+        expected = dicts[:1000] if name != "signatures" else [
+            {"signature": entry["signature"], "slot": entry["slot"], "block_time": entry["blockTime"],
+             "success": entry["err"] is None} for entry in dicts[:1000]]
+        if [record.to_dict() for record in compact[:1000]] != expected:
+            print(f"FAILED: {name} do not round-trip through the compact records")
+            return 1
+        rows.append((name, dict_bytes, compact_bytes))
+        del dicts, compact
+
+    million = 1_000_000 / args.records
+    print(f"{args.records} records of each kind, {args.contributors} distinct counterparties\n")
+    print(f"{'records':<15}{'dict MB/1M':>12}{'compact MB/1M':>15}{'ratio':>8}")
+    for name, dict_bytes, compact_bytes in rows:
+        print(f"{name:<15}{dict_bytes * million / 1024 / 1024:>12.0f}{compact_bytes * million / 1024 / 1024:>15.0f}"
+              f"{dict_bytes / compact_bytes:>7.1f}x")
+
+    transfers = json.loads(texts[0])
+    compact = [Transfer.from_dict(record) for record in transfers]
+    treasury_id = PUBKEYS.intern(TREASURY_WALLET)
+    started = time.perf_counter()
+    by_string = sum(record["counterparty"] == TREASURY_WALLET for record in transfers)
+    string_time = time.perf_counter() - started
+    started = time.perf_counter()
+    by_id = sum(record.counterparty == treasury_id for record in compact)
+    id_time = time.perf_counter() - started
+    assert by_string == by_id
+    print(f"\nkey == TREASURY over {args.records} transfers: {string_time * 1000:.1f} ms as strings, "
+          f"{id_time * 1000:.1f} ms as ids")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""Benchmark the scanner entry points against the local mock RPC server.
+
+Each scanner runs as ``python -m treasury <command>`` in its own process and
+scratch directory, with a fresh transaction cache, against a ``MockRpcServer``
+started in this process. For every run the harness reports:
+
+    tx/s      getTransaction results served, per second of command wall time
+    reqs      HTTP requests the mock served (a JSON-RPC batch is one)
+    p50/p99   RPC request latency as seen by the scanner
+    wire MB   response bytes the mock sent
+    peak RSS  high-water resident set size of the scanner process
+
+With several ``--encoding`` options each scanner runs once per transaction
+encoding (``SOLANA_TX_ENCODING``), reported as e.g. ``transfers/base64``.
+
+    python -m bench.run --transactions 5000 --rate-429 0.02 --save bench.json
+    python -m bench.run transfers incoming --encoding jsonParsed --encoding base64
+    python -m bench.run --baseline bench.json      # exit 1 on a tx/s regression
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from .mock_rpc import add_server_arguments, server_from_args
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_ENCODING = "jsonParsed"
+# Settings that change what the scanners are measured against
+SERVER_SETTINGS = ("transactions", "failed_every", "latency", "jitter", "rate_429", "retry_after", "error_rate",
+                   "max_batch", "seed")
+
+# Benchmark name -> treasury command line
+SCANNERS = {
+    "transfers": ["transfers"],
+    "incoming": ["incoming"],
+    "contributions": ["contributions"],
+    "examine": ["examine"],
+    "wallets": ["wallets"],
+    "signatures": ["signatures"],
+    "dump": ["dump", "--format", "full"],
+    "balance": ["balance"],
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers, None if it is empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def result_name(name, encoding):
+    return name if encoding == DEFAULT_ENCODING else f"{name}/{encoding}"
+
+
+def run_scanner(name, server, workdir, verbose=False, encoding=DEFAULT_ENCODING):
+    """Run one scanner to completion and return its measurements"""
+    stats_path = os.path.join(workdir, "bench_stats.json")
+    log_path = os.path.join(workdir, "output.log")
+    env = dict(os.environ,
+               SOLANA_RPC_URLS=server.url,
+               SOLANA_TX_CACHE=os.path.join(workdir, "tx_cache.sqlite3"),
+               SOLANA_WATERMARK_FILE=os.path.join(workdir, "sync_state.json"),
+               SOLANA_TX_ENCODING=encoding,
+               BENCH_STATS=stats_path,
+               PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+
+    served_before = server.counts["getTransaction"]
+    requests_before = server.http_requests
+    bytes_before = server.bytes_sent
+    with open(log_path, "w") as log:
+        process = subprocess.Popen([sys.executable, "-m", "bench.probe", *SCANNERS[name]], cwd=workdir, env=env,
+                                   stdout=None if verbose else log, stderr=subprocess.STDOUT)
+        process.wait()
+
+    if process.returncode != 0:
+        with open(log_path) as log:
+            tail = log.read()[-2000:]
+        raise RuntimeError(f"{name} exited with status {process.returncode}:\n{tail}")
+    with open(stats_path) as f:
+        stats = json.load(f)
+
+    transactions = server.counts["getTransaction"] - served_before
+    return {
+        "elapsed": stats["elapsed"],
+        "transactions": transactions,
+        "tx_per_sec": transactions / stats["elapsed"] if stats["elapsed"] else 0.0,
+        "requests": server.http_requests - requests_before,
+        "wire_mb": (server.bytes_sent - bytes_before) / 1024 / 1024,
+        "latencies": stats["latencies"],
+        "peak_rss_mb": stats["peak_rss_kb"] / 1024
+    }
+
+
+def benchmark(name, server, repeat=1, verbose=False, encoding=DEFAULT_ENCODING):
+    """Run a scanner ``repeat`` times; report the median run and pooled latencies"""
+    runs = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix=f"bench-{name}-") as workdir:
+            runs.append(run_scanner(name, server, workdir, verbose, encoding))
+    latencies = [latency for run in runs for latency in run["latencies"]]
+    median = sorted(runs, key=lambda run: run["elapsed"])[len(runs) // 2]
+    return {
+        "elapsed": median["elapsed"],
+        "transactions": median["transactions"],
+        "tx_per_sec": median["tx_per_sec"],
+        "requests": median["requests"],
+        "wire_mb": median["wire_mb"],
+        "p50_ms": _ms(percentile(latencies, 50)),
+        "p99_ms": _ms(percentile(latencies, 99)),
+        "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+        "elapsed_stdev": statistics.stdev(run["elapsed"] for run in runs) if repeat > 1 else 0.0
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else seconds * 1000
+
+
+def _fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def print_table(results):
+    width = max([14] + [len(name) + 2 for name in results])
+    print(f"{'scanner':<{width}}{'time s':>9}{'txs':>7}{'tx/s':>9}{'reqs':>7}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'wire MB':>9}{'RSS MB':>9}")
+    for name, result in results.items():
+        print(f"{name:<{width}}{result['elapsed']:>9.2f}{result['transactions']:>7}{result['tx_per_sec']:>9.1f}"
+              f"{result['requests']:>7}{_fmt(result['p50_ms'], '.1f'):>9}{_fmt(result['p99_ms'], '.1f'):>9}"
+              f"{_fmt(result.get('wire_mb'), '.2f'):>9}{result['peak_rss_mb']:>9.1f}")
+
+
+def regressions(results, baseline, tolerance):
+    """Scanners whose throughput fell more than ``tolerance`` below the baseline"""
+    found = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before or not before["tx_per_sec"] or not result["transactions"]:
+            continue
+        change = result["tx_per_sec"] / before["tx_per_sec"] - 1
+        if change < -tolerance:
+            found.append(f"{name}: {before['tx_per_sec']:.1f} -> {result['tx_per_sec']:.1f} tx/s ({change:+.0%})")
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the treasury scanners against a mock RPC server")
+    parser.add_argument("scanners", nargs="*", metavar="SCANNER",
+                        help=f"scanners to run (default: all of {', '.join(SCANNERS)})")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per scanner; the median is reported")
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare throughput against")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="allowed fractional tx/s drop against the baseline (default: 0.15)")
+    parser.add_argument("--encoding", action="append", choices=("jsonParsed", "base64"),
+                        help=f"transaction encoding to fetch; repeat to compare (default: {DEFAULT_ENCODING})")
+    parser.add_argument("--verbose", action="store_true", help="show the scanners' own output")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scanners if name not in SCANNERS]
+    if unknown:
+        parser.error(f"unknown scanner {unknown[0]!r} (choose from {', '.join(SCANNERS)})")
+
+    server = server_from_args(args)
+    server.start_in_thread()
+    print(f"Mock RPC at {server.url}: {args.transactions} transactions, {args.latency * 1000:.0f} ms latency "
+          f"(+{args.jitter * 1000:.0f} ms jitter), {args.rate_429:.0%} 429s, {args.error_rate:.0%} errors\n")
+    results = {}
+    try:
+        for name in args.scanners or SCANNERS:
+            for encoding in args.encoding or [DEFAULT_ENCODING]:
+                results[result_name(name, encoding)] = benchmark(name, server, args.repeat, args.verbose, encoding)
+    finally:
+        server.stop_thread()
+
+    print_table(results)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+        print(f"\nSaved results to {args.save}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        changed = [key for key in SERVER_SETTINGS if baseline["settings"].get(key) != getattr(args, key)]
+        if changed:
+            print(f"\nWarning: the baseline used different mock settings ({', '.join(changed)})")
+        found = regressions(results, baseline["results"], args.tolerance)
+        if found:
+            print("\nThroughput regressions:\n  " + "\n  ".join(found))
+            return 1
+        print(f"\nNo scanner lost more than {args.tolerance:.0%} throughput against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
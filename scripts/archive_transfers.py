@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""Equivalent to `python -m treasury archive`, runnable from any working directory."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from treasury.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main(["archive", *sys.argv[1:]]))
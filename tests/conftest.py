@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+# The mock server answers as fast as it is asked; the default rate limit would only slow the tests down
+os.environ.setdefault("SOLANA_RPC_RATE", "1000")
+os.environ.setdefault("SOLANA_RPC_MAX_RATE", "1000")
+os.environ.setdefault("SOLANA_RPC_BURST", "1000")
+# Cache and watermarks go to the test's working directory (see ``workdir``), never a real deployment's
+os.environ["SOLANA_TX_CACHE"] = ".tx_cache.sqlite3"
+os.environ["SOLANA_WATERMARK_FILE"] = "sync_state.json"
+os.environ.pop("TREASURY_DATABASE_URL", None)
+
+from bench.mock_rpc import MockRpcServer, load_templates  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def templates():
+    return load_templates()
+
+
+@pytest.fixture
+def mock_rpc(monkeypatch):
+    """``mock_rpc(history, **faults)`` serves a history from a background thread until the test ends.
+
+    The commands' default client is pointed at the latest server started.
+    """
+    servers = []
+
+    def start(history, **faults):
+        server = MockRpcServer(history, **faults)
+        monkeypatch.setenv("SOLANA_RPC_URLS", server.start_in_thread())
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop_thread()
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in an empty directory: the commands write their outputs, cache and watermarks to the working one"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
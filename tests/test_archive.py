@@ -0,0 +1,82 @@
+import json
+import os
+
+import base58
+import numpy as np
+import pytest
+
+from treasury.archive import TransferArchive, records_from_json, write_archive
+from treasury.commands import archive
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def b58(raw):
+    return base58.b58encode(raw).decode()
+
+
+@pytest.mark.parametrize("source", ["sol_transfers.json", "all_incoming_txs.json", "contributions_simple.json"])
+def test_checked_in_transfers_round_trip(workdir, source):
+    with open(os.path.join(ROOT, source)) as f:
+        records = list(records_from_json(json.load(f)))
+    assert write_archive("transfers.tca", records) == len(records)
+
+    with TransferArchive("transfers.tca") as read:
+        assert len(read) == len(records)
+        assert int(read.lamports.sum()) == sum(record["lamports"] for record in records)
+        for record, stored in zip(records, read.records()):
+            assert stored["signature"] == record["signature"]
+            assert stored["lamports"] == record["lamports"]
+            assert stored["timestamp"] == (record["timestamp"] or 0)
+            assert stored["sender"] == (None if record["sender"] in (None, "Unknown") else record["sender"])
+
+
+def test_trailing_zero_bytes_survive(workdir):
+    # NumPy's S dtypes strip trailing NULs; the reader must go back to the raw bytes
+    sender = b58(bytes(range(1, 31)) + b"\x00\x00")
+    records = [
+        {"signature": b58(b"\x07" * 63 + b"\x00"), "lamports": -5, "sender": sender, "is_system_transfer": True},
+        {"signature": b58(b"\x08" * 64), "lamports": 2_000_000_000, "timestamp": 1744605287, "sender": sender},
+        {"signature": b58(b"\x09" * 64), "lamports": 1, "sender": "Unknown"},
+    ]
+    write_archive("transfers.tca", records)
+
+    with TransferArchive("transfers.tca") as read:
+        assert len(read.pubkeys) == 1
+        assert read.senders() == [sender, sender, None]
+        assert [stored["signature"] for stored in read.records()] == [record["signature"] for record in records]
+        assert read.flags.tolist() == [1, 0, 0]
+        assert read.record(1)["timestamp"] == 1744605287
+
+
+def test_columns_are_views_of_the_mapping(workdir):
+    write_archive("transfers.tca", [{"signature": b58(bytes([i]) * 64), "lamports": i} for i in range(1, 11)])
+    with TransferArchive("transfers.tca") as read:
+        assert not read.lamports.flags.writeable and not read.lamports.flags.owndata
+        assert np.array_equal(read.lamports, np.arange(1, 11))
+
+
+def test_rejects_what_is_not_a_whole_archive(workdir):
+    write_archive("transfers.tca", [{"signature": b58(b"\x01" * 64), "lamports": 1}])
+    with open("transfers.tca", "rb") as f:
+        data = f.read()
+    with open("truncated.tca", "wb") as f:
+        f.write(data[:-8])
+    with open("other.tca", "wb") as f:
+        f.write(b"NOTANARC" + data[8:])
+
+    with pytest.raises(ValueError, match="truncated"):
+        TransferArchive("truncated.tca")
+    with pytest.raises(ValueError, match="not a transfer archive"):
+        TransferArchive("other.tca")
+    with pytest.raises(ValueError, match="64-byte"):
+        write_archive("bad.tca", [{"signature": b58(b"\x01" * 32), "lamports": 1}])
+    assert not os.path.exists("bad.tca")
+
+
+def test_convert_and_summary(workdir, capsys):
+    archive.main(["convert", os.path.join(ROOT, "all_incoming_txs.json"), "incoming.tca"])
+    archive.main(["summary", "incoming.tca"])
+    with open(os.path.join(ROOT, "all_incoming_txs.json")) as f:
+        data = json.load(f)
+    assert f"incoming.tca: {len(data['transactions'])} transfers" in capsys.readouterr().out
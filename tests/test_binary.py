@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from bench.mock_rpc import MockHistory
+from treasury.binary import BASE64, decode_transaction
+from treasury.config import TREASURY_WALLET
+from treasury.extract import account_key_strings, analyze_transaction, extract_sol_transfers, invoked_programs
+from treasury.pipeline import SignaturePipeline
+from treasury.rpc import RpcClient
+
+
+@pytest.fixture(scope="module")
+def history(templates):
+    return MockHistory(templates, 200)
+
+
+def test_base64_decodes_to_what_the_extractors_read_from_json(history):
+    for entry in history.signatures:
+        parsed = history.transaction(entry["signature"])
+        decoded = decode_transaction(history.transaction(entry["signature"], BASE64))
+
+        assert decoded["transaction"]["signatures"] == parsed["transaction"]["signatures"]
+        assert account_key_strings(decoded) == account_key_strings(parsed)
+        assert list(invoked_programs(decoded)) == list(invoked_programs(parsed))
+        assert extract_sol_transfers(decoded, TREASURY_WALLET) == extract_sol_transfers(parsed, TREASURY_WALLET)
+        assert analyze_transaction(decoded, TREASURY_WALLET) == analyze_transaction(parsed, TREASURY_WALLET)
+
+
+def test_other_results_pass_through(history):
+    parsed = history.transaction(history.signatures[0]["signature"])
+    assert decode_transaction(parsed) is parsed
+    assert decode_transaction(None) is None
+    with pytest.raises(ValueError, match="base58"):
+        decode_transaction({**parsed, "transaction": ["", "base58"]})
+
+
+def test_pipeline_records_match_across_encodings(mock_rpc, templates):
+    server = mock_rpc(MockHistory(templates, 150))
+
+    async def scan(encoding):
+        async with RpcClient([server.url], cache=False) as client:
+            pipeline = SignaturePipeline(client, TREASURY_WALLET,
+                                         lambda sig_data, tx_data: extract_sol_transfers(tx_data, TREASURY_WALLET),
+                                         encoding=encoding)
+            return [record async for record in pipeline.run()]
+
+    parsed = asyncio.run(scan("jsonParsed"))
+    parsed_bytes = server.bytes_sent
+    assert parsed and asyncio.run(scan(BASE64)) == parsed
+    # The wire format is the smaller response
+    assert server.bytes_sent - parsed_bytes < parsed_bytes
@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+from bench.mock_rpc import MockHistory
+from treasury.checkpoint import open_checkpoint, scan_params
+from treasury.commands import incoming
+from treasury.config import TREASURY_WALLET
+from treasury.filters import SignatureFilter
+from treasury.pipeline import SignaturePipeline
+from treasury.rpc import RpcClient
+
+# What a full `treasury incoming` run is limited to, so the interrupted scan's checkpoint matches it
+MAX_SIGNATURES = 2000
+
+
+async def interrupted_scan(records_wanted):
+    """Start the incoming scan and stop it after a few records, as Ctrl-C would"""
+    signature_filter = SignatureFilter()
+    checkpoint = open_checkpoint(incoming.CHECKPOINT_FILE,
+                                 scan_params(TREASURY_WALLET, None, MAX_SIGNATURES, signature_filter))
+    async with RpcClient() as client:
+        pipeline = SignaturePipeline(client, TREASURY_WALLET, incoming.find_incoming_transaction,
+                                     max_signatures=MAX_SIGNATURES, signature_filter=signature_filter,
+                                     checkpoint=checkpoint)
+        records = pipeline.run()
+        found = 0
+        async for _ in records:
+            found += 1
+            if found >= records_wanted:
+                break
+        await records.aclose()
+    return checkpoint
+
+
+def saved_incoming():
+    with open("all_incoming_txs.json") as f:
+        return json.load(f)
+
+
+def test_resumed_scan_saves_what_an_uninterrupted_one_does(mock_rpc, templates, workdir):
+    mock_rpc(MockHistory(templates, 2500))
+    incoming.main([])
+    uninterrupted = saved_incoming()
+    (workdir / "all_incoming_txs.json").unlink()
+
+    checkpoint = asyncio.run(interrupted_scan(5))
+    assert (workdir / incoming.CHECKPOINT_FILE).exists() and not checkpoint.finished
+
+    incoming.main(["--resume"])
+    assert saved_incoming() == uninterrupted
+    assert not (workdir / incoming.CHECKPOINT_FILE).exists()
@@ -0,0 +1,14 @@
+from bench.mock_rpc import MockHistory
+from treasury.columnar import analyze_transactions_batch
+from treasury.config import TREASURY_WALLET
+from treasury.extract import analyze_transaction
+
+
+def test_batch_analysis_matches_the_scalar_extractor(templates):
+    history = MockHistory(templates, 50)
+    transactions = [history.transaction(entry["signature"]) for entry in history.signatures]
+    transactions.append({"transaction": {"signatures": ["no-meta"]}})
+
+    expected = [analyze_transaction(tx, TREASURY_WALLET) for tx in transactions]
+    assert any(expected)
+    assert analyze_transactions_batch(transactions, TREASURY_WALLET) == expected
@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+from bench.mock_rpc import MockHistory
+from treasury.commands import dump
+from treasury.ndjson import iter_records
+
+
+# Layout -> the file its script wrote, and how many of the newest transactions it dumps
+@pytest.mark.parametrize("layout, output, count", [("full", "txns.json", 50), ("raw", "all_raw_txs.json", 100),
+                                                   ("compact", "all_incoming_txs.json", 50)])
+def test_dumps_keep_the_scripts_file_names_and_format(mock_rpc, templates, workdir, layout, output, count):
+    mock_rpc(MockHistory(templates, 120))
+    dump.main(["--format", layout])
+    with open(output) as f:
+        records = json.load(f)
+    assert len(records) == count and records[0]["signature"]
+
+
+def test_ndjson_dumps_are_opt_in_and_appendable(mock_rpc, templates, workdir):
+    mock_rpc(MockHistory(templates, 60))
+    dump.main(["--output", "txns.ndjson.gz"])
+    dump.main(["--output", "txns.ndjson.gz", "--append"])
+    records = list(iter_records("txns.ndjson.gz"))
+    assert len(records) == 100 and records[:50] == records[50:]
+
+    with pytest.raises(SystemExit):
+        dump.main(["--append"])
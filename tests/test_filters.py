@@ -0,0 +1,64 @@
+import argparse
+import calendar
+import time
+
+import pytest
+
+from treasury.filters import SignatureFilter, add_filter_arguments, filter_from_args, parse_date, parse_end_date
+
+APRIL_13 = calendar.timegm((2025, 4, 13, 0, 0, 0))
+DAY = 24 * 60 * 60
+
+
+def parse(*argv):
+    parser = argparse.ArgumentParser()
+    add_filter_arguments(parser)
+    return filter_from_args(parser.parse_args(argv))
+
+
+def entry(block_time=None, slot=100, err=None):
+    return {"signature": f"sig-{block_time}-{slot}", "slot": slot, "blockTime": block_time, "err": err}
+
+
+@pytest.fixture
+def local_timezone(monkeypatch):
+    # Far from UTC, so parsing in local time would be off by hours
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_dates_are_utc_whatever_the_host_timezone(local_timezone):
+    assert parse_date("2025-04-13") == APRIL_13
+    assert parse_date("2025-04-13T21:34") == APRIL_13 + 21 * 3600 + 34 * 60
+    assert parse_date("2025-04-13T00:00+02:00") == APRIL_13 - 2 * 3600
+
+
+def test_end_date_covers_the_whole_day(local_timezone):
+    assert parse_end_date("2025-04-13") == APRIL_13 + DAY
+    # A time is the end itself
+    assert parse_end_date("2025-04-13T12:00") == APRIL_13 + 12 * 3600
+
+    signature_filter = parse("--start", "2025-04-13", "--end", "2025-04-13")
+    page = [entry(APRIL_13 + DAY), entry(APRIL_13 + DAY - 1), entry(APRIL_13), entry(APRIL_13 - 1), entry(None)]
+    assert signature_filter.apply(page) == page[1:3] + page[4:]
+    assert signature_filter.skipped_window == 2
+    assert signature_filter.past_window(page[3]) and not signature_filter.past_window(page[2])
+
+
+def test_slot_bounds_are_inclusive():
+    signature_filter = SignatureFilter(min_slot=10, max_slot=20)
+    page = [entry(slot=21), entry(slot=20), entry(slot=10), entry(slot=9)]
+    assert signature_filter.apply(page) == page[1:3]
+
+
+def test_failed_transactions_are_skipped_unless_included():
+    page = [entry(APRIL_13, err=None), entry(APRIL_13 - 1, err={"InstructionError": [0, "Custom"]})]
+
+    signature_filter = parse()
+    assert signature_filter.apply(page) == page[:1]
+    assert (signature_filter.seen, signature_filter.skipped_failed, signature_filter.saved) == (2, 1, 1)
+
+    assert parse("--include-failed").apply(page) == page
@@ -0,0 +1,17 @@
+import json
+
+from bench.mock_rpc import MockHistory
+from treasury.commands import incoming
+
+
+def test_first_incremental_run_scans_the_whole_history(mock_rpc, templates, workdir):
+    history = mock_rpc(MockHistory(templates, 2500)).history
+    expected = {entry["signature"] for entry in history.signatures
+                if entry["err"] is None and
+                incoming.find_incoming_transaction(entry, history.transaction(entry["signature"]))}
+
+    # Without a watermark yet, the incremental run must not stop at the full run's 2000 signatures
+    incoming.main(["--incremental"])
+    with open("all_incoming_txs.json") as f:
+        saved = json.load(f)
+    assert {record["signature"] for record in saved["transactions"]} == expected
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from treasury.commands.contributions import process_transaction
+from treasury.config import TREASURY_WALLET
+from treasury.ledger import TARGET_LAMPORTS, TIER_LAMPORTS, ContributionLedger
+
+SENDER = "HFNQbRNiC6eznepbaJDxuNKN95XnKTxoGkr8Xaj5fXDs"
+OTHER = "5kAuGKmfupY3PzZ79caUeES58nAFTyz6sSyXyTQeEBGd"
+
+
+def transfer(lamports, destination=TREASURY_WALLET):
+    return {
+        "meta": {"preBalances": [5_000_000_000, 0], "postBalances": [5_000_000_000 - lamports, lamports]},
+        "transaction": {"message": {
+            "accountKeys": [{"pubkey": SENDER}, {"pubkey": destination}],
+            "instructions": [{"program": "system", "parsed": {"type": "transfer", "info": {
+                "source": SENDER, "destination": destination, "lamports": lamports}}}]
+        }}
+    }
+
+
+@pytest.mark.parametrize("lamports", sorted(TIER_LAMPORTS))
+def test_tiers_match_on_exact_lamports(tmp_path, lamports):
+    ledger = ContributionLedger(path=str(tmp_path / "ledger.json"), load=False)
+    assert not ledger.add("low", SENDER, lamports - 1)
+    assert not ledger.add("high", SENDER, lamports + 1)
+    assert ledger.add("exact", SENDER, lamports)
+    assert len(ledger) == 1 and ledger.total_lamports == lamports
+    assert process_transaction(transfer(lamports - 1), "low") is None
+    assert process_transaction(transfer(lamports), "exact", 1744605287)["lamports"] == lamports
+
+
+def test_transfers_elsewhere_are_not_contributions():
+    assert process_transaction(transfer(250_000_000, OTHER), "elsewhere") is None
+
+
+def test_aggregates_follow_each_contribution(tmp_path):
+    ledger = ContributionLedger(path=str(tmp_path / "ledger.json"), load=False)
+    assert ledger.add("sig-a", SENDER, 2_000_000_000, 1744605287)
+    assert ledger.add("sig-b", SENDER, 250_000_000)
+    assert ledger.add("sig-c", OTHER, 1_000_000_000, 1744605275)
+    assert not ledger.add("sig-a", OTHER, 500_000_000)
+
+    assert ledger.total_lamports == 3_250_000_000 and ledger.total_sol == 3.25
+    assert ledger.tiers == {250_000_000: 1, 500_000_000: 0, 1_000_000_000: 1, 2_000_000_000: 1}
+    assert ledger.sender_total(SENDER) == (2_250_000_000, 2)
+    assert ledger.sender_total("nobody") == (0, 0)
+    assert ledger.top_senders() == [(SENDER, 2_250_000_000, 2), (OTHER, 1_000_000_000, 1)]
+
+
+def test_target_is_reached_at_exactly_its_lamports(tmp_path):
+    ledger = ContributionLedger(path=str(tmp_path / "ledger.json"), load=False)
+    for i in range(TARGET_LAMPORTS // 250_000_000 - 1):
+        ledger.add(f"sig-{i}", SENDER, 250_000_000)
+    assert not ledger.reached()
+    ledger.add("last", OTHER, 250_000_000)
+    assert ledger.total_lamports == TARGET_LAMPORTS and ledger.reached()
+
+
+def test_saved_ledger_loads_with_its_aggregates(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    ledger = ContributionLedger(path=path, load=False)
+    ledger.add("sig-a", SENDER, 2_000_000_000, 1744605287)
+    ledger.add("sig-b", OTHER, 500_000_000)
+    ledger.newest, ledger.oldest, ledger.backfilled = "sig-a", "sig-b", True
+    ledger.save()
+
+    loaded = ContributionLedger(path=path)
+    for name in ("contributions", "total_lamports", "tiers", "senders", "newest", "oldest", "backfilled"):
+        assert getattr(loaded, name) == getattr(ledger, name)
+    assert loaded.add("sig-c", SENDER, 250_000_000)
+    assert loaded.sender_total(SENDER) == (2_250_000_000, 2)
+    assert len(ContributionLedger(path=path, load=False)) == 0
+
+    with open(path) as f:
+        state = json.load(f)
+    with open(path, "w") as f:
+        json.dump({**state, "version": 0}, f)
+    with pytest.raises(ValueError, match="version 0"):
+        ContributionLedger(path=path)
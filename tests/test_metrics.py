@@ -0,0 +1,72 @@
+import json
+from urllib.parse import urlsplit
+
+import pytest
+
+from bench.mock_rpc import MockHistory
+from treasury import cli
+from treasury.metrics import REGISTRY, Registry, endpoint_label
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    REGISTRY.reset()
+    yield
+    REGISTRY.reset()
+
+
+def samples(path):
+    """{sample name with labels: value} from Prometheus text"""
+    with open(path) as f:
+        return {name: float(value) for name, _, value in
+                (line.rpartition(" ") for line in f.read().splitlines() if not line.startswith("#"))}
+
+
+def test_histogram_buckets_are_cumulative(workdir):
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency", ("method",), buckets=(0.1, 1.0))
+    requests = registry.counter("requests_total", "Requests", ("method",))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, method='get "x"\n')
+    requests.inc(method="a")
+    requests.inc(2, method="a")
+
+    registry.write("metrics.prom")
+    escaped = 'method="get \\"x\\"\\n"'
+    assert samples("metrics.prom") == {
+        f'latency_seconds_bucket{{{escaped},le="0.1"}}': 2,
+        f'latency_seconds_bucket{{{escaped},le="1.0"}}': 3,
+        f'latency_seconds_bucket{{{escaped},le="+Inf"}}': 4,
+        f'latency_seconds_sum{{{escaped}}}': 3.65,
+        f'latency_seconds_count{{{escaped}}}': 4,
+        'requests_total{method="a"}': 3,
+    }
+
+    registry.write("metrics.json")
+    with open("metrics.json") as f:
+        snapshot = json.load(f)["metrics"]
+    assert snapshot["requests_total"]["samples"] == [{"labels": {"method": "a"}, "value": 3}]
+    assert snapshot["latency_seconds"]["samples"][0]["buckets"] == {"0.1": 2, "1.0": 1, "+Inf": 1}
+
+
+def test_endpoint_label_drops_the_path():
+    assert endpoint_label("https://rpc.example.com/v2/secret-key") == "rpc.example.com"
+    assert endpoint_label("http://127.0.0.1:8899/") == "127.0.0.1:8899"
+
+
+def test_command_metrics_match_the_server(mock_rpc, templates, workdir, monkeypatch):
+    server = mock_rpc(MockHistory(templates, 60))
+    endpoint = urlsplit(server.url).netloc
+    monkeypatch.setenv("SOLANA_METRICS_FILE", "metrics.prom")
+    # The second run reads every transaction from the cache
+    assert cli.main(["transfers"]) == 0
+    assert cli.main(["transfers"]) == 0
+
+    exported = samples("metrics.prom")
+    fetched = server.counts["getTransaction"]
+    assert fetched and exported['solana_tx_cache_lookups_total{result="miss"}'] == fetched
+    assert exported['solana_tx_cache_lookups_total{result="hit"}'] == fetched
+    batch = f'method="getTransaction[batch]",endpoint="{endpoint}"'
+    assert exported[f'solana_rpc_requests_total{{{batch},outcome="ok"}}'] == server.counts["batches"]
+    assert exported[f'solana_rpc_request_seconds_bucket{{{batch},le="+Inf"}}'] == server.counts["batches"]
+    assert exported['treasury_scan_stage_seconds_count{stage="fetch"}'] >= 1
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from collections import Counter
+
+from bench.mock_rpc import MockHistory, MockRpcServer, synthetic_signature
+from treasury import monitor as monitor_module
+from treasury.config import TREASURY_WALLET
+from treasury.monitor import TreasuryMonitor
+from treasury.rpc import RpcClient
+
+
+async def until(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+class Monitored:
+    """A mock server and a monitor on it, with every record the monitor reports counted"""
+
+    def __init__(self, history):
+        self.server = MockRpcServer(history)
+        self.reported = Counter()
+        self.landed = []
+
+    async def __aenter__(self):
+        url = await self.server.start()
+        # "confirmed" fetches bypass the transaction cache
+        self.client = await RpcClient([url], cache=False).__aenter__()
+        # Every transaction is a record here, not only those moving treasury SOL
+        self.monitor = TreasuryMonitor(self.client, TREASURY_WALLET, urls=["ws" + url[len("http"):]],
+                                       extract=lambda sig_data, tx_data: sig_data["signature"])
+        self._consumer = asyncio.create_task(self._consume())
+        await until(lambda: self.server.subscribers and self.monitor.watermark)
+        return self
+
+    async def _consume(self):
+        async for signature in self.monitor.run():
+            self.reported[signature] += 1
+
+    async def __aexit__(self, *exc_info):
+        self._consumer.cancel()
+        await asyncio.gather(self._consumer, return_exceptions=True)
+        await self.client.__aexit__(*exc_info)
+        await self.server.stop()
+
+    async def land(self, count=1):
+        self.landed += await self.server.emit(count)
+
+    def expected(self):
+        return {entry["signature"] for entry in self.landed if entry["err"] is None}
+
+    async def settle(self, expected=None):
+        """Wait for every expected record, then a little longer for any duplicate"""
+        expected = self.expected() if expected is None else expected
+        await until(lambda: expected <= set(self.reported))
+        await asyncio.sleep(0.1)
+        assert set(self.reported) == expected
+        assert set(self.reported.values()) == {1}
+
+
+def test_malformed_notifications_are_ignored(templates):
+    async def scenario():
+        async with Monitored(MockHistory(templates, 100)) as monitored:
+            for ws in list(monitored.server.subscribers):
+                await ws.send_json({"jsonrpc": "2.0", "method": "logsNotification", "params": {"result": {}}})
+                await ws.send_json({"jsonrpc": "2.0", "method": "accountNotification", "params": None})
+                await ws.send_json(["not", "a", "notification"])
+            await monitored.land(8)
+            await monitored.settle()
+            return monitored.monitor
+
+    monitor = asyncio.run(scenario())
+    assert monitor.connections == 1
+    assert monitor.skipped_failed == 1
+
+
+def test_lost_transaction_is_dropped_without_holding_back_the_watermark(templates, monkeypatch):
+    monkeypatch.setattr(monitor_module, "FETCH_RETRY_DELAY", 0.01)
+    monkeypatch.setattr(monitor_module, "LATE_RETRY_DELAY", 0.01)
+
+    async def scenario():
+        async with Monitored(MockHistory(templates, 100, failed_every=0)) as monitored:
+            server = monitored.server
+            # The next transaction to land never becomes fetchable
+            lost = synthetic_signature(len(server.history.serial))
+            answer = server._answer
+
+            def lose(request):
+                reply = answer(request)
+                if request.get("method") == "getTransaction" and request["params"][0] == lost:
+                    reply["result"] = None
+                return reply
+
+            monkeypatch.setattr(server, "_answer", lose)
+            await monitored.land(4)
+            await monitored.settle(monitored.expected() - {lost})
+            await until(lambda: monitored.monitor.watermark["signature"] == monitored.landed[-1]["signature"])
+            return monitored.monitor, lost
+
+    monitor, lost = asyncio.run(scenario())
+    assert [entry["signature"] for entry in monitor.failed] == [lost]
+
+
+def test_reconnect_backfills_what_landed_while_away_once(templates):
+    async def scenario():
+        async with Monitored(MockHistory(templates, 100)) as monitored:
+            await monitored.land(3)
+            await monitored.settle()
+            await monitored.server.drop_connections()
+            await monitored.land(6)
+            await until(lambda: monitored.monitor.connections > 1 and monitored.server.subscribers)
+            await monitored.land(3)
+            await monitored.settle()
+            return monitored.monitor
+
+    monitor = asyncio.run(scenario())
+    assert monitor.backfilled >= 1
@@ -0,0 +1,69 @@
+import json
+import shutil
+
+import pytest
+
+from treasury.ndjson import NdjsonWriter, iter_records, open_dump, stream_complete
+
+RECORDS = [{"signature": f"sig-{i}", "data": {"slot": i, "memo": "line\nbreak"}} for i in range(5)]
+
+
+@pytest.mark.parametrize("name", ["dump.ndjson", "dump.ndjson.gz", "dump.ndjson.zst"])
+def test_appending_adds_to_what_was_written(tmp_path, name):
+    path = str(tmp_path / name)
+    with NdjsonWriter(path, append=False) as writer:
+        writer.write_many(RECORDS[:3])
+    with NdjsonWriter(path) as writer:
+        writer.write_many(RECORDS[3:])
+    assert list(iter_records(path)) == RECORDS
+
+    with NdjsonWriter(path, append=False) as writer:
+        writer.write(RECORDS[0])
+    assert list(iter_records(path)) == RECORDS[:1]
+
+
+def test_gzip_dump_left_open_by_a_crash_is_salvaged_before_appending(tmp_path):
+    path, crashed = str(tmp_path / "dump.ndjson.gz"), str(tmp_path / "crashed.ndjson.gz")
+    writer = NdjsonWriter(path, append=False, flush_every=1)
+    writer.write_many(RECORDS[:3])
+    # What a crash leaves behind: flushed blocks, but no end to the gzip member
+    shutil.copy(path, crashed)
+    writer.close()
+
+    assert not stream_complete(crashed)
+    assert list(iter_records(crashed)) == RECORDS[:3]
+    with NdjsonWriter(crashed) as writer:
+        writer.write(RECORDS[3])
+    assert stream_complete(crashed)
+    assert list(iter_records(crashed)) == RECORDS[:4]
+
+
+def test_truncated_last_line_is_skipped(tmp_path):
+    path = tmp_path / "dump.ndjson"
+    lines = [json.dumps(record) for record in RECORDS[:3]]
+    path.write_text("\n".join(lines[:2]) + "\n\n" + lines[2][:20])
+    assert list(iter_records(str(path))) == RECORDS[:2]
+
+
+def test_corrupt_line_before_the_end_is_an_error(tmp_path):
+    path = tmp_path / "dump.ndjson"
+    path.write_text(json.dumps(RECORDS[0]) + "\n{not json\n" + json.dumps(RECORDS[1]) + "\n")
+    with pytest.raises(ValueError, match="dump.ndjson:2"):
+        list(iter_records(str(path)))
+
+
+@pytest.mark.parametrize("records", [RECORDS, []])
+def test_json_dumps_match_the_legacy_array_format(tmp_path, records):
+    path = tmp_path / "txns.json"
+    with open_dump(str(path)) as writer:
+        writer.write_many(records)
+    assert path.read_text() == json.dumps(records, indent=2)
+    assert list(iter_records(str(path))) == records
+
+
+def test_only_ndjson_dumps_can_be_appended_to(tmp_path):
+    with pytest.raises(ValueError):
+        open_dump(str(tmp_path / "txns.json"), append=True)
+    with open_dump(str(tmp_path / "txns.ndjson"), append=True) as writer:
+        writer.write(RECORDS[0])
+    assert writer.count == 1
@@ -0,0 +1,24 @@
+import json
+import os
+
+from treasury.records import Transfer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_legacy_transfers_keep_their_sender_as_counterparty():
+    # The checked-in sol_transfers.json predates the counterparty key
+    with open(os.path.join(ROOT, "sol_transfers.json")) as f:
+        legacy = json.load(f)
+    assert legacy and all("counterparty" not in record for record in legacy)
+
+    for record in legacy:
+        transfer = Transfer.from_dict(record).to_dict()
+        assert transfer["counterparty"] == record["sender"]
+        assert transfer["balance_change"] == record["balance_change"]
+
+
+def test_transfer_round_trips_through_its_dict():
+    record = Transfer("sig", 1744605287, -1_500_000_000, description="Sent to somewhere").to_dict()
+    assert record["counterparty"] == "Unknown"
+    assert Transfer.from_dict(record).to_dict() == record
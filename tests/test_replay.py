@@ -0,0 +1,43 @@
+import importlib
+
+import pytest
+
+from bench.mock_rpc import MockHistory
+from treasury.cache import CACHE_PATH
+from treasury.commands import dump, transfers
+from treasury.commands.replay import replay
+
+# Extractor -> (online command, its arguments, the file both write)
+ONLINE = {
+    "transfers": ("transfers", [], "sol_transfers.json"),
+    "incoming": ("incoming", [], "all_incoming_txs.json"),
+    "examine": ("examine", [], "detailed_transactions.json"),
+    "contributions": ("contributions", ["--rebuild"], "contributions_full.json"),
+}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("extractor", list(ONLINE))
+def test_replay_writes_what_the_online_command_wrote(mock_rpc, templates, workdir, extractor, workers):
+    mock_rpc(MockHistory(templates, 300))
+    command, argv, output = ONLINE[extractor]
+    importlib.import_module(f"treasury.commands.{command}").main(argv)
+    online = (workdir / output).read_bytes()
+    (workdir / output).unlink()
+
+    # The online run left every transaction it fetched in the cache
+    assert replay(extractor, [CACHE_PATH], workers=workers).records
+    assert (workdir / output).read_bytes() == online
+
+
+@pytest.mark.parametrize("dump_file", ["txns.json", "txns.ndjson.gz"])
+def test_replay_reads_json_and_ndjson_dumps(mock_rpc, templates, workdir, dump_file):
+    # Small enough for a dump's 50 newest transactions to be the whole history
+    mock_rpc(MockHistory(templates, 40))
+    transfers.main([])
+    online = (workdir / "sol_transfers.json").read_bytes()
+    dump.main(["--output", dump_file])
+
+    replayed = replay("transfers", [dump_file], workers=1)
+    assert replayed.transactions == 40 and not replayed.unreadable
+    assert (workdir / "sol_transfers.json").read_bytes() == online
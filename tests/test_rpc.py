@@ -0,0 +1,98 @@
+import asyncio
+
+from bench.mock_rpc import MockHistory
+from treasury.config import TREASURY_WALLET
+from treasury.rpc import RpcClient
+
+TRANSACTION_OPTIONS = {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}
+
+
+def transaction_calls(server):
+    return [("getTransaction", [entry["signature"], TRANSACTION_OPTIONS]) for entry in server.history.signatures]
+
+
+def signed(transactions):
+    return [tx["transaction"]["signatures"][0] for tx in transactions]
+
+
+def test_batches_shrink_when_the_provider_rejects_their_size(mock_rpc, templates):
+    server = mock_rpc(MockHistory(templates, 60), max_batch=16)
+    signatures = [entry["signature"] for entry in server.history.signatures]
+
+    async def fetch_twice():
+        async with RpcClient([server.url], cache=False) as client:
+            first = await client.call_batch(transaction_calls(server))
+            rejected = server.counts["http:413"]
+            batches = server.counts["batches"]
+            second = await client.call_batch(transaction_calls(server))
+            return first, second, rejected, batches
+
+    first, second, rejected, batches = asyncio.run(fetch_twice())
+    assert signed(first) == signatures and signed(second) == signatures
+    assert rejected > 0
+    # The second batch is sent at the size learned from the first, so nothing more is refused
+    assert server.counts["http:413"] == rejected
+    assert server.counts["batches"] - batches == 60 // 15
+
+
+def test_throttled_and_failed_calls_are_retried(mock_rpc, templates):
+    server = mock_rpc(MockHistory(templates, 60), rate_429=0.1, retry_after=0, error_rate=0.1)
+
+    async def fetch():
+        # One at a time, so the seeded faults land on the same calls every run
+        async with RpcClient([server.url], cache=False) as client:
+            return [await client.call(*call) for call in transaction_calls(server)]
+
+    transactions = asyncio.run(fetch())
+    assert signed(transactions) == [entry["signature"] for entry in server.history.signatures]
+    assert server.counts["http:429"] > 0 and server.counts["getTransaction:error"] > 0
+
+
+def test_concurrent_balance_reads_share_one_request(mock_rpc, templates):
+    server = mock_rpc(MockHistory(templates, 10), latency=0.05, balance=1234)
+
+    async def read():
+        async with RpcClient([server.url], cache=False, memo_ttl=0.2) as client:
+            together = await asyncio.gather(*(client.get_balance(TREASURY_WALLET) for _ in range(20)))
+            shared = server.counts["getBalance"]
+            memoized = await client.get_balance(TREASURY_WALLET)
+            await asyncio.sleep(0.3)
+            expired = await client.get_balance(TREASURY_WALLET)
+            return together, shared, memoized, expired
+
+    together, shared, memoized, expired = asyncio.run(read())
+    assert together == [1234] * 20 and memoized == expired == 1234
+    assert shared == 1
+    # The memo answered the next read; once it expired the balance was asked for again
+    assert server.counts["getBalance"] == 2
+
+
+def test_cancelled_caller_leaves_the_shared_request_running(mock_rpc, templates):
+    server = mock_rpc(MockHistory(templates, 10), latency=0.1, balance=1234)
+
+    async def read():
+        async with RpcClient([server.url], cache=False, memo_ttl=0) as client:
+            first = asyncio.ensure_future(client.get_balance(TREASURY_WALLET))
+            second = asyncio.ensure_future(client.get_balance(TREASURY_WALLET))
+            await asyncio.sleep(0.02)
+            first.cancel()
+            return await second, first.cancelled()
+
+    assert asyncio.run(read()) == (1234, True)
+    assert server.counts["getBalance"] == 1
+
+
+def test_overlapping_transaction_lookups_fetch_each_signature_once(mock_rpc, templates):
+    server = mock_rpc(MockHistory(templates, 60), latency=0.05)
+    signatures = [entry["signature"] for entry in server.history.signatures]
+
+    async def fetch():
+        async with RpcClient([server.url], cache=False) as client:
+            return await asyncio.gather(client.get_transactions(signatures[:40]),
+                                        client.get_transactions(signatures[20:]),
+                                        client.get_transaction(signatures[30]))
+
+    first, second, single = asyncio.run(fetch())
+    assert signed(first) == signatures[:40] and signed(second) == signatures[20:]
+    assert signed([single]) == [signatures[30]]
+    assert server.counts["getTransaction"] == 60
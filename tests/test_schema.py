@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import pytest
+
+from bench.mock_rpc import MockHistory
+from treasury.binary import BASE64, decode_transaction
+from treasury.config import TREASURY_WALLET
+from treasury.extract import analyze_transaction, extract_sol_transfers
+from treasury.rpc import RpcClient
+from treasury.schema import reply_decoder, result_decoder
+
+pytest.importorskip("msgspec")
+
+
+def extracted(tx_data):
+    return extract_sol_transfers(tx_data, TREASURY_WALLET), analyze_transaction(tx_data, TREASURY_WALLET)
+
+
+@pytest.mark.parametrize("encoding", ["jsonParsed", BASE64])
+def test_slim_transactions_extract_like_full_ones(templates, encoding):
+    history = MockHistory(templates, 200)
+    for entry in history.signatures:
+        full = history.transaction(entry["signature"], encoding)
+        slim = result_decoder()(json.dumps(full).encode())
+
+        assert "logMessages" not in slim["meta"] and "logMessages" in full["meta"]
+        assert slim["meta"]["postBalances"] == full["meta"]["postBalances"]
+        assert extracted(decode_transaction(slim)) == extracted(decode_transaction(full))
+
+
+def test_replies_decode_single_or_batched(templates):
+    history = MockHistory(templates, 3)
+    replies = [{"jsonrpc": "2.0", "id": i, "result": history.transaction(entry["signature"])}
+               for i, entry in enumerate(history.signatures)]
+    replies.append({"jsonrpc": "2.0", "id": 3, "error": {"code": -32005, "message": "Node is behind"}})
+
+    batch = reply_decoder()(json.dumps(replies).encode())
+    assert [reply["id"] for reply in batch] == [0, 1, 2, 3]
+    assert batch[0]["result"]["transaction"]["signatures"] == [history.signatures[0]["signature"]]
+    assert batch[3] == {"id": 3, "error": replies[3]["error"]}
+    assert reply_decoder()(json.dumps(replies[0]).encode()) == batch[0]
+
+
+def test_full_cached_transactions_serve_slim_lookups(mock_rpc, templates, workdir):
+    server = mock_rpc(MockHistory(templates, 30))
+    signatures = [entry["signature"] for entry in server.history.signatures]
+
+    async def fetch():
+        async with RpcClient([server.url]) as client:
+            full = await client.get_transactions(signatures[:20])
+            slim = await client.get_transactions(signatures, slim=True)
+            fetched = server.counts["getTransaction"]
+            again = await client.get_transactions(signatures[20:], slim=True)
+            return full, slim, fetched, again
+
+    full, slim, fetched, again = asyncio.run(fetch())
+    # Only the ten never fetched in full went to the server, and their slim copies were cached
+    assert fetched == 30 and server.counts["getTransaction"] == 30
+    assert [extracted(tx) for tx in slim[:20]] == [extracted(tx) for tx in full]
+    assert again == slim[20:] and all("logMessages" not in tx["meta"] for tx in again)
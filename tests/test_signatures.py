@@ -0,0 +1,24 @@
+import pytest
+
+from bench.mock_rpc import MockHistory
+from treasury.commands import signatures
+
+
+def listed(output, *options, partitions=1):
+    signatures.main(["--output", output, "--partitions", str(partitions), *options])
+    with open(output, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("output", ["signatures.json", "signatures.ndjson"])
+@pytest.mark.parametrize("window", [False, True])
+def test_partitioned_listing_matches_serial(mock_rpc, templates, workdir, output, window):
+    history = mock_rpc(MockHistory(templates, 2500)).history
+    options = []
+    if window:
+        options = ["--include-failed", "--min-slot", str(history.signatures[2100]["slot"]),
+                   "--max-slot", str(history.signatures[300]["slot"])]
+
+    serial = listed(output, *options)
+    assert serial.count(b'"signature"') == (1801 if window else 2500 - 2500 // 7)
+    assert listed(output, *options, partitions=4) == serial
@@ -0,0 +1,59 @@
+import sqlite3
+
+from treasury.commands.contributions import load_ledger
+from treasury.ledger import ContributionLedger
+
+SENDER = "HFNQbRNiC6eznepbaJDxuNKN95XnKTxoGkr8Xaj5fXDs"
+OTHER = "5kAuGKmfupY3PzZ79caUeES58nAFTyz6sSyXyTQeEBGd"
+
+
+def ledger(tmp_path):
+    ledger = ContributionLedger(path=str(tmp_path / "ledger.json"), load=False)
+    ledger.add("sig-a", SENDER, 2_000_000_000, 1744605287)
+    ledger.add("sig-b", SENDER, 250_000_000, None)  # No blockTime: created_at falls back to the load time
+    ledger.add("sig-c", OTHER, 250_000_000, 1744605275)
+    return ledger
+
+
+def rows(path):
+    db = sqlite3.connect(path)
+    try:
+        contributions = db.execute("SELECT wallet_address, amount, transaction_id, created_at FROM contributions "
+                                   "ORDER BY transaction_id").fetchall()
+        records = db.execute("SELECT wallet_address, total_contributed, updated_at FROM distribution_records "
+                             "ORDER BY wallet_address").fetchall()
+    finally:
+        db.close()
+    return contributions, records
+
+
+def test_reloading_a_ledger_leaves_rows_unchanged(tmp_path):
+    path = tmp_path / "presale.db"
+    load_ledger(ledger(tmp_path), f"sqlite:///{path}")
+    # Pin the load-time defaults so a second load that rewrote them would show
+    db = sqlite3.connect(path)
+    db.execute("UPDATE contributions SET created_at = '2000-01-01 00:00:00' WHERE transaction_id = 'sig-b'")
+    db.execute("UPDATE distribution_records SET updated_at = '2000-01-01 00:00:00'")
+    db.commit()
+    db.close()
+    before = rows(path)
+
+    load_ledger(ledger(tmp_path), f"sqlite:///{path}")
+
+    assert rows(path) == before
+    contributions, records = before
+    assert [row[2] for row in contributions] == ["sig-a", "sig-b", "sig-c"]
+    assert {wallet: float(total) for wallet, total, _ in records} == {SENDER: 2.25, OTHER: 0.25}
+
+
+def test_new_contributions_update_the_wallet_total(tmp_path):
+    path = tmp_path / "presale.db"
+    first = ledger(tmp_path)
+    load_ledger(first, f"sqlite:///{path}")
+    first.add("sig-d", OTHER, 2_000_000_000, 1744605300)
+
+    load_ledger(first, f"sqlite:///{path}")
+
+    contributions, records = rows(path)
+    assert len(contributions) == 4
+    assert {wallet: float(total) for wallet, total, _ in records} == {SENDER: 2.25, OTHER: 2.25}
@@ -0,0 +1,41 @@
+import json
+
+from bench.mock_rpc import MockHistory
+from treasury.commands import transfers
+from treasury.config import TREASURY_WALLET
+from treasury.watermark import WatermarkStore
+
+
+def watermark():
+    return WatermarkStore("sol_transfers").until(TREASURY_WALLET)
+
+
+def saved_transfers():
+    with open("sol_transfers.json") as f:
+        return json.load(f)
+
+
+def test_incremental_watermark_waits_for_every_new_transaction(mock_rpc, templates, workdir, monkeypatch):
+    history = mock_rpc(MockHistory(templates, 40)).history
+    transfers.main(["--incremental"])
+    first_head = history.signatures[0]["signature"]
+    assert watermark() == first_head
+
+    added = history.add(5)
+    lost = next(entry["signature"] for entry in added if entry["err"] is None)
+    transaction = history.transaction
+    monkeypatch.setattr(history, "transaction",
+                        lambda signature, encoding="jsonParsed": None if signature == lost else
+                        transaction(signature, encoding))
+    transfers.main(["--incremental"])
+    assert watermark() == first_head
+
+    # Once the transaction can be fetched, the next run picks it up and moves on
+    monkeypatch.setattr(history, "transaction", transaction)
+    transfers.main(["--incremental"])
+    assert watermark() == history.signatures[0]["signature"]
+    incremental = saved_transfers()
+    assert lost in {record["signature"] for record in incremental}
+
+    transfers.main([])
+    assert saved_transfers() == incremental
@@ -0,0 +1,51 @@
+import asyncio
+
+from bench.mock_rpc import MockHistory
+from treasury.config import TREASURY_WALLET
+from treasury.rpc import RpcClient
+from treasury.wallets import MultiWalletScanner, WalletIndex
+
+# An account in every mock transaction alongside the treasury
+FEE_PAYER = "L2TExMFKdjpN9kozasaurPirfHy9P8sbXoAN1qA3S95"
+WALLETS = {TREASURY_WALLET: "treasury", FEE_PAYER: "payer"}
+
+
+def scanned(wallets):
+    async def scan():
+        async with RpcClient(cache=False) as client:
+            scanner = MultiWalletScanner(client, wallets)
+            return [record async for record in scanner.run()], scanner
+
+    return asyncio.run(scan())
+
+
+def test_shared_transactions_are_fetched_once(mock_rpc, templates, workdir):
+    server = mock_rpc(MockHistory(templates, 300))
+
+    activity, scanner = scanned(WALLETS)
+    assert scanner.complete and scanner.completed == {TREASURY_WALLET: True, FEE_PAYER: True}
+    # Both wallets page the same 300 signatures; the second sighting of each is claimed already
+    assert scanner.signatures_seen == 600
+    assert scanner.duplicates == 300
+    assert scanner.transactions_fetched == server.counts["getTransaction"] == 300
+    assert len({record["signature"] for record in activity}) == len(activity) == 300
+
+    # The same deltas as scanning each wallet on its own
+    for address in WALLETS:
+        alone = {record["signature"]: record["deltas"] for record in scanned({address: "alone"})[0]}
+        assert alone == {record["signature"]: {address: record["deltas"][address]}
+                         for record in activity if address in record["deltas"]}
+
+
+def test_index_reads_each_watched_key_once():
+    index = WalletIndex(WALLETS)
+    tx_data = {
+        "meta": {"preBalances": [100, 50, 7, 9], "postBalances": [90, 60, 7, 1]},
+        "transaction": {"message": {"accountKeys": [
+            {"pubkey": FEE_PAYER}, TREASURY_WALLET, "Other1111111111111111111111111111111111111", FEE_PAYER,
+            # Beyond the balances, e.g. loaded from a lookup table without its balance
+            TREASURY_WALLET]}}
+    }
+    assert index.deltas(tx_data) == {FEE_PAYER: -10, TREASURY_WALLET: 10}
+    assert index.deltas({"meta": None}) == {}
+    assert index.label(FEE_PAYER) == "payer" and index.label("Other") == "Other"
@@ -0,0 +1 @@
+"""Shared helpers for the POOKIE treasury scanner scripts."""
@@ -0,0 +1,209 @@
+"""Compact columnar archive for transfer records.
+
+The historical transfers live in pretty-printed JSON (``sol_transfers.json``,
+``all_incoming_txs.json``, ``contributions_simple.json``) that is slow to parse
+and several times larger than its content. A transfer archive stores the same
+records as fixed-width little-endian columns:
+
+    header     magic, version, record count, pubkey count
+    lamports   int64[n]    signed treasury balance change
+    timestamp  int64[n]    block time, 0 if unknown
+    sender     uint32[n]   index into the pubkey table, UNKNOWN_KEY if unknown
+    flags      uint8[n]    FLAG_SYSTEM_TRANSFER
+    signature  bytes64[n]  raw transaction signatures
+    pubkeys    bytes32[k]  dictionary of the distinct counterparties
+
+``TransferArchive`` memory-maps the file and exposes each column as a
+zero-copy NumPy view, so opening millions of records costs a few page faults
+rather than a JSON parse; base58 strings are only decoded on demand.
+"""
+import mmap
+import os
+import struct
+
+import base58
+import numpy as np
+
+from .extract import LAMPORTS_PER_SOL
+from .records import PubkeyTable
+
+MAGIC = b"POOKTXA1"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")
+UNKNOWN_KEY = 0xFFFFFFFF
+FLAG_SYSTEM_TRANSFER = 1
+
+SIGNATURE_DTYPE = np.dtype("S64")
+PUBKEY_DTYPE = np.dtype("S32")
+
+
+def _columns(count, key_count):
+    """(name, dtype, length, offset) of each section, every one 8-byte aligned"""
+    layout = [("lamports", np.dtype("<i8"), count), ("timestamp", np.dtype("<i8"), count),
+              ("sender", np.dtype("<u4"), count), ("flags", np.dtype("u1"), count),
+              ("signature", SIGNATURE_DTYPE, count), ("pubkeys", PUBKEY_DTYPE, key_count)]
+    offset = HEADER.size
+    sections = []
+    for name, dtype, length in layout:
+        sections.append((name, dtype, length, offset))
+        offset += -(-(dtype.itemsize * length) // 8) * 8
+    return sections, offset
+
+
+def _decode(value, size, what):
+    raw = base58.b58decode(value)
+    if len(raw) != size:
+        raise ValueError(f"{what} {value!r} is not a {size}-byte base58 value")
+    return raw
+
+
+def write_archive(path, records):
+    """Write transfer records to ``path`` atomically.
+
+    Each record is a dict with ``signature``, ``lamports`` and optionally
+    ``timestamp``, ``sender`` and ``is_system_transfer``.
+    """
+    records = list(records)
+    pubkeys = PubkeyTable()
+    sender = np.empty(len(records), dtype="<u4")
+    for i, record in enumerate(records):
+        key = record.get("sender")
+        sender[i] = pubkeys.intern(key) if key and key != "Unknown" else UNKNOWN_KEY
+
+    columns = {
+        "lamports": np.array([record["lamports"] for record in records], dtype="<i8"),
+        "timestamp": np.array([record.get("timestamp") or 0 for record in records], dtype="<i8"),
+        "sender": sender,
+        "flags": np.array([FLAG_SYSTEM_TRANSFER if record.get("is_system_transfer") else 0
+                           for record in records], dtype="u1"),
+        "signature": np.array([_decode(record["signature"], 64, "signature") for record in records],
+                              dtype=SIGNATURE_DTYPE),
+        "pubkeys": np.frombuffer(pubkeys.raw_bytes(), dtype=PUBKEY_DTYPE),
+    }
+
+    sections, size = _columns(len(records), len(pubkeys))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(records), len(pubkeys)))
+        for name, dtype, length, offset in sections:
+            f.seek(offset)
+            f.write(columns[name].tobytes())
+        f.truncate(size)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+class TransferArchive:
+    """Read-only, memory-mapped view of a transfer archive.
+
+    The column attributes are NumPy arrays backed directly by the mapping;
+    they stay valid until ``close()``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, count, key_count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a transfer archive")
+        if version != VERSION:
+            raise ValueError(f"{path} is archive version {version}, expected {VERSION}")
+
+        self.count = count
+        sections, size = _columns(count, key_count)
+        if len(self._mmap) < size:
+            raise ValueError(f"{path} is truncated")
+        for name, dtype, length, offset in sections:
+            setattr(self, name, np.frombuffer(self._mmap, dtype=dtype, count=length, offset=offset))
+        self._pubkey_cache = {}
+
+    def __len__(self):
+        return self.count
+
+    def pubkey(self, key_id):
+        """Base58 pubkey for a ``sender`` id, or None for UNKNOWN_KEY"""
+        key_id = int(key_id)
+        if key_id == UNKNOWN_KEY:
+            return None
+        if key_id not in self._pubkey_cache:
+            # The S32 view strips trailing NUL bytes, so go back to the raw bytes
+            raw = self.pubkeys[key_id:key_id + 1].view(np.uint8).tobytes()
+            self._pubkey_cache[key_id] = base58.b58encode(raw).decode()
+        return self._pubkey_cache[key_id]
+
+    def signature_at(self, index):
+        """Base58 signature of one record"""
+        return base58.b58encode(self.signature[index:index + 1].view(np.uint8).tobytes()).decode()
+
+    def senders(self):
+        """Base58 sender per record (None if unknown), decoding each distinct key once"""
+        return [self.pubkey(key_id) for key_id in self.sender]
+
+    def record(self, index):
+        return {
+            "signature": self.signature_at(index),
+            "lamports": int(self.lamports[index]),
+            "timestamp": int(self.timestamp[index]),
+            "sender": self.pubkey(self.sender[index]),
+            "is_system_transfer": bool(self.flags[index] & FLAG_SYSTEM_TRANSFER)
+        }
+
+    def records(self):
+        for index in range(self.count):
+            yield self.record(index)
+
+    def close(self):
+        # Views into the mapping must be dropped before it can be closed
+        for name in ("lamports", "timestamp", "sender", "flags", "signature", "pubkeys"):
+            self.__dict__.pop(name, None)
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a column; the mapping goes away with it
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def sol_to_lamports(amount):
+    return int(round(amount * LAMPORTS_PER_SOL))
+
+
+def from_sol_transfers(data):
+    """Archive records from ``sol_transfers.json``"""
+    for transfer in data:
+        yield {
+            "signature": transfer["signature"],
+            "lamports": sol_to_lamports(transfer["balance_change"]),
+            "timestamp": transfer.get("timestamp"),
+            # Older dumps called the counterparty "sender"
+            "sender": transfer.get("counterparty", transfer.get("sender")),
+            "is_system_transfer": transfer.get("is_system_transfer", False)
+        }
+
+
+def from_incoming(data):
+    """Archive records from ``all_incoming_txs.json`` or ``contributions_simple.json``"""
+    items = data.get("transactions", data.get("contributions", [])) if isinstance(data, dict) else data
+    for item in items:
+        yield {
+            "signature": item["signature"],
+            "lamports": sol_to_lamports(item["amount"]),
+            "timestamp": item.get("timestamp"),
+            "sender": item.get("sender")
+        }
+
+
+def records_from_json(data):
+    """Pick the converter for a loaded transfer JSON file by its shape"""
+    if isinstance(data, list) and data and "balance_change" in data[0]:
+        return from_sol_transfers(data)
+    return from_incoming(data)
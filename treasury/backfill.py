@@ -0,0 +1,256 @@
+"""Slot-partitioned signature pagination for full-history backfills.
+
+getSignaturesForAddress pages are chained: each page's ``before`` is the
+last signature of the page before it, so paging a history of N signatures
+takes N/1000 round trips one after another. ``PartitionedPager`` cuts the
+history into slot ranges instead, pages them concurrently (spreading the
+requests over the client's endpoints) and hands the pages back newest
+first without duplicates, as serial paging would.
+
+Range edges come from blocks. ``before`` and ``until`` accept any confirmed
+signature, not only the address's own, and a node resolves them in block
+order. A boundary sits between two consecutive blocks: the newer range is
+paged ``until`` the last signature of the older block and the older range
+``before`` the first signature of the newer one. Each range then holds the
+blocks on its side whole, whatever order the node gives a slot; where it
+is not the block's, the two ranges overlap on those blocks instead of
+leaving signatures out, and the overlap is dropped as duplicates.
+
+Where an address's history begins is not known up front. The span from the
+first available block (or a filter's ``min_slot``) to the head is cut
+evenly, and one limit-1 page per boundary finds the ranges holding no
+signatures. While too few ranges hold any, the span is narrowed to start at
+the oldest range that does and cut again.
+
+    pager = PartitionedPager(client, TREASURY_WALLET, partitions=8)
+    async for page in pager.pages():
+        ...
+"""
+import asyncio
+
+from .rpc import RpcError
+
+# Ranges cut per concurrent pager, so a dense stretch of history does not leave the other pagers idle
+RANGES_PER_PARTITION = 4
+# How many times the span may be narrowed towards the oldest signatures before paging
+PLANNING_ROUNDS = 8
+# Blocks tried from a boundary slot for two consecutive ones with signatures
+BOUNDARY_BLOCKS = 8
+BLOCK_OPTIONS = {"transactionDetails": "signatures", "rewards": False, "maxSupportedTransactionVersion": 0}
+
+_END = object()
+
+
+class Boundary:
+    """The cursors that split history between two blocks: ``before`` for the older side, ``until`` for the newer.
+
+    ``until`` is the last signature of the block at ``until_slot`` and
+    ``before`` the first of the next block with any, at ``slot``.
+    """
+
+    __slots__ = ("slot", "before", "until_slot", "until")
+
+    def __init__(self, slot, before, until_slot, until):
+        self.slot = slot
+        self.before = before
+        self.until_slot = until_slot
+        self.until = until
+
+    def precedes(self, entry):
+        """Whether a signature entry is older than everything the newer side holds"""
+        return entry["slot"] < self.until_slot
+
+
+class SlotRange:
+    """History between two boundaries; None edges are the head and the start of history"""
+
+    __slots__ = ("newer", "older", "held")
+
+    def __init__(self, newer=None, older=None):
+        self.newer = newer
+        self.older = older
+        self.held = True  # Whether the range holds any of the address's signatures
+
+    @property
+    def before(self):
+        return self.newer.before if self.newer else None
+
+    @property
+    def until(self):
+        return self.older.until if self.older else None
+
+    def __repr__(self):
+        low = self.older.slot if self.older else "start"
+        high = self.newer.slot if self.newer else "head"
+        return f"SlotRange({low}..{high})"
+
+
+def _signatures(block):
+    return (block or {}).get("signatures") or []
+
+
+async def find_boundary(client, slot):
+    """The boundary after the first block from ``slot`` with signatures, or None"""
+    blocks = await client.call("getBlocksWithLimit", [slot, BOUNDARY_BLOCKS])
+    older = None
+    for block_slot in blocks or []:
+        signatures = _signatures(await client.call("getBlock", [block_slot, BLOCK_OPTIONS]))
+        if not signatures:
+            continue
+        if older:
+            return Boundary(block_slot, signatures[0], *older)
+        older = block_slot, signatures[-1]
+    return None
+
+
+async def find_boundaries(client, slots):
+    """``find_boundary`` for many slots, trying each slot's block and the next slot's in one batch first"""
+    blocks = await client.call_batch([("getBlock", [block_slot, BLOCK_OPTIONS])
+                                      for slot in slots for block_slot in (slot, slot + 1)])
+    boundaries = []
+    for slot, older, newer in zip(slots, blocks[::2], blocks[1::2]):
+        if isinstance(older, RpcError) or isinstance(newer, RpcError) or \
+                not _signatures(older) or not _signatures(newer):
+            boundaries.append(None)
+        else:
+            boundaries.append(Boundary(slot + 1, _signatures(newer)[0], slot, _signatures(older)[-1]))
+    # Skipped slots and empty blocks are looked past one by one
+    missing = [i for i, boundary in enumerate(boundaries) if boundary is None]
+    for i, boundary in zip(missing, await asyncio.gather(*(find_boundary(client, slots[i]) for i in missing))):
+        boundaries[i] = boundary
+    return boundaries
+
+
+class PartitionedPager:
+    """Page an address's history as concurrent slot ranges, yielding pages newest first.
+
+    ``partitions`` ranges are paged at once. With ``min_slot`` the span
+    starts there and each range stops paging once it is past it; with
+    ``max_slot`` paging starts with its block (or the next one). Pages of a
+    range wait in memory until every newer range has been yielded.
+    """
+
+    def __init__(self, client, address, partitions, page_size=1000, min_slot=None, max_slot=None):
+        self.client = client
+        self.address = address
+        self.partitions = partitions
+        self.page_size = page_size
+        self.min_slot = min_slot
+        self.max_slot = max_slot
+        self.ranges = None
+        self.duplicates = 0
+        self._boundary_slots = set()
+        self._edge_signatures = set()
+
+    async def plan(self):
+        """Cut the history into ranges that hold signatures, newest first"""
+        try:
+            self.ranges = await self._plan()
+        except RpcError as e:
+            # Nodes without block history (or without these methods) can still be paged serially
+            print(f"Could not partition the history ({e}); paging it serially")
+            self.ranges = [SlotRange()]
+        self._boundary_slots = {slot for slot_range in self.ranges
+                                for edge in (slot_range.newer, slot_range.older) if edge
+                                for slot in (edge.slot, edge.until_slot)}
+        print(f"Paging {len(self.ranges)} slot ranges, {min(self.partitions, len(self.ranges))} at a time")
+        return self.ranges
+
+    async def _plan(self):
+        ceiling = None
+        if self.max_slot is not None:
+            ceiling = await find_boundary(self.client, self.max_slot)
+            head = self.max_slot
+        else:
+            head = await self.client.call("getSlot", [{"commitment": "finalized"}])
+        low = self.min_slot if self.min_slot is not None else await self.client.call("getFirstAvailableBlock", [])
+
+        wanted = self.partitions * RANGES_PER_PARTITION
+        for _ in range(PLANNING_ROUNDS):
+            ranges = await self._cut(low, head, wanted, ceiling)
+            held = [slot_range for slot_range in ranges if slot_range.held]
+            oldest = held[-1].older if held else None
+            if len(held) >= self.partitions or oldest is None or oldest.slot <= low:
+                break
+            low = oldest.slot
+        return held
+
+    async def _cut(self, low, head, count, ceiling=None):
+        """Evenly cut ranges over [low, head], newest first, each marked with whether it holds signatures"""
+        points = [low + (head - low) * i // count for i in range(count - 1, 0, -1)]
+        boundaries, slots = [], set()
+        for boundary in await find_boundaries(self.client, points):
+            # Boundaries newest first; points inside one long gap can land on the same block
+            if boundary and boundary.slot not in slots and (ceiling is None or boundary.slot < ceiling.slot):
+                boundaries.append(boundary)
+                slots.add(boundary.slot)
+        boundaries.sort(key=lambda boundary: boundary.slot, reverse=True)
+
+        edges = [ceiling] + boundaries + [None]
+        ranges = [SlotRange(newer, older) for newer, older in zip(edges, edges[1:])]
+        # The newest signature older than each boundary shows whether the range below it holds any
+        probes = await self.client.call_batch([("getSignaturesForAddress", [self.address, {"before": slot_range.before,
+                                                                                          "limit": 1}])
+                                               for slot_range in ranges[1:]])
+        for slot_range, probe in zip(ranges[1:], probes):
+            if isinstance(probe, RpcError):
+                raise probe
+            slot_range.held = bool(probe) and (slot_range.older is None or not slot_range.older.precedes(probe[0]))
+            if slot_range.held and self.min_slot is not None and probe[0]["slot"] < self.min_slot:
+                slot_range.held = False
+        return ranges
+
+    async def pages(self):
+        """Yield the address's signature pages newest first, paging the ranges concurrently"""
+        if self.ranges is None:
+            await self.plan()
+        queues = [asyncio.Queue() for _ in self.ranges]
+        pending = iter(range(len(self.ranges)))
+
+        async def pager():
+            for index in pending:
+                slot_range = self.ranges[index]
+                try:
+                    async for page in self.client.iter_signatures(self.address, before=slot_range.before,
+                                                                  until=slot_range.until, limit=self.page_size):
+                        queues[index].put_nowait(page)
+                        if self.min_slot is not None and page[-1]["slot"] < self.min_slot:
+                            break
+                except Exception as e:
+                    # Raised by the consumer when it reaches this range, in order
+                    queues[index].put_nowait(e)
+                    return
+                queues[index].put_nowait(_END)
+
+        tasks = [asyncio.create_task(pager()) for _ in range(min(self.partitions, len(self.ranges)))]
+        try:
+            for queue in queues:
+                while True:
+                    page = await queue.get()
+                    if page is _END:
+                        break
+                    if isinstance(page, Exception):
+                        raise page
+                    page = self._unseen(page)
+                    if page:
+                        yield page
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _unseen(self, page):
+        """Drop entries already yielded; only the two blocks at a boundary can appear on both sides"""
+        kept = []
+        for entry in page:
+            if entry["slot"] in self._boundary_slots:
+                if entry["signature"] in self._edge_signatures:
+                    self.duplicates += 1
+                    continue
+                self._edge_signatures.add(entry["signature"])
+            kept.append(entry)
+        return kept
+
+
+def add_partition_argument(parser):
+    parser.add_argument("--partitions", type=int, default=1, metavar="N",
+                        help="page a full-history scan as N concurrent slot ranges (default: 1, serial)")
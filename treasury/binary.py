@@ -0,0 +1,85 @@
+"""Local decoding of base64-encoded transactions.
+
+With ``"encoding": "jsonParsed"`` the RPC node renders every account key and
+instruction of a transaction as JSON, which is the largest response format
+and the slowest for providers to produce and for us to parse. Asking for
+``"base64"`` returns the wire transaction as one string instead, with the
+same JSON ``meta``; ``decode_transaction`` decodes it with ``solders`` (an
+optional dependency) into the shape the extractors already read:
+
+    accountKeys    base58 strings, including addresses loaded from lookup tables
+    instructions   System Program transfers in their jsonParsed form,
+                   everything else as {"programId", "accounts", "data"}
+
+so the same extractors produce the same records from either encoding. Set
+``SOLANA_TX_ENCODING=base64`` to have the scan pipeline fetch this way.
+"""
+import base64
+
+import base58
+
+from .extract import SYSTEM_PROGRAM_ID
+
+BASE64 = "base64"
+# System Program instruction index of Transfer, followed by a u64 lamport amount
+SYSTEM_TRANSFER = 2
+SYSTEM_TRANSFER_SIZE = 12
+
+
+def _versioned_transaction():
+    try:
+        from solders.transaction import VersionedTransaction
+    except ImportError:
+        raise RuntimeError("base64 transaction decoding needs the solders package (pip install solders)") from None
+    return VersionedTransaction
+
+
+def decode_transaction(tx_data):
+    """Rebuild a base64 ``getTransaction`` result in the shape jsonParsed results have.
+
+    Results that are not base64-encoded (or are None) are returned unchanged.
+    """
+    if not tx_data or not isinstance(tx_data.get("transaction"), list):
+        return tx_data
+    raw, encoding = tx_data["transaction"]
+    if encoding != BASE64:
+        raise ValueError(f"Cannot decode a {encoding}-encoded transaction")
+
+    transaction = _versioned_transaction().from_bytes(base64.b64decode(raw))
+    message = transaction.message
+    keys = [str(key) for key in message.account_keys]
+    loaded = (tx_data.get("meta") or {}).get("loadedAddresses")
+    if loaded:
+        # Version 0 messages index lookup-table addresses after their static keys
+        keys += loaded["writable"] + loaded["readonly"]
+
+    return {
+        **tx_data,
+        "transaction": {
+            "signatures": [str(signature) for signature in transaction.signatures],
+            "message": {
+                "accountKeys": keys,
+                "recentBlockhash": str(message.recent_blockhash),
+                "instructions": [decode_instruction(instruction, keys) for instruction in message.instructions]
+            }
+        }
+    }
+
+
+def decode_instruction(instruction, keys):
+    """A compiled instruction as jsonParsed renders it, parsing only System transfers"""
+    program_id = keys[instruction.program_id_index]
+    accounts = [keys[index] for index in instruction.accounts]
+    data = instruction.data
+    if (program_id == SYSTEM_PROGRAM_ID and len(data) == SYSTEM_TRANSFER_SIZE and len(accounts) >= 2
+            and int.from_bytes(data[:4], "little") == SYSTEM_TRANSFER):
+        return {
+            "program": "system",
+            "programId": program_id,
+            "parsed": {
+                "type": "transfer",
+                "info": {"source": accounts[0], "destination": accounts[1],
+                         "lamports": int.from_bytes(data[4:], "little")}
+            }
+        }
+    return {"programId": program_id, "accounts": accounts, "data": base58.b58encode(data).decode()}
@@ -0,0 +1,141 @@
+"""On-disk cache of getTransaction payloads keyed by signature.
+
+Finalized transactions never change, so once a payload has been downloaded it
+is stored zlib-compressed in a local SQLite file and every later fetch of the
+same signature, commitment and encoding is served from disk. The file is
+bounded by ``max_bytes``; the least recently used entries are evicted first.
+"""
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+CACHE_PATH = os.environ.get("SOLANA_TX_CACHE", ".tx_cache.sqlite3")
+CACHE_MAX_BYTES = int(os.environ.get("SOLANA_TX_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Only transactions at this commitment are immutable and safe to cache
+CACHEABLE_COMMITMENT = "finalized"
+
+# SQLite caps the number of bound parameters per statement
+_QUERY_CHUNK = 500
+
+
+class TransactionCache:
+    """Size-bounded LRU cache of compressed transaction payloads"""
+
+    def __init__(self, path=CACHE_PATH, max_bytes=CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS transactions (
+                signature TEXT NOT NULL,
+                commitment TEXT NOT NULL,
+                encoding TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (signature, commitment, encoding)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS transactions_last_used ON transactions (last_used)")
+        self._db.commit()
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM transactions").fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get(self, signature, encoding="jsonParsed", commitment=CACHEABLE_COMMITMENT):
+        """Return a cached transaction, or None on a miss"""
+        return self.get_many([signature], encoding, commitment).get(signature)
+
+    def get_many(self, signatures, encoding="jsonParsed", commitment=CACHEABLE_COMMITMENT, decode=json.loads):
+        """Return {signature: transaction} for every signature found in the cache.
+
+        ``decode`` turns a stored JSON payload into a transaction; see ``schema``
+        for one that keeps only the fields the extractors read.
+        """
+        found = {}
+        if commitment != CACHEABLE_COMMITMENT:
+            return found
+
+        signatures = list(signatures)
+        for start in range(0, len(signatures), _QUERY_CHUNK):
+            chunk = signatures[start:start + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._db.execute(
+                f"SELECT signature, payload FROM transactions "
+                f"WHERE commitment = ? AND encoding = ? AND signature IN ({placeholders})",
+                [commitment, encoding, *chunk]
+            )
+            for signature, payload in rows:
+                found[signature] = decode(zlib.decompress(payload))
+
+        if found:
+            now = time.time()
+            self._db.executemany(
+                "UPDATE transactions SET last_used = ? WHERE signature = ? AND commitment = ? AND encoding = ?",
+                [(now, signature, commitment, encoding) for signature in found]
+            )
+            self._db.commit()
+        return found
+
+    def put_many(self, transactions, encoding="jsonParsed", commitment=CACHEABLE_COMMITMENT):
+        """Store (signature, transaction) pairs; missing transactions are skipped"""
+        if commitment != CACHEABLE_COMMITMENT:
+            return
+
+        now = time.time()
+        rows = []
+        for signature, tx_data in transactions:
+            if not tx_data:
+                continue
+            payload = zlib.compress(json.dumps(tx_data, separators=(",", ":")).encode(), 6)
+            rows.append((signature, commitment, encoding, payload, len(payload), now))
+        if not rows:
+            return
+
+        # Replaced rows must not be counted twice
+        for signature, _, _, _, size, _ in rows:
+            previous = self._db.execute(
+                "SELECT size FROM transactions WHERE signature = ? AND commitment = ? AND encoding = ?",
+                (signature, commitment, encoding)
+            ).fetchone()
+            self._total_bytes += size - (previous[0] if previous else 0)
+
+        self._db.executemany("INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self._db.commit()
+
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache is under 90% of its budget"""
+        target = int(self.max_bytes * 0.9)
+        while self._total_bytes > target:
+            rows = self._db.execute(
+                "SELECT signature, commitment, encoding, size FROM transactions ORDER BY last_used LIMIT 256"
+            ).fetchall()
+            if not rows:
+                break
+
+            evicted = []
+            for row in rows:
+                if self._total_bytes <= target:
+                    break
+                evicted.append(row[:3])
+                self._total_bytes -= row[3]
+            self._db.executemany(
+                "DELETE FROM transactions WHERE signature = ? AND commitment = ? AND encoding = ?",
+                evicted
+            )
+        self._db.commit()
@@ -0,0 +1,157 @@
+"""Crash-safe checkpoints so long scans can resume where they stopped.
+
+A ``ScanCheckpoint`` records, per address, the pagination cursor and whether
+paging has ended, plus the signatures already paged but not yet processed,
+the ones processed and the records found so far. ``SignaturePipeline`` keeps
+it current as pages and chunks complete and writes it atomically every
+``CHECKPOINT_INTERVAL`` seconds and when a run stops, including on Ctrl-C.
+
+On resume the pipeline yields the saved records first, re-queues the pending
+signatures and carries on paging from each cursor, so the caller sees the
+same records as an uninterrupted run would have produced.
+"""
+import json
+import os
+import time
+
+CHECKPOINT_INTERVAL = float(os.environ.get("SOLANA_CHECKPOINT_INTERVAL", "5"))
+CHECKPOINT_VERSION = 1
+
+
+class CheckpointMismatch(ValueError):
+    """Raised when a checkpoint was written by a run with different parameters."""
+
+
+class ScanCheckpoint:
+    """Progress of one scan, kept in a JSON file next to its output.
+
+    ``params`` identifies the run (address, ``until``, limits, filter
+    window); resuming with different parameters raises ``CheckpointMismatch``
+    rather than mixing two scans' results.
+    """
+
+    def __init__(self, path, params, interval=CHECKPOINT_INTERVAL):
+        self.path = path
+        self.params = params
+        self.interval = interval
+        self.resumed = False
+        self._last_save = time.monotonic()
+        self._reset()
+
+    def _reset(self):
+        self.cursors = {}
+        self.seen = {}
+        self.paged = {}
+        self.newest = {}
+        self.pending = {}
+        self.processed = set()
+        self.records = []
+        self.stats = {}
+
+    def load(self):
+        """Restore the saved state; return False if there is nothing to resume"""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path) as f:
+            state = json.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise CheckpointMismatch(f"{self.path} is checkpoint version {state.get('version')}, "
+                                     f"expected {CHECKPOINT_VERSION}")
+        if state["params"] != self.params:
+            raise CheckpointMismatch(f"{self.path} belongs to a scan with different options: {state['params']}")
+
+        self.cursors = state["cursors"]
+        self.seen = state["seen"]
+        self.paged = state["paged"]
+        self.newest = state["newest"]
+        self.pending = {entry["signature"]: entry for entry in state["pending"]}
+        self.processed = set(state["processed"])
+        self.records = state["records"]
+        self.stats = state["stats"]
+        self.resumed = True
+        return True
+
+    @property
+    def finished(self):
+        """Whether every paged address has ended and nothing is left to fetch"""
+        return bool(self.paged) and not self.pending
+
+    def add_page(self, address, entries, cursor, seen):
+        """Record a page whose ``entries`` are about to be queued for fetching"""
+        for entry in entries:
+            if entry["signature"] not in self.processed:
+                self.pending[entry["signature"]] = entry
+        self.cursors[address] = cursor
+        self.seen[address] = seen
+
+    def end_paging(self, address, complete):
+        """Record that an address's pagination stopped on its own (not on an error)"""
+        self.paged[address] = complete
+
+    def chunk_done(self, entries, records):
+        """Record fetched entries and the records extracted from them"""
+        for entry in entries:
+            self.pending.pop(entry["signature"], None)
+            self.processed.add(entry["signature"])
+        self.records.extend(records)
+
+    def save(self, stats=None):
+        """Write the state atomically so a crash never leaves a torn file"""
+        if stats is not None:
+            self.stats = stats
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "params": self.params,
+            "updated_at": int(time.time()),
+            "cursors": self.cursors,
+            "seen": self.seen,
+            "paged": self.paged,
+            "newest": self.newest,
+            "pending": list(self.pending.values()),
+            "processed": sorted(self.processed),
+            "records": self.records,
+            "stats": self.stats
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._last_save = time.monotonic()
+
+    def save_due(self):
+        return time.monotonic() - self._last_save >= self.interval
+
+    def clear(self):
+        """Delete the checkpoint once its scan has finished"""
+        for path in (self.path, f"{self.path}.tmp"):
+            if os.path.exists(path):
+                os.remove(path)
+        self._reset()
+
+
+def scan_params(address, until=None, max_signatures=None, signature_filter=None):
+    """The options that must match for a checkpoint to be resumed"""
+    params = {"address": address, "until": until, "max_signatures": max_signatures}
+    if signature_filter:
+        params["filter"] = [signature_filter.skip_failed, signature_filter.min_slot, signature_filter.max_slot,
+                            signature_filter.start_time, signature_filter.end_time]
+    return params
+
+
+def open_checkpoint(path, params, resume=False):
+    """A checkpoint for a new run, or the saved one when resuming"""
+    checkpoint = ScanCheckpoint(path, params)
+    if resume:
+        if checkpoint.load():
+            print(f"Resuming from {path}: {len(checkpoint.processed)} signatures processed, "
+                  f"{len(checkpoint.records)} records found")
+        else:
+            print(f"No checkpoint at {path}, starting from the beginning")
+    return checkpoint
+
+
+def add_resume_argument(parser, path):
+    parser.add_argument("--resume", action="store_true",
+                        help=f"continue an interrupted scan from {path} instead of starting over")
@@ -0,0 +1,53 @@
+"""Command-line entry point: ``python -m treasury <command> [options]``.
+
+Only the module of the command being run is imported, so quick commands such
+as ``balance`` (run from cron every minute) never load aiohttp, NumPy or the
+transaction cache. With ``SOLANA_METRICS_FILE`` set, the command's metrics
+(see ``metrics``) are written there when it finishes.
+"""
+import importlib
+import os
+import sys
+
+# Command name -> (module in treasury.commands, one-line help)
+COMMANDS = {
+    "balance": ("balance", "print the treasury balance"),
+    "signatures": ("signatures", "list the treasury's transaction signatures"),
+    "transfers": ("transfers", "find SOL transfers in and out of the treasury"),
+    "contributions": ("contributions", "find presale contributions to the treasury"),
+    "incoming": ("incoming", "find every incoming transfer to the treasury"),
+    "examine": ("examine", "analyze balance changes in recent treasury transactions"),
+    "wallets": ("wallets", "track several wallets in a single scan"),
+    "dump": ("dump", "dump recent transactions to NDJSON"),
+    "archive": ("archive", "convert transfer JSON to columnar archives and summarize them"),
+    "monitor": ("monitor", "watch the treasury over WebSocket and report transfers as they land"),
+    "replay": ("replay", "rerun an extractor over saved dumps and cached transactions, offline"),
+}
+
+
+def usage():
+    width = max(len(name) for name in COMMANDS)
+    lines = ["usage: treasury <command> [options]", "", "commands:"]
+    lines += [f"  {name:<{width}}  {help_text}" for name, (_, help_text) in COMMANDS.items()]
+    lines += ["", "Run 'treasury <command> --help' for a command's options."]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+    name, args = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"treasury: unknown command {name!r}\n\n{usage()}", file=sys.stderr)
+        return 2
+
+    module = importlib.import_module(f"treasury.commands.{COMMANDS[name][0]}")
+    metrics_file = os.environ.get("SOLANA_METRICS_FILE")
+    try:
+        return module.main(args, prog=f"treasury {name}") or 0
+    finally:
+        if metrics_file:
+            from .metrics import REGISTRY
+            REGISTRY.write(metrics_file)
@@ -0,0 +1,102 @@
+"""Vectorized, columnar balance-delta analysis.
+
+``analyze_transaction`` walks each transaction's balance lists in Python.
+For whole-transaction analysis of many transactions at once, the engine here
+loads them into flat NumPy int64 columns (lamport balances, interned
+account-key ids, fees) with per-transaction offsets and finds the non-dust
+balance changes of all of them in a handful of array operations. Results are
+identical to the scalar extractor because both work in integer lamports.
+
+Building the columns from JSON dicts costs about as much as one scalar pass,
+so the engine pays off for analysis that looks at every account, not just
+the treasury, and when one ``TransactionColumns`` is reused for several
+queries; pass it as ``columns=`` to skip the rebuild.
+"""
+import numpy as np
+
+from .extract import DUST_LAMPORTS, LAMPORTS_PER_SOL, account_key_strings
+
+
+class TransactionColumns:
+    """Balance data for many transactions as flat int64 columns.
+
+    Row ``j`` of the account columns belongs to transaction ``tx_index[j]``;
+    transaction ``i`` owns rows ``offsets[i]:offsets[i + 1]``. Transactions
+    without metadata simply own no rows.
+    """
+
+    def __init__(self, transactions, key_ids=None):
+        self.transactions = transactions
+        # Account keys are interned to small integer ids so matching is integer compares
+        self.key_ids = {} if key_ids is None else key_ids
+
+        # Loading is the only per-account Python work, so it sticks to C-level list.extend
+        pre, post, account_keys, counts, fees, block_times = [], [], [], [], [], []
+        for tx_data in transactions:
+            meta = tx_data.get("meta") if tx_data else None
+            if not meta:
+                counts.append(0)
+                fees.append(0)
+                block_times.append(0)
+                continue
+
+            pre_balances, post_balances = meta["preBalances"], meta["postBalances"]
+            tx_keys = account_key_strings(tx_data)
+            n = min(len(pre_balances), len(post_balances), len(tx_keys))
+            if n == len(pre_balances) == len(post_balances) == len(tx_keys):
+                pre.extend(pre_balances)
+                post.extend(post_balances)
+                account_keys.extend(tx_keys)
+            else:
+                pre.extend(pre_balances[:n])
+                post.extend(post_balances[:n])
+                account_keys.extend(tx_keys[:n])
+            counts.append(n)
+            fees.append(meta.get("fee", 0))
+            block_times.append(tx_data.get("blockTime") or 0)
+
+        intern = self.key_ids.setdefault
+        self.pre = np.array(pre, dtype=np.int64)
+        self.post = np.array(post, dtype=np.int64)
+        self.keys = np.fromiter((intern(key, len(self.key_ids)) for key in account_keys),
+                                dtype=np.int64, count=len(account_keys))
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(self.counts)))
+        self.fees = np.asarray(fees, dtype=np.int64)
+        self.block_times = np.asarray(block_times, dtype=np.int64)
+        self.tx_index = np.repeat(np.arange(len(transactions)), self.counts)
+        self.deltas = self.post - self.pre
+
+    def __len__(self):
+        return len(self.transactions)
+
+    def key_id(self, address):
+        """Interned id of an address, or -1 if no transaction mentions it"""
+        return self.key_ids.get(address, -1)
+
+
+def analyze_transactions_batch(transactions, treasury_address, columns=None):
+    """Vectorized ``analyze_transaction``: non-dust balance changes where the treasury is involved"""
+    columns = columns or TransactionColumns(transactions)
+    moved = np.abs(columns.deltas) > DUST_LAMPORTS
+    is_treasury = columns.keys == columns.key_id(treasury_address)
+    involved = np.zeros(len(columns), dtype=bool)
+    involved[columns.tx_index[moved & is_treasury]] = True
+
+    id_to_key = list(columns.key_ids)
+    results = [None] * len(columns)
+    for i in np.flatnonzero(involved):
+        start, end = columns.offsets[i], columns.offsets[i + 1]
+        rows = start + np.flatnonzero(moved[start:end])
+        tx_data = transactions[i]
+        results[i] = {
+            "signature": tx_data["transaction"]["signatures"][0],
+            "block_time": tx_data.get("blockTime"),
+            "success": not tx_data["meta"].get("err"),
+            "transfers": [{
+                "account": id_to_key[columns.keys[row]],
+                "change_sol": int(columns.deltas[row]) / LAMPORTS_PER_SOL,
+                "is_treasury": bool(is_treasury[row])
+            } for row in rows]
+        }
+    return results
@@ -0,0 +1,5 @@
+"""One module per ``treasury`` subcommand, each exposing ``main(argv, prog)``.
+
+Command modules are imported only when their command runs, so they may pull
+in heavy dependencies at module level; ``balance`` deliberately does not.
+"""
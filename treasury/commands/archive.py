@@ -0,0 +1,59 @@
+"""``treasury archive``: convert transfer JSON to columnar archives and summarize them."""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from ..archive import TransferArchive, records_from_json, write_archive
+from ..extract import LAMPORTS_PER_SOL
+
+# Convert a transfer JSON file (sol_transfers.json, all_incoming_txs.json,
+# contributions_simple.json) into a columnar archive
+def convert(source, target):
+    with open(source) as f:
+        data = json.load(f)
+    count = write_archive(target, records_from_json(data))
+    print(f"Wrote {count} records from {source} to {target} "
+          f"({os.path.getsize(source)} -> {os.path.getsize(target)} bytes)")
+
+# Print totals straight from the memory-mapped columns
+def summary(path):
+    started = time.perf_counter()
+    with TransferArchive(path) as archive:
+        lamports = archive.lamports
+        incoming = lamports[lamports > 0]
+        outgoing = lamports[lamports < 0]
+        senders = archive.sender[lamports > 0]
+        elapsed = time.perf_counter() - started
+
+        print(f"{path}: {len(archive)} transfers, {len(archive.pubkeys)} distinct counterparties "
+              f"(read in {elapsed * 1000:.1f} ms)")
+        print(f"Total incoming: {int(incoming.sum()) / LAMPORTS_PER_SOL} SOL in {len(incoming)} transfers")
+        print(f"Total outgoing: {-int(outgoing.sum()) / LAMPORTS_PER_SOL} SOL in {len(outgoing)} transfers")
+        timestamps = archive.timestamp[archive.timestamp > 0]
+        if len(timestamps):
+            first, last = timestamps.min(), timestamps.max()
+            print(f"Time range: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(first))} - "
+                  f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(last))}")
+        if len(senders):
+            ids, counts = np.unique(senders, return_counts=True)
+            print("\nMost frequent senders:")
+            for key_id, count in sorted(zip(ids, counts), key=lambda x: x[1], reverse=True)[:5]:
+                print(f"  {archive.pubkey(key_id) or 'Unknown'}: {count} transfers")
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Convert transfer JSON into columnar archives and read them back")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    convert_parser = subparsers.add_parser("convert", help="write an archive from a transfer JSON file")
+    convert_parser.add_argument("source")
+    convert_parser.add_argument("target", nargs="?", help="defaults to the source name with a .tca suffix")
+    summary_parser = subparsers.add_parser("summary", help="print totals from an archive")
+    summary_parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        convert(args.source, args.target or os.path.splitext(args.source)[0] + ".tca")
+    else:
+        summary(args.path)
@@ -0,0 +1,52 @@
+"""``treasury balance``: current balance of a wallet.
+
+This runs from cron every minute, so it makes one blocking request with
+``urllib.request`` instead of using the asyncio client: no aiohttp, no
+cache, no rate limiter, just the first endpoint that answers.
+"""
+import argparse
+import json
+import urllib.request
+
+from ..config import RPC_TIMEOUT, TREASURY_WALLET, rpc_urls
+from ..extract import LAMPORTS_PER_SOL
+
+
+def post_json(url, payload, timeout=RPC_TIMEOUT):
+    """POST a JSON payload and decode the JSON response; HTTP errors raise ``urllib.error.HTTPError``"""
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(),
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def get_balance(address, urls=None, timeout=RPC_TIMEOUT):
+    """Balance in lamports from the first endpoint that answers"""
+    payload = {"jsonrpc": "2.0", "id": 1, "method": "getBalance", "params": [address]}
+    last_error = None
+    for url in urls or rpc_urls():
+        try:
+            body = post_json(url, payload, timeout)
+        except (OSError, ValueError) as e:
+            last_error = e
+            continue
+        if "error" in body:
+            last_error = body["error"].get("message")
+            continue
+        return body["result"]["value"]
+    raise RuntimeError(f"All RPC attempts failed for getBalance: {last_error}")
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Print the current balance of a wallet")
+    parser.add_argument("address", nargs="?", default=TREASURY_WALLET, help="defaults to the treasury wallet")
+    parser.add_argument("--lamports", action="store_true", help="print lamports instead of SOL")
+    parser.add_argument("--timeout", type=float, default=10, help="seconds to wait for each endpoint")
+    args = parser.parse_args(argv)
+
+    try:
+        lamports = get_balance(args.address, timeout=args.timeout)
+    except RuntimeError as e:
+        print(f"Error fetching balance: {e}")
+        return 1
+    print(lamports if args.lamports else f"{lamports / LAMPORTS_PER_SOL} SOL")
@@ -0,0 +1,247 @@
+"""``treasury contributions``: presale contributions to the treasury wallet."""
+import argparse
+import asyncio
+import json
+from datetime import datetime
+
+from ..config import TREASURY_WALLET
+from ..extract import LAMPORTS_PER_SOL, account_key_strings
+from ..ledger import LEDGER_PATH, TARGET_LAMPORTS, ContributionLedger
+from ..rpc import RpcClient, RpcError
+from ..sink import DATABASE_URL, open_sink
+
+# Contribution parameters
+TARGET_TOTAL = TARGET_LAMPORTS / LAMPORTS_PER_SOL  # Target total SOL
+BATCH_SIZE = 50
+MAX_BATCHES = 20  # How far back a scan pages before giving up on the target
+
+# Process a single transaction to find contributions
+def process_transaction(tx_data, sig, blockTime=None):
+    if not tx_data or not tx_data.get("meta"):
+        return None
+    
+    # Quick pre-check: See if treasury account had a positive balance change
+    if "postBalances" not in tx_data["meta"] or "preBalances" not in tx_data["meta"]:
+        return None
+    
+    # Find the index of the treasury wallet in account keys
+    try:
+        treasury_index = account_key_strings(tx_data).index(TREASURY_WALLET)
+    except ValueError:
+        return None
+    
+    # Check if transaction increased treasury balance
+    if (treasury_index < len(tx_data["meta"]["postBalances"]) and 
+        treasury_index < len(tx_data["meta"]["preBalances"])):
+        post_balance = tx_data["meta"]["postBalances"][treasury_index]
+        pre_balance = tx_data["meta"]["preBalances"][treasury_index]
+        
+        if post_balance <= pre_balance:
+            return None  # Not a deposit
+    
+    # Look through instructions for specific transfer
+    for inst in tx_data["transaction"]["message"]["instructions"]:
+        parsed = inst.get("parsed") or {}
+        if parsed.get("type") == "transfer":
+            info = parsed.get("info", {})
+            if info.get("destination") == TREASURY_WALLET:
+                lamports = int(info.get("lamports", 0))
+                # Tiers are matched on exact lamports, never on float SOL
+                if ContributionLedger.is_tier(lamports):
+                    return {
+                        "sender": info.get("source"),
+                        "lamports": lamports,
+                        "timestamp": blockTime,
+                        "signature": sig
+                    }
+    
+    return None
+
+def contribution_record(signature, sender, lamports, timestamp):
+    """A contributions_full.json entry"""
+    time_str = "Unknown"
+    if timestamp:
+        time_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+    return {
+        "sender": sender,
+        "amount": lamports / LAMPORTS_PER_SOL,
+        "timestamp": timestamp,
+        "time": time_str,
+        "signature": signature
+    }
+
+# Fetch one page of signatures' transactions and add the contributions to the ledger.
+# With stop_at_target the rest of the page is left once the target is reached; returns the entries used.
+async def record_page(client, ledger, page, stop_at_target=False):
+    txs = await client.get_transactions([entry["signature"] for entry in page])
+    for used, (entry, tx) in enumerate(zip(page, txs), 1):
+        contribution = process_transaction(tx, entry["signature"], entry.get("blockTime", 0))
+        if contribution and ledger.add(contribution["signature"], contribution["sender"], contribution["lamports"],
+                                       contribution["timestamp"]):
+            print(f"✅ Found: {contribution['lamports'] / LAMPORTS_PER_SOL} SOL from {contribution['sender']}")
+            print(f"Current total: {ledger.total_sol} SOL of {TARGET_TOTAL} target")
+            if stop_at_target and ledger.reached():
+                return page[:used]
+    return page
+
+# Bring the ledger up to date: new signatures since the last run, then further back if the
+# first scan stopped before the contributions reached the target
+async def update_ledger(ledger, max_batches=MAX_BATCHES):
+    async with RpcClient() as client:
+        head = None
+        if ledger.newest:
+            print(f"Fetching signatures newer than {ledger.newest[:24]}...")
+            async for page in client.iter_signatures(TREASURY_WALLET, until=ledger.newest, limit=BATCH_SIZE):
+                head = head or page[0]["signature"]
+                print(f"Processing {len(page)} new signatures...")
+                await record_page(client, ledger, page)
+        
+        if not ledger.backfilled and not ledger.reached():
+            batch_count = 0
+            async for page in client.iter_signatures(TREASURY_WALLET, before=ledger.oldest, limit=BATCH_SIZE,
+                                                     max_pages=max_batches):
+                batch_count += 1
+                print(f"Fetching batch {batch_count}: {len(page)} signatures...")
+                if not ledger.newest:
+                    head = head or page[0]["signature"]
+                used = await record_page(client, ledger, page, stop_at_target=True)
+                ledger.oldest = used[-1]["signature"]
+                print(f"Completed batch {batch_count}. Current total: {ledger.total_sol} SOL")
+                if ledger.reached():
+                    break
+            # Paging back ends at the target or at the start of the history, not at the batch limit
+            ledger.backfilled = ledger.reached() or batch_count < max_batches
+        
+        # Only now is every signature up to the head in the ledger
+        if head:
+            ledger.newest = head
+
+# Bulk load the whole ledger; contributions already in the database are left as they are
+def load_ledger(ledger, database):
+    print(f"Loading {len(ledger)} contributions into {database.split('@')[-1]}...")
+    with open_sink(database) as sink:
+        for signature, (sender, lamports, timestamp) in ledger.contributions.items():
+            sink.add(signature, sender, lamports, timestamp)
+    print(f"Loaded {sink.loaded} contributions in {sink.batches} batches")
+
+async def scan_contributions(rebuild=False, database=None):
+    ledger = ContributionLedger(load=not rebuild)
+    if len(ledger):
+        print(f"Loaded {len(ledger)} contributions ({ledger.total_sol} SOL) from {ledger.path}")
+    try:
+        await update_ledger(ledger)
+    except RpcError as e:
+        # Whatever was found is kept; the boundaries only move past pages that completed
+        print(f"Error fetching signatures: {e}")
+    finally:
+        ledger.save()
+    
+    save_contributions(ledger)
+    print(f"Ledger saved to {ledger.path}")
+    if database:
+        load_ledger(ledger, database)
+
+# Save contributions_full.json from the ledger and summarize it; shared with `treasury replay`
+def save_contributions(ledger):
+    # Newest first, as the contributions arrived
+    contributions = sorted(ledger.contributions.items(), key=lambda item: (item[1][2] or 0, item[0]), reverse=True)
+    result = {
+        "total_sol": ledger.total_sol,
+        "contribution_count": len(ledger),
+        "contributions": [contribution_record(signature, *entry) for signature, entry in contributions]
+    }
+    
+    # Save to file
+    with open("contributions_full.json", "w") as f:
+        json.dump(result, f, indent=2)
+    
+    # Print summary
+    print("\n=== SUMMARY ===")
+    print(f"Total SOL: {ledger.total_sol}")
+    print(f"Contribution count: {len(ledger)}")
+    print("Contributions by amount:")
+    for lamports, count in ledger.tiers.items():
+        if count:
+            print(f"  {lamports / LAMPORTS_PER_SOL} SOL: {count} contributions")
+    print("Top contributors:")
+    for sender, lamports, count in ledger.top_senders(5):
+        print(f"  {sender}: {lamports / LAMPORTS_PER_SOL} SOL in {count} contributions")
+    if not ledger.reached():
+        print(f"Target of {TARGET_TOTAL} SOL not reached yet")
+    print("\nDetails saved to contributions_full.json")
+
+# One simple RPC call to get signatures, then all transactions concurrently
+async def fetch_recent():
+    async with RpcClient() as client:
+        try:
+            sigs = await client.get_signatures(TREASURY_WALLET, limit=100)
+        except RpcError as e:
+            print(f"Error: {e}")
+            return [], []
+        print(f"Found {len(sigs)} recent signatures")
+        
+        txs = await client.get_transactions([sig_data["signature"] for sig_data in sigs])
+    return sigs, txs
+
+# Quick scan of the 100 most recent transactions
+def quick_scan():
+    sigs, txs = asyncio.run(fetch_recent())
+    
+    contributions = []
+    total = 0
+    
+    for i, (sig_data, tx) in enumerate(zip(sigs, txs)):
+        sig = sig_data["signature"]
+        print(f"Processing {i+1}/{len(sigs)}: {sig[:8]}...")
+        
+        if not tx: continue
+        
+        # Look for transfers
+        for inst in tx["transaction"]["message"]["instructions"]:
+            parsed = inst.get("parsed", {})
+            if parsed.get("type") == "transfer":
+                info = parsed.get("info", {})
+                if info.get("destination") == TREASURY_WALLET:
+                    lamports = int(info.get("lamports", 0))
+                    sol_amount = lamports / LAMPORTS_PER_SOL
+                    
+                    if ContributionLedger.is_tier(lamports):
+                        sender = info.get("source")
+                        print(f"✓ Found: {sol_amount} SOL from {sender}")
+                        
+                        contributions.append({
+                            "sender": sender,
+                            "amount": sol_amount,
+                            "signature": sig
+                        })
+                        
+                        total += sol_amount
+    
+    # Print summary
+    print(f"\nTotal found: {total} SOL")
+    print(f"Contributions: {len(contributions)}")
+    
+    # Output to file
+    with open("contributions_simple.json", "w") as f:
+        json.dump({
+            "total": total,
+            "count": len(contributions),
+            "contributions": contributions
+        }, f, indent=2)
+    
+    print("Results saved to contributions_simple.json")
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Find presale contributions to the treasury wallet")
+    parser.add_argument("--quick", action="store_true",
+                        help="only check the 100 most recent transactions and write contributions_simple.json")
+    parser.add_argument("--rebuild", action="store_true",
+                        help=f"discard {LEDGER_PATH} and scan the history again from the newest signature")
+    parser.add_argument("--database", default=DATABASE_URL,
+                        help="postgresql:// or sqlite:/// URL to load the contributions into "
+                             "(default: $TREASURY_DATABASE_URL)")
+    args = parser.parse_args(argv)
+    if args.quick:
+        quick_scan()
+    else:
+        asyncio.run(scan_contributions(rebuild=args.rebuild, database=args.database))
@@ -0,0 +1,215 @@
+"""``treasury dump``: stream recent treasury transactions to a dump file.
+
+Three layouts, from the scripts this command replaces, written to the files
+those scripts wrote:
+
+    full     jsonParsed transactions as {"signature", "data"} (txns.json)
+    raw      json-encoded transactions as strings (all_raw_txs.json)
+    compact  balances and account keys only (all_incoming_txs.json)
+
+By default the dump is the scripts' indented JSON array. An ``--output``
+whose name contains ``.ndjson`` gets append-only NDJSON instead, optionally
+compressed (``.gz``/``.zst``) and extended with ``--append``; see
+``treasury.ndjson``.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from ..config import TREASURY_WALLET
+from ..ndjson import is_ndjson, open_dump
+from ..rpc import RpcClient, RpcError
+
+DEFAULT_OUTPUTS = {
+    "full": "txns.json",
+    "raw": "all_raw_txs.json",
+    "compact": "all_incoming_txs.json",
+}
+
+async def get_signatures(client, address, limit=1000, before=None, until=None):
+    """Get transaction signatures for an address"""
+    try:
+        return await client.get_signatures(address, before=before, until=until, limit=limit)
+    except RpcError as e:
+        print(f"Error fetching signatures: {e}")
+        return []
+
+def print_balance_changes(sig, data):
+    """Print basic info about a transaction for quick reference"""
+    # Print balance changes for accounts
+    if "meta" in data and "postTokenBalances" in data["meta"]:
+        print(f"\nTx: {sig[:10]}...")
+        
+        # Look for pre/post balance changes
+        if "preBalances" in data["meta"] and "postBalances" in data["meta"]:
+            account_keys = data["transaction"]["message"]["accountKeys"]
+            for i, (pre, post) in enumerate(zip(data["meta"]["preBalances"], data["meta"]["postBalances"])):
+                diff = (post - pre) / 1e9
+                if diff != 0:
+                    account = account_keys[i]
+                    account_id = account.get("pubkey", account) if isinstance(account, dict) else account
+                    print(f"  Account {account_id}: {diff:+.9f} SOL")
+
+# Full jsonParsed data of the 50 most recent transactions
+async def dump_full(output, append=False):
+    async with RpcClient() as client:
+        # Get recent signatures
+        print(f"Fetching recent transactions for {TREASURY_WALLET}...")
+        signatures = await get_signatures(client, TREASURY_WALLET, limit=50)
+        print(f"Found {len(signatures)} signatures")
+        
+        # Write each transaction as soon as its batch arrives
+        print("\nTransaction summary:")
+        with open_dump(output, append) as writer:
+            async for sig, tx_data in client.iter_transactions([sig_data["signature"] for sig_data in signatures]):
+                if tx_data:
+                    writer.write({"signature": sig, "data": tx_data})
+                    print_balance_changes(sig, tx_data)
+    
+    print(f"\nSaved full data for {writer.count} transactions to {output}")
+
+# Raw json-encoded transactions for recent signatures, plus every signature seen
+async def dump_raw(output, append=False):
+    async with RpcClient() as client:
+        # Fetch current balance
+        balance_sol = await client.get_balance(TREASURY_WALLET) / 1_000_000_000
+        print(f"Current balance: {balance_sol} SOL")
+        
+        # Get as many transactions as possible
+        print(f"Fetching transaction signatures for {TREASURY_WALLET}...")
+        all_signatures = []
+        
+        # First batch
+        sig_batch = await get_signatures(client, TREASURY_WALLET, limit=1000)
+        all_signatures.extend(sig_batch)
+        
+        # If we got a full batch, there might be more
+        while sig_batch and len(sig_batch) == 1000:
+            last_sig = sig_batch[-1]["signature"]
+            print(f"Found {len(all_signatures)} signatures so far, fetching more before {last_sig}...")
+            sig_batch = await get_signatures(client, TREASURY_WALLET, limit=1000, before=last_sig)
+            all_signatures.extend(sig_batch)
+        
+        print(f"Found a total of {len(all_signatures)} transactions")
+        
+        # Save all signatures
+        with open("all_signatures.json", "w") as f:
+            signatures_list = [{"signature": sig["signature"], "slot": sig["slot"], "block_time": sig.get("blockTime")} 
+                              for sig in all_signatures]
+            json.dump(signatures_list, f, indent=2)
+        
+        # Get transaction data for recent transactions (limit to 100 to avoid timeouts)
+        recent_signatures = all_signatures[:100] 
+        print(f"Fetching {len(recent_signatures)} transactions...")
+        block_times = {sig["signature"]: sig.get("blockTime") for sig in recent_signatures}
+        
+        # Write each raw transaction out as soon as its batch arrives
+        with open_dump(output, append) as writer:
+            async for signature, tx_data in client.iter_transactions(list(block_times), encoding="json"):
+                if tx_data:
+                    # Store the complete transaction data without parsing
+                    writer.write({
+                        "signature": signature,
+                        "block_time": block_times[signature],
+                        "full_data": json.dumps(tx_data)
+                    })
+    
+    print(f"\nSaved {writer.count} raw transactions to {output}")
+
+def serialize_transaction(sig_data, tx_data):
+    """Convert to serializable format"""
+    return {
+        "signature": sig_data["signature"],
+        "block_time": sig_data.get("blockTime"),
+        "slot": sig_data["slot"],
+        "transaction": {
+            "signatures": tx_data["transaction"]["signatures"],
+            "message": {
+                "account_keys": [key["pubkey"] if isinstance(key, dict) else key
+                                 for key in tx_data["transaction"]["message"]["accountKeys"]],
+                "recent_blockhash": tx_data["transaction"]["message"]["recentBlockhash"]
+            }
+        },
+        "meta": {
+            "fee": tx_data["meta"]["fee"],
+            "pre_balances": tx_data["meta"]["preBalances"],
+            "post_balances": tx_data["meta"]["postBalances"],
+            "status": "success" if not tx_data["meta"]["err"] else "error"
+        }
+    }
+
+def print_summary_line(i, tx):
+    """Try to figure out if this was a SOL transfer to the treasury"""
+    tx_date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(tx["block_time"])) if tx["block_time"] else "Unknown"
+    account_keys = tx["transaction"]["message"]["account_keys"]
+    pre_balances = tx["meta"]["pre_balances"]
+    post_balances = tx["meta"]["post_balances"]
+    
+    # Find treasury index in account_keys
+    treasury_idx = None
+    for idx, key in enumerate(account_keys):
+        if key == TREASURY_WALLET:
+            treasury_idx = idx
+            break
+    
+    if treasury_idx is not None:
+        pre_sol = pre_balances[treasury_idx] / 1_000_000_000
+        post_sol = post_balances[treasury_idx] / 1_000_000_000
+        change = post_sol - pre_sol
+        
+        print(f"{i+1}. [{tx_date}] {change:+.5f} SOL - {tx['signature'][:10]}...")
+
+# Compact balance summaries of the 50 most recent transactions
+async def dump_compact(output, append=False):
+    async with RpcClient() as client:
+        print(f"Checking current balance for {TREASURY_WALLET}...")
+        balance_sol = await client.get_balance(TREASURY_WALLET) / 1_000_000_000
+        print(f"Current balance: {balance_sol} SOL")
+        
+        print(f"\nFetching transaction signatures for {TREASURY_WALLET}...")
+        signatures_data = await get_signatures(client, TREASURY_WALLET, limit=50)  # Get the most recent 50 transactions
+        
+        if not signatures_data:
+            print("No transactions found")
+            return
+            
+        print(f"Found {len(signatures_data)} transactions")
+        
+        # Save raw signatures response
+        with open("raw_signatures.json", "w") as f:
+            signatures_list = [{"signature": sig["signature"], "slot": sig["slot"], "block_time": sig.get("blockTime")} 
+                              for sig in signatures_data]
+            json.dump(signatures_list, f, indent=2)
+        
+        # Get full transaction data for each signature, writing each one out as its batch arrives
+        print(f"Fetching {len(signatures_data)} transactions...")
+        print("\nTransaction summary:")
+        by_signature = {sig["signature"]: sig for sig in signatures_data}
+        with open_dump(output, append) as writer:
+            async for signature, tx_data in client.iter_transactions(list(by_signature)):
+                if tx_data:
+                    tx_json = serialize_transaction(by_signature[signature], tx_data)
+                    writer.write(tx_json)
+                    print_summary_line(writer.count - 1, tx_json)
+    
+    print(f"\nSaved all transaction data to {output}")
+
+DUMPS = {
+    "full": dump_full,
+    "raw": dump_raw,
+    "compact": dump_compact,
+}
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Dump recent treasury transactions to a file")
+    parser.add_argument("--format", choices=DUMPS, default="full", help="record layout (default: full)")
+    parser.add_argument("--output", help="JSON output file, or NDJSON if the name contains .ndjson, where a .gz or "
+                                         ".zst suffix compresses it (default depends on --format)")
+    parser.add_argument("--append", action="store_true",
+                        help="add to an existing NDJSON dump instead of replacing it")
+    args = parser.parse_args(argv)
+    output = args.output or DEFAULT_OUTPUTS[args.format]
+    if args.append and not is_ndjson(output):
+        parser.error("--append needs an NDJSON --output (a name containing .ndjson)")
+    asyncio.run(DUMPS[args.format](output, args.append))
@@ -0,0 +1,94 @@
+"""``treasury examine``: balance changes in the treasury's recent transactions."""
+import argparse
+import asyncio
+import json
+
+from ..columnar import analyze_transactions_batch
+from ..config import TREASURY_WALLET
+from ..rpc import RpcClient, RpcError
+
+async def get_all_signatures(client, address, limit=1000):
+    """Get all transaction signatures for an address"""
+    all_signatures = []
+    
+    try:
+        async for batch in client.iter_signatures(address, limit=100):
+            for item in batch:
+                all_signatures.append(item["signature"])
+                
+            print(f"Found batch of {len(batch)} signatures, total: {len(all_signatures)}")
+            
+            if len(all_signatures) >= limit:
+                break
+    except RpcError as e:
+        print(f"Error fetching signatures: {e}")
+            
+    return all_signatures
+
+async def examine():
+    async with RpcClient() as client:
+        print(f"Checking current balance for {TREASURY_WALLET}...")
+        balance_sol = await client.get_balance(TREASURY_WALLET) / 1_000_000_000
+        print(f"Current balance: {balance_sol} SOL")
+        
+        print(f"\nFetching transaction signatures for {TREASURY_WALLET}...")
+        signatures = await get_all_signatures(client, TREASURY_WALLET)
+        print(f"Found {len(signatures)} total transactions")
+        
+        print("\nAnalyzing transactions...")
+        to_process = signatures[:500]  # Limit to 500 for performance
+        tx_results = await client.get_transactions(to_process)
+    
+    transactions = [analysis for analysis in analyze_transactions_batch([tx for tx in tx_results if tx], TREASURY_WALLET)
+                    if analysis]
+    save_analyses(transactions)
+
+# Total, save and list the analyzed transactions; shared with `treasury replay`
+def save_analyses(transactions):
+    total_incoming = 0
+    total_outgoing = 0
+    
+    for analysis in transactions:
+        # Calculate amounts for treasury
+        for transfer in analysis["transfers"]:
+            if transfer["is_treasury"]:
+                if transfer["change_sol"] > 0:
+                    total_incoming += transfer["change_sol"]
+                else:
+                    total_outgoing += abs(transfer["change_sol"])
+    
+    print("\n=== SUMMARY ===")
+    print(f"Total transactions analyzed: {len(transactions)}")
+    print(f"Total incoming SOL: {total_incoming}")
+    print(f"Total outgoing SOL: {total_outgoing}")
+    print(f"Net change: {total_incoming - total_outgoing}")
+    
+    # Save results to file
+    with open("detailed_transactions.json", "w") as f:
+        json.dump(transactions, f, indent=2)
+    
+    print("\nDetailed transaction data saved to detailed_transactions.json")
+    
+    # Show the most recent incoming transactions
+    print("\nMost recent incoming transactions:")
+    incoming_txs = []
+    
+    for tx in transactions:
+        for transfer in tx["transfers"]:
+            if transfer["is_treasury"] and transfer["change_sol"] > 0:
+                incoming_txs.append({
+                    "signature": tx["signature"],
+                    "timestamp": tx["block_time"],
+                    "amount": transfer["change_sol"]
+                })
+    
+    # Sort by timestamp (most recent first)
+    incoming_txs.sort(key=lambda x: x["timestamp"] if x["timestamp"] else 0, reverse=True)
+    
+    for i, tx in enumerate(incoming_txs[:10]):
+        print(f"{i+1}. {tx['amount']} SOL - Signature: {tx['signature']}")
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Analyze balance changes in recent treasury transactions")
+    parser.parse_args(argv)
+    asyncio.run(examine())
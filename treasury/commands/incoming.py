@@ -0,0 +1,171 @@
+"""``treasury incoming``: every incoming transfer to the treasury wallet."""
+import argparse
+import asyncio
+import json
+import time
+
+from ..checkpoint import CheckpointMismatch, add_resume_argument, open_checkpoint, scan_params
+from ..config import TREASURY_WALLET
+from ..filters import SignatureFilter, add_filter_arguments, filter_from_args
+from ..pipeline import SignaturePipeline
+from ..records import Contribution
+from ..rpc import RpcClient
+from ..watermark import WatermarkStore, load_json, merge_by_signature
+
+CHECKPOINT_FILE = "all_incoming_txs.checkpoint.json"
+
+# Process a transaction directly from account balance changes
+def find_incoming_transaction(sig_data, tx):
+    sig = sig_data["signature"]
+    
+    try:
+        if not tx or not tx.get("meta"):
+            return None
+            
+        # Find treasury index in account keys
+        treasury_index = None
+        for idx, key in enumerate(tx["transaction"]["message"]["accountKeys"]):
+            if isinstance(key, dict) and key.get("pubkey") == TREASURY_WALLET:
+                treasury_index = idx
+                break
+            elif isinstance(key, str) and key == TREASURY_WALLET:
+                treasury_index = idx
+                break
+        
+        if treasury_index is None:
+            return None
+            
+        # Check balance change
+        pre_balance = tx["meta"]["preBalances"][treasury_index]
+        post_balance = tx["meta"]["postBalances"][treasury_index]
+        sol_change = (post_balance - pre_balance) / 1e9
+        
+        # If balance increased, record the transaction
+        if sol_change > 0:
+            # Get sender
+            sender = None
+            for inst in tx["transaction"]["message"]["instructions"]:
+                if inst.get("parsed", {}).get("type") == "transfer":
+                    info = inst.get("parsed", {}).get("info", {})
+                    if info.get("destination") == TREASURY_WALLET:
+                        sender = info.get("source")
+                        break
+            
+            if not sender:
+                # Fallback sender identification (could be the first account key)
+                sender = tx["transaction"]["message"]["accountKeys"][0] 
+                if isinstance(sender, dict):
+                    sender = sender.get("pubkey", "unknown")
+            
+            timestamp = sig_data.get("blockTime", 0)
+            time_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp)) if timestamp else "unknown"
+            
+            incoming_tx = {
+                "sender": sender,
+                "amount": sol_change,
+                "time": time_str,
+                "timestamp": timestamp,
+                "signature": sig
+            }
+            
+            print(f"✓ Found incoming: {sol_change} SOL from {sender}")
+            return incoming_tx
+        
+    except Exception as e:
+        print(f"Error processing transaction {sig[:10]}: {e}")
+        
+    return None
+
+# Stream signature pages into concurrent fetches, collecting incoming transfers as they are found
+async def fetch_incoming(until=None, signature_filter=None, resume=False, incremental=False):
+    signature_filter = signature_filter or SignatureFilter()
+    # Incremental runs must process every new signature (the first one, without a watermark yet, the whole
+    # history) or the watermark would skip some; full runs stop at 2000 transactions
+    max_signatures = None if incremental else 2000
+    checkpoint = open_checkpoint(CHECKPOINT_FILE, scan_params(TREASURY_WALLET, until, max_signatures, signature_filter),
+                                 resume)
+    async with RpcClient() as client:
+        print("Fetching signatures and incoming transactions for treasury wallet...\n")
+        pipeline = SignaturePipeline(client, TREASURY_WALLET, find_incoming_transaction, until=until,
+                                     max_signatures=max_signatures, signature_filter=signature_filter,
+                                     checkpoint=checkpoint)
+        incoming = [Contribution.from_dict(incoming_tx) async for incoming_tx in pipeline.run()]
+    
+    if checkpoint.finished:
+        checkpoint.clear()
+    else:
+        print(f"Progress saved to {CHECKPOINT_FILE}; run again with --resume to finish the scan")
+    
+    print(f"\nProcessed {pipeline.signatures_seen} {'new' if until else 'total'} transactions")
+    print(signature_filter.summary())
+    return incoming, pipeline
+
+# Sort, save and summarize the incoming transfers; shared with `treasury replay`
+def save_incoming(incoming):
+    total_sol = sum(tx.amount for tx in incoming)
+    
+    # Sort by amount
+    incoming.sort(key=lambda x: (x.lamports, x.signature), reverse=True)
+    
+    # Output results
+    result = {
+        "total_sol": total_sol,
+        "transaction_count": len(incoming),
+        "transactions": [tx.to_dict() for tx in incoming]
+    }
+    
+    # Save to file
+    with open("all_incoming_txs.json", "w") as f:
+        json.dump(result, f, indent=2)
+    
+    # Print summary
+    print("\n=== SUMMARY ===")
+    print(f"Total incoming SOL: {total_sol}")
+    print(f"Number of incoming transactions: {len(incoming)}")
+    
+    # Group by amount
+    amount_groups = {}
+    for tx in incoming:
+        amount = tx.amount
+        key = f"{amount}"
+        if key not in amount_groups:
+            amount_groups[key] = []
+        amount_groups[key].append(tx)
+    
+    print("\nTransactions by amount:")
+    for amount, txs in sorted(amount_groups.items(), key=lambda x: float(x[0]), reverse=True):
+        print(f"  {amount} SOL: {len(txs)} transaction(s)")
+        
+    print("\nDetails saved to all_incoming_txs.json")
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Find every incoming transfer to the treasury wallet")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only fetch signatures newer than the last run and merge into all_incoming_txs.json")
+    add_filter_arguments(parser)
+    add_resume_argument(parser, CHECKPOINT_FILE)
+    args = parser.parse_args(argv)
+    signature_filter = filter_from_args(args)
+    if args.incremental and signature_filter.has_window:
+        # The watermark would jump past signatures the window left out
+        parser.error("--incremental cannot be combined with a slot or date window")
+    
+    watermarks = WatermarkStore("all_incoming")
+    until = watermarks.until(TREASURY_WALLET) if args.incremental else None
+    
+    try:
+        incoming, pipeline = asyncio.run(fetch_incoming(until, signature_filter, args.resume, args.incremental))
+    except CheckpointMismatch as e:
+        parser.error(f"cannot resume: {e}")
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; progress saved to {CHECKPOINT_FILE}, run again with --resume to continue")
+        return 130
+    if args.incremental:
+        previous = load_json("all_incoming_txs.json", {}).get("transactions", [])
+        incoming = merge_by_signature([Contribution.from_dict(record) for record in previous], incoming)
+    save_incoming(incoming)
+    
+    if args.incremental and pipeline.newest and pipeline.complete and not pipeline.failed:
+        # Only move the watermark once every new signature was fetched
+        watermarks.advance(TREASURY_WALLET, [pipeline.newest])
+        watermarks.save()
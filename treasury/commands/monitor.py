@@ -0,0 +1,96 @@
+"""``treasury monitor``: report treasury transfers as they land, over WebSocket."""
+import argparse
+import asyncio
+
+from ..config import TREASURY_WALLET
+from ..extract import extract_sol_transfers
+from ..monitor import MONITOR_COMMITMENT, TreasuryMonitor
+from ..ndjson import NdjsonWriter
+from ..rpc import RpcClient
+from ..sink import DATABASE_URL, open_sink
+from ..watermark import WatermarkStore
+from .contributions import process_transaction
+
+OUTPUT_FILE = "monitor_transfers.ndjson"
+
+
+def transfer_and_contribution(entry, tx_data):
+    """The transfer record, and the presale contribution if the transfer is one"""
+    transfer = extract_sol_transfers(tx_data, TREASURY_WALLET)
+    if not transfer:
+        return None
+    contribution = transfer["balance_change"] > 0 and process_transaction(tx_data, entry["signature"],
+                                                                          tx_data.get("blockTime"))
+    return transfer, contribution or None
+
+
+def load(sink, contribution=None):
+    """Buffer a contribution and flush the batch when due, riding out database errors"""
+    try:
+        if contribution:
+            sink.add(contribution["signature"], contribution["sender"], contribution["lamports"],
+                     contribution["timestamp"])
+        elif sink.due():
+            sink.flush()
+    except sink.errors as e:
+        print(f"Database load failed, keeping {sink.pending} contributions for the next batch: {e}")
+
+
+async def load_in_thread(sink, lock, contribution=None):
+    """``load`` off the event loop, so a slow batch does not stall the WebSocket; one at a time"""
+    async with lock:
+        await asyncio.to_thread(load, sink, contribution)
+
+
+async def flush_periodically(sink, lock):
+    # Without this a lone contribution would wait for the next one to be loaded
+    while True:
+        await asyncio.sleep(sink.flush_interval)
+        await load_in_thread(sink, lock)
+
+
+async def watch(output, commitment=MONITOR_COMMITMENT, database=None):
+    print(f"Watching treasury wallet: {TREASURY_WALLET}\n")
+    watermarks = WatermarkStore("monitor")
+    sink = open_sink(database) if database else None
+    lock = asyncio.Lock()
+    async with RpcClient() as client:
+        monitor = TreasuryMonitor(client, TREASURY_WALLET, watermarks=watermarks, commitment=commitment,
+                                  extract=transfer_and_contribution)
+        flusher = asyncio.create_task(flush_periodically(sink, lock)) if sink else None
+        try:
+            # Flush every record: the file is tailed by other tools while the monitor runs
+            with NdjsonWriter(output, append=True, flush_every=1) as writer:
+                async for transfer, contribution in monitor.run():
+                    writer.write(transfer)
+                    sign = "+" if transfer["balance_change"] > 0 else ""
+                    direction = "from" if transfer["balance_change"] > 0 else "to"
+                    print(f"  {transfer['formatted_time']} - {sign}{transfer['balance_change']:.9f} SOL "
+                          f"{direction} {transfer['counterparty']} ({transfer['signature'][:24]}...)")
+                    if sink and contribution:
+                        await load_in_thread(sink, lock, contribution)
+        finally:
+            print(f"\n{monitor.summary()}")
+            if sink:
+                flusher.cancel()
+                async with lock:
+                    await asyncio.to_thread(sink.close)
+                print(f"Loaded {sink.loaded} contributions in {sink.batches} batches")
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Watch the treasury wallet over WebSocket and report "
+                                                            "SOL transfers as they land")
+    parser.add_argument("--output", default=OUTPUT_FILE, help=f"NDJSON file to append transfers to "
+                                                              f"(default: {OUTPUT_FILE})")
+    parser.add_argument("--commitment", choices=("processed", "confirmed", "finalized"), default=MONITOR_COMMITMENT,
+                        help=f"commitment level to subscribe and fetch at (default: {MONITOR_COMMITMENT})")
+    parser.add_argument("--database", default=DATABASE_URL,
+                        help="postgresql:// or sqlite:/// URL to load contributions into in micro-batches "
+                             "(default: $TREASURY_DATABASE_URL)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(watch(args.output, args.commitment, args.database))
+    except KeyboardInterrupt:
+        print("Stopped")
+    return 0
@@ -0,0 +1,131 @@
+"""``treasury replay``: rerun an extractor over saved transactions, offline.
+
+Reads ``txns.json``/``.ndjson`` and ``all_raw_txs.json``/``.ndjson`` dumps
+and the transaction cache instead of the network (see ``treasury.replay``),
+spreads the extraction over a process pool and writes the same file the
+online command would:
+
+    transfers      sol_transfers.json          (``treasury transfers``)
+    incoming       all_incoming_txs.json       (``treasury incoming``)
+    examine        detailed_transactions.json  (``treasury examine``)
+    contributions  contributions_full.json     (``treasury contributions``; the ledger is left alone)
+
+Failed transactions are skipped where the online command skips them.
+Any other ``module:function`` taking ``(sig_data, tx_data)`` can be replayed
+too; its records are written to ``--output`` as NDJSON. Raw dumps are
+json-encoded, without parsed instructions, so extractors that read those
+(the contribution tiers, incoming senders) find less in them than in
+jsonParsed dumps or the cache.
+"""
+import argparse
+import importlib
+import os
+import time
+
+import base58
+
+from ..cache import CACHE_PATH
+from ..config import TREASURY_WALLET
+from ..extract import analyze_transaction, extract_sol_transfers
+from ..filters import SignatureFilter, add_filter_arguments, filter_from_args
+from ..ledger import ContributionLedger
+from ..ndjson import NdjsonWriter
+from ..records import Contribution, Transfer
+from ..replay import CHUNK_SIZE, Replay
+from .contributions import process_transaction, save_contributions
+from .examine import save_analyses
+from .incoming import find_incoming_transaction, save_incoming
+from .transfers import save_transfers
+
+# Read when no sources are given, those that exist
+DEFAULT_SOURCES = ("txns.json", "txns.ndjson", "all_raw_txs.json", "all_raw_txs.ndjson", CACHE_PATH)
+
+# Extractors run in the worker processes, so they are module-level functions of (sig_data, tx_data)
+def transfer(sig_data, tx_data):
+    return extract_sol_transfers(tx_data, TREASURY_WALLET)
+
+def analysis(sig_data, tx_data):
+    return analyze_transaction(tx_data, TREASURY_WALLET)
+
+def contribution(sig_data, tx_data):
+    return process_transaction(tx_data, sig_data["signature"], sig_data.get("blockTime"))
+
+def save_transfer_records(records):
+    save_transfers([Transfer.from_dict(record) for record in records])
+
+def save_incoming_records(records):
+    save_incoming([Contribution.from_dict(record) for record in records])
+
+def save_contribution_records(records):
+    # Until the target is reached, as the scan pages them
+    ledger = ContributionLedger(load=False)
+    for record in records:
+        ledger.add(record["signature"], record["sender"], record["lamports"], record["timestamp"])
+        if ledger.reached():
+            break
+    save_contributions(ledger)
+
+# Extractor name -> (extract, save, whether the online command skips failed transactions).
+# The save step is the online command's own and gets the records newest first, as paging finds them.
+EXTRACTORS = {
+    "transfers": (transfer, save_transfer_records, True),
+    "incoming": (find_incoming_transaction, save_incoming_records, True),
+    "examine": (analysis, save_analyses, False),
+    "contributions": (contribution, save_contribution_records, False),
+}
+
+def newest_first(sig_data):
+    """Sort key putting signatures in getSignaturesForAddress order, newest first, when reversed"""
+    return sig_data["slot"] or 0, base58.b58decode(sig_data["signature"])
+
+def load_extractor(spec):
+    """A registered extractor's name, or ``module:function`` for any other"""
+    if spec in EXTRACTORS:
+        return EXTRACTORS[spec][0]
+    module, _, name = spec.partition(":")
+    if not name:
+        raise ValueError(f"unknown extractor {spec!r}: expected one of {', '.join(EXTRACTORS)} or module:function")
+    return getattr(importlib.import_module(module), name)
+
+def replay(spec, sources, signature_filter=None, workers=None, chunk_size=CHUNK_SIZE, output="replay.ndjson"):
+    started = time.perf_counter()
+    signature_filter = signature_filter or SignatureFilter()
+    if spec in EXTRACTORS and not EXTRACTORS[spec][2]:
+        signature_filter.skip_failed = False
+    replayer = Replay(sources, load_extractor(spec), signature_filter, workers, chunk_size)
+    print(f"Replaying {spec} over {', '.join(sources)} on {replayer.workers} worker process(es)...")
+    if spec in EXTRACTORS:
+        found = sorted(replayer.run(), key=lambda pair: newest_first(pair[0]), reverse=True)
+    else:
+        with NdjsonWriter(output, append=False) as writer:
+            writer.write_many(record for _, record in replayer.run())
+    print(f"\n{replayer.summary()} in {time.perf_counter() - started:.2f}s")
+    print(signature_filter.summary())
+
+    if spec in EXTRACTORS:
+        EXTRACTORS[spec][1]([record for _, record in found])
+    else:
+        print(f"Saved {writer.count} records to {output}")
+    return replayer
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Rerun an extractor over saved transactions, offline")
+    parser.add_argument("extractor", help=f"one of {', '.join(EXTRACTORS)}, or module:function for any other")
+    parser.add_argument("sources", nargs="*",
+                        help=f"dumps or transaction caches to read (default: whichever of "
+                             f"{', '.join(DEFAULT_SOURCES)} exist)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help=f"transactions handed to a worker at a time (default: {CHUNK_SIZE})")
+    parser.add_argument("--output", default="replay.ndjson",
+                        help="NDJSON file for a module:function extractor's records (default: replay.ndjson)")
+    add_filter_arguments(parser)
+    args = parser.parse_args(argv)
+    sources = args.sources or [path for path in DEFAULT_SOURCES if os.path.exists(path)]
+    if not sources:
+        parser.error(f"no sources given and none of {', '.join(DEFAULT_SOURCES)} exist")
+    try:
+        load_extractor(args.extractor)
+    except (ImportError, AttributeError, ValueError) as e:
+        parser.error(str(e))
+    replay(args.extractor, sources, filter_from_args(args), args.workers, args.chunk_size, args.output)
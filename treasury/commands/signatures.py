@@ -0,0 +1,72 @@
+"""``treasury signatures``: list a wallet's transaction signatures.
+
+Only pages ``getSignaturesForAddress``; no transactions are fetched. With
+``--partitions N`` and no ``--max`` the history is paged as N concurrent
+slot ranges (see ``treasury.backfill``). The output is pretty-printed
+JSON, or NDJSON written page by page when the file name ends in
+``.ndjson`` (optionally ``.gz``/``.zst``).
+"""
+import argparse
+import asyncio
+import json
+
+from ..backfill import PartitionedPager, add_partition_argument
+from ..config import TREASURY_WALLET
+from ..filters import add_filter_arguments, filter_from_args
+from ..ndjson import NdjsonWriter
+from ..records import SignatureRecord
+from ..rpc import RpcClient
+
+
+def signature_pages(client, address, max_signatures=None, signature_filter=None, partitions=1):
+    """Pages of an address's signatures, newest first; partitioned when the whole history is wanted"""
+    if partitions > 1 and max_signatures is None:
+        return PartitionedPager(client, address, partitions,
+                                min_slot=signature_filter.min_slot if signature_filter else None,
+                                max_slot=signature_filter.max_slot if signature_filter else None).pages()
+    return client.iter_signatures(address)
+
+
+async def list_signatures(address, output, max_signatures=None, signature_filter=None, partitions=1):
+    kept = []
+    ndjson = ".ndjson" in output
+    async with RpcClient(cache=False) as client:
+        print(f"Fetching transaction signatures for {address}...")
+        with NdjsonWriter(output, append=False) if ndjson else open(output, "w") as out:
+            seen = 0
+            pages = signature_pages(client, address, max_signatures, signature_filter, partitions)
+            async for page in pages:
+                seen += len(page)
+                stop = signature_filter is not None and signature_filter.past_window(page[-1])
+                if signature_filter is not None:
+                    page = signature_filter.apply(page)
+                records = [SignatureRecord.from_entry(sig) for sig in page]
+                if max_signatures is not None:
+                    records = records[:max_signatures - len(kept)]
+                if ndjson:
+                    out.write_many(record.to_dict() for record in records)
+                kept.extend(records)
+                print(f"Found {seen} signatures so far...")
+                if stop or (max_signatures is not None and len(kept) >= max_signatures):
+                    break
+            await pages.aclose()
+            if not ndjson:
+                json.dump([record.to_dict() for record in kept], out, indent=2)
+
+    print(f"\nSaved {len(kept)} signatures to {output}")
+    if signature_filter:
+        print(signature_filter.summary())
+    return kept
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="List a wallet's transaction signatures")
+    parser.add_argument("address", nargs="?", default=TREASURY_WALLET, help="defaults to the treasury wallet")
+    parser.add_argument("--output", default="all_signatures.json",
+                        help="JSON file, or NDJSON if the name contains .ndjson (default: all_signatures.json)")
+    parser.add_argument("--max", type=int, dest="max_signatures", help="stop after this many signatures")
+    add_filter_arguments(parser)
+    add_partition_argument(parser)
+    args = parser.parse_args(argv)
+    asyncio.run(list_signatures(args.address, args.output, args.max_signatures, filter_from_args(args),
+                                args.partitions))
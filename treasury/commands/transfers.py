@@ -0,0 +1,142 @@
+"""``treasury transfers``: SOL transfers in and out of the treasury wallet.
+
+Failed transactions are skipped before fetching (see ``treasury.filters``),
+so their fees no longer show up as transfers; ``--include-failed`` lists
+them again, as the script did before the pre-filter.
+"""
+import argparse
+import asyncio
+import json
+
+from ..checkpoint import CheckpointMismatch, add_resume_argument, open_checkpoint, scan_params
+from ..config import TREASURY_WALLET
+from ..extract import LAMPORTS_PER_SOL, extract_sol_transfers
+from ..filters import SignatureFilter, add_filter_arguments, filter_from_args
+from ..pipeline import SignaturePipeline
+from ..records import Transfer
+from ..rpc import RpcClient, RpcError
+from ..watermark import WatermarkStore, load_json, merge_by_signature
+
+MAX_TRANSACTIONS_TO_PROCESS = 500  # Increased to ensure we catch all transactions
+CHECKPOINT_FILE = "sol_transfers.checkpoint.json"
+
+async def get_solana_balance(client):
+    """Get the current balance of the treasury wallet"""
+    try:
+        balance_lamports = await client.get_balance(TREASURY_WALLET)
+    except RpcError as e:
+        print(f"Error fetching balance: {e}")
+        return 0
+    return balance_lamports / LAMPORTS_PER_SOL  # Convert lamports to SOL
+
+async def find_transfers(incremental=False, signature_filter=None, resume=False):
+    print(f"Fetching data for treasury wallet: {TREASURY_WALLET}\n")
+    
+    watermarks = WatermarkStore("sol_transfers")
+    until = watermarks.until(TREASURY_WALLET) if incremental else None
+    if until:
+        print(f"Incremental mode: fetching signatures newer than {until[:24]}...")
+    
+    def extract(sig_data, tx_data):
+        return extract_sol_transfers(tx_data, TREASURY_WALLET)
+    
+    signature_filter = signature_filter or SignatureFilter()
+    # Incremental runs must process every new signature or the watermark would skip some
+    max_signatures = None if incremental else MAX_TRANSACTIONS_TO_PROCESS
+    checkpoint = open_checkpoint(CHECKPOINT_FILE, scan_params(TREASURY_WALLET, until, max_signatures, signature_filter),
+                                 resume)
+    
+    async with RpcClient() as client:
+        # Get current balance
+        current_balance = await get_solana_balance(client)
+        print(f"Current balance: {current_balance} SOL\n")
+        
+        # Stream signature pages straight into concurrent transaction fetches
+        pipeline = SignaturePipeline(client, TREASURY_WALLET, extract, until=until, signature_filter=signature_filter,
+                                     max_signatures=max_signatures, checkpoint=checkpoint)
+        print("Fetching transaction signatures and SOL transfers...")
+        sol_transfers = []
+        async for transfer_info in pipeline.run():
+            sol_transfers.append(Transfer.from_dict(transfer_info))
+            print(f"  Found SOL transfer: {transfer_info['formatted_time']} - {transfer_info['balance_change']:+.9f} SOL")
+    
+    if checkpoint.finished:
+        checkpoint.clear()
+    else:
+        print(f"Progress saved to {CHECKPOINT_FILE}; run again with --resume to finish the scan")
+    
+    if not pipeline.signatures_seen:
+        print("No new transaction signatures found." if until else "No transaction signatures found.")
+        return
+    print(f"\nProcessed {pipeline.transactions_fetched} of {pipeline.signatures_seen} transaction signatures")
+    print(signature_filter.summary())
+    
+    if incremental:
+        previous = [Transfer.from_dict(record) for record in load_json("sol_transfers.json", [])]
+        sol_transfers = merge_by_signature(previous, sol_transfers)
+    
+    save_transfers(sol_transfers)
+    
+    if incremental:
+        # Only move the watermark once every new signature was fetched; a
+        # partial run is simply redone next time (cheaply, from the cache)
+        if pipeline.complete and not pipeline.failed:
+            watermark = watermarks.advance(TREASURY_WALLET, [pipeline.newest])
+            watermarks.save()
+            print(f"Watermark now at slot {watermark['slot']}: {watermark['signature'][:24]}...")
+        elif not pipeline.complete:
+            print("Watermark not moved: signature pagination did not finish")
+        else:
+            print(f"Watermark not moved: {len(pipeline.failed)} transactions could not be fetched")
+
+# Sort, summarize and save the transfers; shared with `treasury replay`
+def save_transfers(sol_transfers):
+    # Sort by timestamp (newest first)
+    sol_transfers.sort(key=lambda x: (x.timestamp, x.signature), reverse=True)
+    
+    # Calculate total incoming and outgoing
+    total_in = sum(t.balance_change for t in sol_transfers if t.lamports > 0)
+    total_out = sum(abs(t.balance_change) for t in sol_transfers if t.lamports < 0)
+    
+    print(f"\nFound {len(sol_transfers)} SOL transfers")
+    print(f"Total incoming: {total_in} SOL")
+    print(f"Total outgoing: {total_out} SOL")
+    print(f"Net change: {total_in - total_out} SOL")
+    
+    # Save to file
+    with open("sol_transfers.json", "w") as f:
+        json.dump([transfer.to_dict() for transfer in sol_transfers], f, indent=2)
+    
+    print(f"\nSaved {len(sol_transfers)} SOL transfers to sol_transfers.json")
+    
+    # Print the most recent transactions
+    print("\n10 Most Recent SOL Transfers:")
+    for i, tx in enumerate(transfer.to_dict() for transfer in sol_transfers[:10]):
+        counterparty = tx.get("counterparty", "Unknown")
+        sign = "+" if tx["balance_change"] > 0 else ""
+        print(f"{i+1}. {tx['formatted_time']} - {sign}{tx['balance_change']:.9f} SOL")
+        if tx["balance_change"] > 0:
+            print(f"   From: {counterparty}")
+        else:
+            print(f"   To: {counterparty}")
+        print(f"   Signature: {tx['signature'][:24]}...")
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Find SOL transfers in and out of the treasury wallet")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only fetch signatures newer than the last run and merge into sol_transfers.json")
+    add_filter_arguments(parser)
+    add_resume_argument(parser, CHECKPOINT_FILE)
+    args = parser.parse_args(argv)
+    signature_filter = filter_from_args(args)
+    if args.incremental and signature_filter.has_window:
+        # The watermark would jump past signatures the window left out
+        parser.error("--incremental cannot be combined with a slot or date window")
+    try:
+        asyncio.run(find_transfers(incremental=args.incremental, signature_filter=signature_filter,
+                                   resume=args.resume))
+    except CheckpointMismatch as e:
+        parser.error(f"cannot resume: {e}")
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; progress saved to {CHECKPOINT_FILE}, run again with --resume to continue")
+        return 130
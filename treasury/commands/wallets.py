@@ -0,0 +1,92 @@
+"""``treasury wallets``: balance changes of several wallets in a single scan."""
+import argparse
+import asyncio
+import json
+
+from ..config import parse_wallet, watched_wallets
+from ..extract import LAMPORTS_PER_SOL, format_timestamp
+from ..filters import add_filter_arguments, filter_from_args
+from ..rpc import RpcClient
+from ..wallets import MultiWalletScanner
+from ..watermark import WatermarkStore, load_json, merge_by_signature
+
+OUTPUT_FILE = "wallet_activity.json"
+
+# Scan every watched wallet in one pass, fetching shared transactions only once
+async def scan(wallets, until=None, max_signatures=None, signature_filter=None):
+    async with RpcClient() as client:
+        print(f"Scanning {len(wallets)} wallets: {', '.join(wallets.values())}\n")
+        scanner = MultiWalletScanner(client, wallets, until=until, max_signatures=max_signatures,
+                                     signature_filter=signature_filter)
+        activity = []
+        async for record in scanner.run():
+            activity.append(record)
+            moves = ", ".join(f"{wallets[address]} {delta / LAMPORTS_PER_SOL:+.9f}"
+                              for address, delta in record["deltas"].items())
+            print(f"  {format_timestamp(record['timestamp'])} {record['signature'][:16]}...: {moves}")
+
+    print(f"\nFetched {scanner.transactions_fetched} transactions for {scanner.signatures_seen} signatures "
+          f"({scanner.duplicates} shared between wallets, fetched once)")
+    if signature_filter:
+        print(signature_filter.summary())
+    return activity, scanner
+
+def summarize(wallets, activity):
+    """Per-wallet totals in exact lamports"""
+    totals = {address: {"label": label, "incoming_lamports": 0, "outgoing_lamports": 0, "transactions": 0}
+              for address, label in wallets.items()}
+    for record in activity:
+        for address, delta in record["deltas"].items():
+            if address not in totals:
+                continue
+            wallet = totals[address]
+            wallet["transactions"] += 1
+            if delta > 0:
+                wallet["incoming_lamports"] += delta
+            else:
+                wallet["outgoing_lamports"] -= delta
+    for wallet in totals.values():
+        wallet["net_lamports"] = wallet["incoming_lamports"] - wallet["outgoing_lamports"]
+    return totals
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Track balance changes of several wallets in a single scan")
+    parser.add_argument("--wallet", action="append", type=parse_wallet, metavar="LABEL=ADDRESS",
+                        help="wallet to watch (repeatable); defaults to SOLANA_WATCH_WALLETS or the treasury")
+    parser.add_argument("--max", type=int, default=2000, help="signatures per wallet for a full scan")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"only fetch signatures newer than the last run and merge into {OUTPUT_FILE}")
+    add_filter_arguments(parser)
+    args = parser.parse_args(argv)
+    signature_filter = filter_from_args(args)
+    if args.incremental and signature_filter.has_window:
+        # The watermark would jump past signatures the window left out
+        parser.error("--incremental cannot be combined with a slot or date window")
+
+    wallets = dict(args.wallet) if args.wallet else watched_wallets()
+    watermarks = WatermarkStore("wallets")
+    until = {address: watermarks.until(address) for address in wallets} if args.incremental else None
+
+    activity, scanner = asyncio.run(scan(wallets, until, None if args.incremental else args.max, signature_filter))
+    if args.incremental:
+        activity = merge_by_signature(load_json(OUTPUT_FILE, {}).get("transactions", []), activity)
+    activity.sort(key=lambda x: x["timestamp"], reverse=True)
+    totals = summarize(wallets, activity)
+
+    with open(OUTPUT_FILE, "w") as f:
+        json.dump({"wallets": totals, "transactions": activity}, f, indent=2)
+
+    if args.incremental and not scanner.failed:
+        # Each wallet's watermark only moves once all of its new signatures were seen
+        for address, finished in scanner.completed.items():
+            if finished and address in scanner.newest_by_address:
+                watermarks.advance(address, [scanner.newest_by_address[address]])
+        watermarks.save()
+
+    print("\n=== SUMMARY ===")
+    for address, wallet in totals.items():
+        print(f"{wallet['label']} ({address[:8]}...): {wallet['transactions']} transactions, "
+              f"in {wallet['incoming_lamports'] / LAMPORTS_PER_SOL} SOL, "
+              f"out {wallet['outgoing_lamports'] / LAMPORTS_PER_SOL} SOL, "
+              f"net {wallet['net_lamports'] / LAMPORTS_PER_SOL:+} SOL")
+    print(f"\nDetails saved to {OUTPUT_FILE}")
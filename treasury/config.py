@@ -0,0 +1,65 @@
+"""Settings shared by the treasury scanners."""
+import os
+
+# Solana RPC endpoints - rotating between multiple providers to avoid rate limits
+DEFAULT_RPC_URLS = [
+    "https://solana-mainnet.core.chainstack.com/469f92be2bf990aaeef35e0fef1a5e85/",
+    "https://api.mainnet-beta.solana.com",
+    "https://rpc.ankr.com/solana",
+    "https://solana.api.onfinality.io/public"
+]
+
+# Maximum number of in-flight RPC requests per client
+RPC_CONCURRENCY = int(os.environ.get("SOLANA_RPC_CONCURRENCY", "16"))
+RPC_TIMEOUT = float(os.environ.get("SOLANA_RPC_TIMEOUT", "30"))
+# Starting per-endpoint request rate (requests per second) and burst size;
+# the adaptive limiter moves the rate between the min and max from there
+RPC_RATE = float(os.environ.get("SOLANA_RPC_RATE", "10"))
+RPC_MIN_RATE = float(os.environ.get("SOLANA_RPC_MIN_RATE", "0.5"))
+RPC_MAX_RATE = float(os.environ.get("SOLANA_RPC_MAX_RATE", "200"))
+RPC_BURST = float(os.environ.get("SOLANA_RPC_BURST", "20"))
+# Requests packed into one JSON-RPC batch POST; shrunk per endpoint on rejection
+RPC_BATCH_SIZE = int(os.environ.get("SOLANA_RPC_BATCH_SIZE", "100"))
+# Transaction encoding the scan pipeline fetches: "jsonParsed", or "base64"
+# decoded locally (needs solders; see binary)
+TX_ENCODING = os.environ.get("SOLANA_TX_ENCODING", "jsonParsed")
+# Seconds a getBalance result is reused by later identical calls (0 disables)
+RPC_MEMO_TTL = float(os.environ.get("SOLANA_RPC_MEMO_TTL", "2"))
+
+
+def rpc_urls():
+    """Return the RPC endpoints, overridable with a comma-separated SOLANA_RPC_URLS"""
+    env_urls = os.environ.get("SOLANA_RPC_URLS", "")
+    urls = [url.strip() for url in env_urls.split(",") if url.strip()]
+    return urls or list(DEFAULT_RPC_URLS)
+
+
+def ws_urls():
+    """Return the WebSocket endpoints, overridable with a comma-separated SOLANA_WS_URLS.
+
+    By default each RPC endpoint's own URL is used with a ws(s) scheme, which
+    is where Solana nodes serve their PubSub API.
+    """
+    env_urls = os.environ.get("SOLANA_WS_URLS", "")
+    urls = [url.strip() for url in env_urls.split(",") if url.strip()]
+    return urls or ["ws" + url[len("http"):] if url.startswith("http") else url for url in rpc_urls()]
+
+
+# Wallets tracked together by the multi-wallet scanner, as address -> label
+TREASURY_WALLET = "4rYvLKto7HzVESZnXj7RugCyDgjz4uWeHR4MHCy3obNh"
+DEFAULT_WATCHED_WALLETS = {
+    TREASURY_WALLET: "treasury",
+}
+
+
+def watched_wallets():
+    """Return the watched wallets, overridable with SOLANA_WATCH_WALLETS="label=address,..." """
+    env_wallets = os.environ.get("SOLANA_WATCH_WALLETS", "")
+    wallets = dict(parse_wallet(item) for item in env_wallets.split(",") if item.strip())
+    return wallets or dict(DEFAULT_WATCHED_WALLETS)
+
+
+def parse_wallet(item):
+    """(address, label) from "label=address"; a bare address is labelled by its prefix"""
+    label, _, address = item.strip().rpartition("=")
+    return address, label or address[:8]
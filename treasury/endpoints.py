@@ -0,0 +1,157 @@
+"""Health-scored scheduling across several RPC endpoints.
+
+Instead of always starting with the first URL and only moving on after a
+failure, every request asks ``EndpointPool.acquire`` for the best endpoint
+right now. Each endpoint has its own adaptive rate budget (see
+``ratelimit``), a rolling latency and error rate, and a circuit breaker, so
+load spreads over all providers in parallel and total throughput is the sum
+of their limits rather than the slowest one's.
+"""
+import asyncio
+import random
+import time
+
+from .ratelimit import DEFAULT_LIMITER
+
+# Weight of the newest sample in the rolling latency / error averages
+EWMA_ALPHA = 0.2
+# Consecutive failures, or rolling error rate, that open an endpoint's circuit
+BREAKER_FAILURES = 5
+BREAKER_ERROR_RATE = 0.5
+# How long an open circuit stays open; doubles each time a probe fails
+BREAKER_COOLDOWN = 5.0
+BREAKER_MAX_COOLDOWN = 120.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class Endpoint:
+    """One RPC URL with its health statistics and circuit breaker"""
+
+    def __init__(self, url):
+        self.url = url
+        self.latency = None  # rolling average, seconds
+        self.error_rate = 0.0
+        self.in_flight = 0
+        self.failures = 0  # consecutive
+        self.state = CLOSED
+        self.open_until = 0.0
+        self.cooldown = BREAKER_COOLDOWN
+        self.requests = 0
+        self.errors = 0
+
+    def available(self, now):
+        """Whether the breaker lets a request through right now"""
+        if self.state == OPEN and now >= self.open_until:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            # A single probe at a time decides whether to close again
+            return self.in_flight == 0
+        return self.state == CLOSED
+
+    def score(self):
+        """Lower is better: expected latency, inflated by errors and current load"""
+        latency = self.latency if self.latency is not None else 0.05
+        return latency * (1 + 4 * self.error_rate) * (1 + self.in_flight)
+
+    def record_success(self, latency):
+        self.requests += 1
+        self.failures = 0
+        self.latency = latency if self.latency is None else (
+            EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency)
+        self.error_rate *= 1 - EWMA_ALPHA
+        if self.state != CLOSED:
+            print(f"RPC endpoint {self.url} recovered")
+            self.state = CLOSED
+            self.cooldown = BREAKER_COOLDOWN
+
+    def record_failure(self, now):
+        self.requests += 1
+        self.errors += 1
+        self.failures += 1
+        self.error_rate = EWMA_ALPHA + (1 - EWMA_ALPHA) * self.error_rate
+
+        if self.state == HALF_OPEN:
+            self.cooldown = min(BREAKER_MAX_COOLDOWN, self.cooldown * 2)
+            self._open(now)
+        elif self.failures >= BREAKER_FAILURES or (
+                self.requests >= BREAKER_FAILURES and self.error_rate >= BREAKER_ERROR_RATE):
+            self._open(now)
+
+    def _open(self, now):
+        self.state = OPEN
+        self.open_until = now + self.cooldown
+        print(f"RPC endpoint {self.url} unhealthy, pausing it for {self.cooldown:.0f}s")
+
+
+class EndpointPool:
+    """Routes each request to the healthiest endpoint with budget available"""
+
+    def __init__(self, urls, limiter=DEFAULT_LIMITER):
+        if not urls:
+            raise ValueError("EndpointPool needs at least one RPC URL")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.limiter = limiter
+
+    async def acquire(self, method=None, exclude=()):
+        """Wait for and reserve the best endpoint, skipping any in ``exclude``.
+
+        If every endpoint is excluded the exclusion is ignored, so a request
+        can still be retried once all providers have been tried.
+        """
+        while True:
+            now = time.monotonic()
+            candidates = [e for e in self.endpoints if e.url not in exclude and e.available(now)]
+            if not candidates:
+                candidates = [e for e in self.endpoints if e.available(now)]
+
+            waits = {e.url: self.limiter.wait_time(e.url, method, now) for e in candidates}
+            ready = [e for e in candidates if waits[e.url] == 0]
+            if ready:
+                endpoint = min(ready, key=Endpoint.score)
+                self.limiter.take(endpoint.url, method, now)
+                endpoint.in_flight += 1
+                return endpoint
+
+            if candidates:
+                delay = min(waits.values())
+            else:
+                # Every circuit is open: wait for the first one to allow a probe
+                delay = max(0.01, min(e.open_until for e in self.endpoints) - now)
+            await asyncio.sleep(delay + random.uniform(0, 0.01))
+
+    def release(self, endpoint, method=None, latency=None, failed=False, throttled=False, retry_after=None):
+        """Return an endpoint after a request, recording how it went.
+
+        A throttled request slows the endpoint's rate down but does not count
+        against its health: the provider is up, we were just too fast.
+        """
+        endpoint.in_flight -= 1
+        if throttled:
+            self.limiter.on_throttle(endpoint.url, method, retry_after)
+        elif failed:
+            endpoint.record_failure(time.monotonic())
+        else:
+            endpoint.record_success(latency)
+            self.limiter.on_success(endpoint.url, method, latency)
+
+    def cancel(self, endpoint, method=None):
+        """Give back an endpoint that was acquired but never used"""
+        endpoint.in_flight -= 1
+        self.limiter.refund(endpoint.url, method)
+
+    def summary(self):
+        """One line of health statistics per endpoint"""
+        lines = []
+        for e in self.endpoints:
+            latency = f"{e.latency * 1000:.0f}ms" if e.latency is not None else "n/a"
+            lines.append(f"{e.url}: {e.state}, {e.requests} requests, {e.errors} errors, "
+                         f"avg latency {latency}, rate {self.limiter.current_rate(e.url):.1f}/s")
+        return lines
+
+
+def backoff_delay(attempt, base=0.25, cap=8.0):
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
@@ -0,0 +1,146 @@
+"""Per-transaction extractors shared by the scanners.
+
+Balance arithmetic is done in integer lamports and only converted to SOL for
+the output records, so ``analyze_transaction`` and the batch engine in
+``columnar`` agree exactly.
+"""
+from datetime import datetime
+
+LAMPORTS_PER_SOL = 1_000_000_000
+# Balance changes of this many lamports or fewer are treated as dust
+DUST_LAMPORTS = 1_000
+SYSTEM_PROGRAM_ID = "11111111111111111111111111111111"
+
+
+def format_timestamp(timestamp_sec):
+    """Convert Unix timestamp to human-readable format."""
+    return datetime.fromtimestamp(timestamp_sec).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def account_key_strings(tx_data):
+    """Account keys as plain base58 strings, whether jsonParsed or json encoded"""
+    return [key["pubkey"] if isinstance(key, dict) else key
+            for key in tx_data["transaction"]["message"]["accountKeys"]]
+
+
+def invoked_programs(tx_data):
+    """Program ids of every top-level and inner instruction, in any encoding"""
+    keys = account_key_strings(tx_data)
+    groups = [tx_data["transaction"]["message"].get("instructions", [])]
+    groups += [group["instructions"] for group in tx_data["meta"].get("innerInstructions") or []]
+    for instructions in groups:
+        for instr in instructions:
+            yield instr["programId"] if "programId" in instr else keys[instr["programIdIndex"]]
+
+
+def describe_transfer(tx_data, treasury_address):
+    """Return (is_system_transfer, description) from logs and parsed instructions"""
+    is_system_transfer = False
+    description = ""
+
+    logs = tx_data["meta"].get("logMessages")
+    if logs is None:
+        # Slim transactions (see ``schema``) carry no logs; the instructions name the same programs
+        is_system_transfer = SYSTEM_PROGRAM_ID in invoked_programs(tx_data)
+    for log in logs or []:
+        if f"Program {SYSTEM_PROGRAM_ID} invoke" in log:
+            is_system_transfer = True
+
+    # Check instruction data to get more detail
+    for instr in tx_data["transaction"]["message"].get("instructions", []):
+        if "parsed" in instr and instr.get("program") == "system" and instr["parsed"].get("type") == "transfer":
+            transfer_info = instr["parsed"].get("info", {})
+            source = transfer_info.get("source")
+            destination = transfer_info.get("destination")
+            amount = transfer_info.get("lamports", 0) / LAMPORTS_PER_SOL
+
+            # Build a description of the transfer
+            if source == treasury_address:
+                description = f"Transfer {amount} SOL to {destination}"
+            elif destination == treasury_address:
+                description = f"Receive {amount} SOL from {source}"
+
+    return is_system_transfer, description
+
+
+def transfer_record(tx_data, treasury_address, delta_lamports, counterparty):
+    """Build the sol_transfers.json record for a treasury balance change"""
+    block_time = tx_data.get("blockTime", 0)
+    is_system_transfer, description = describe_transfer(tx_data, treasury_address)
+    return {
+        "timestamp": block_time,
+        "formatted_time": format_timestamp(block_time),
+        "signature": tx_data["transaction"]["signatures"][0],
+        "balance_change": delta_lamports / LAMPORTS_PER_SOL,
+        "counterparty": counterparty if counterparty else "Unknown",
+        "is_system_transfer": is_system_transfer,
+        "description": description
+    }
+
+
+def extract_sol_transfers(tx_data, treasury_address):
+    """Extract SOL transfer information from transaction data"""
+    if not tx_data or "meta" not in tx_data or not tx_data["meta"]:
+        return None
+
+    pre_balances = tx_data["meta"]["preBalances"]
+    post_balances = tx_data["meta"]["postBalances"]
+    account_keys = account_key_strings(tx_data)
+
+    try:
+        treasury_index = account_keys.index(treasury_address)
+    except ValueError:
+        return None
+    if treasury_index >= len(pre_balances) or treasury_index >= len(post_balances):
+        return None
+
+    delta = post_balances[treasury_index] - pre_balances[treasury_index]
+    if abs(delta) <= DUST_LAMPORTS:  # Filter out dust
+        return None
+
+    # Find sender (for incoming transfers) or recipient (for outgoing transfers)
+    fee = tx_data["meta"]["fee"]
+    counterparty = None
+    for i, (pre, post) in enumerate(zip(pre_balances, post_balances)):
+        if i == treasury_index:
+            continue
+        change = post - pre
+        if delta > 0 and change < 0 and abs(change + fee) >= delta:
+            counterparty = account_keys[i]
+            break
+        if delta < 0 and change > 0 and change >= -delta:
+            counterparty = account_keys[i]
+            break
+
+    return transfer_record(tx_data, treasury_address, delta, counterparty)
+
+
+def analyze_transaction(tx_data, treasury_address):
+    """Analyze transaction data for transfers to treasury"""
+    if not tx_data or not tx_data.get("meta"):
+        return None
+
+    meta = tx_data["meta"]
+    keys = account_key_strings(tx_data)
+    transfers = []
+
+    # Look for balance changes
+    for i, (pre, post) in enumerate(zip(meta["preBalances"], meta["postBalances"])):
+        change = post - pre
+        if abs(change) > DUST_LAMPORTS:  # Filter out very small changes
+            transfers.append({
+                "account": keys[i],
+                "change_sol": change / LAMPORTS_PER_SOL,
+                "is_treasury": keys[i] == treasury_address
+            })
+
+    # Check if treasury was involved
+    if not any(t["is_treasury"] for t in transfers):
+        return None
+
+    return {
+        "signature": tx_data["transaction"]["signatures"][0],
+        "block_time": tx_data.get("blockTime"),
+        "success": not meta.get("err"),
+        "transfers": transfers
+    }
@@ -0,0 +1,120 @@
+"""Signature pre-filtering between pagination and transaction fetches.
+
+``getSignaturesForAddress`` already reports each signature's ``err``,
+``slot`` and ``blockTime``. A ``SignatureFilter`` uses those fields to drop
+entries that cannot matter before any ``getTransaction`` call is made:
+failed transactions, which move no SOL beyond the fee payer's fee, and
+signatures outside a requested slot or time window. Signature pages arrive
+newest first, so once a page ends before the window starts there is nothing
+left to page through either.
+
+Failed transactions are skipped by default, so the scanners' outputs (the
+transfers in ``sol_transfers.json`` among them) no longer list the failed
+transactions they used to; ``--include-failed`` brings them back. Dates on
+the command line are UTC, and ``--end`` with a date covers that whole day.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+
+class SignatureFilter:
+    """Decide per signature entry whether its transaction is worth fetching.
+
+    Slot bounds and ``start_time`` are inclusive, ``end_time`` is exclusive;
+    ``start_time``/``end_time`` are Unix timestamps compared against
+    ``blockTime``. Entries without a ``blockTime`` are kept, since they
+    cannot be placed in a time window.
+    """
+
+    def __init__(self, skip_failed=True, min_slot=None, max_slot=None, start_time=None, end_time=None):
+        self.skip_failed = skip_failed
+        self.min_slot = min_slot
+        self.max_slot = max_slot
+        self.start_time = start_time
+        self.end_time = end_time
+
+        self.seen = 0
+        self.skipped_failed = 0
+        self.skipped_window = 0
+
+    @property
+    def has_window(self):
+        return any(bound is not None for bound in (self.min_slot, self.max_slot, self.start_time, self.end_time))
+
+    @property
+    def saved(self):
+        """getTransaction calls avoided so far"""
+        return self.skipped_failed + self.skipped_window
+
+    def in_window(self, entry):
+        slot = entry.get("slot")
+        if slot is not None:
+            if self.min_slot is not None and slot < self.min_slot:
+                return False
+            if self.max_slot is not None and slot > self.max_slot:
+                return False
+        block_time = entry.get("blockTime")
+        if block_time is not None:
+            if self.start_time is not None and block_time < self.start_time:
+                return False
+            if self.end_time is not None and block_time >= self.end_time:
+                return False
+        return True
+
+    def apply(self, page):
+        """Return the entries of a signature page that should be fetched"""
+        kept = []
+        for entry in page:
+            self.seen += 1
+            if not self.in_window(entry):
+                self.skipped_window += 1
+            elif self.skip_failed and entry.get("err"):
+                self.skipped_failed += 1
+            else:
+                kept.append(entry)
+        return kept
+
+    def past_window(self, entry):
+        """Whether this entry, and so everything older, precedes the window"""
+        slot = entry.get("slot")
+        if self.min_slot is not None and slot is not None and slot < self.min_slot:
+            return True
+        block_time = entry.get("blockTime")
+        return self.start_time is not None and block_time is not None and block_time < self.start_time
+
+    def summary(self):
+        return (f"Pre-filter skipped {self.saved} of {self.seen} signatures before fetching "
+                f"({self.skipped_failed} failed, {self.skipped_window} outside the window)")
+
+
+def parse_date(value):
+    """Unix timestamp from an ISO date or date-time given on the command line, in UTC unless it has an offset"""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def parse_end_date(value):
+    """``parse_date`` for an exclusive end: a bare date ends where the next day starts"""
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        return parse_date(value)
+    return parse_date((day + timedelta(days=1)).isoformat())
+
+
+def add_filter_arguments(parser):
+    """Add the pre-filter options shared by the scanner scripts to an argparse parser"""
+    parser.add_argument("--include-failed", action="store_true",
+                        help="also fetch transactions that failed on chain (skipped by default)")
+    parser.add_argument("--start", type=parse_date,
+                        help="skip signatures before this UTC date or time (YYYY-MM-DD[THH:MM])")
+    parser.add_argument("--end", type=parse_end_date,
+                        help="skip signatures after this UTC date, or from this UTC time on (YYYY-MM-DD[THH:MM])")
+    parser.add_argument("--min-slot", type=int, help="skip signatures before this slot")
+    parser.add_argument("--max-slot", type=int, help="skip signatures after this slot")
+
+
+def filter_from_args(args):
+    return SignatureFilter(skip_failed=not args.include_failed, min_slot=args.min_slot, max_slot=args.max_slot,
+                           start_time=args.start, end_time=args.end)
@@ -0,0 +1,117 @@
+"""Incremental ledger of presale contributions, kept between runs.
+
+The contribution scanners matched tiers with float equality
+(``sol_amount in VALID_AMOUNTS``) and recomputed every total and histogram
+from the full list each run. A ``ContributionLedger`` matches tiers on exact
+integer lamports and keeps the aggregates (overall total, count per tier,
+total and count per sender) up to date as each contribution is added, in
+O(1). Reports read the aggregates directly.
+
+The ledger is saved atomically to a JSON file together with the scan
+boundaries: the newest signature seen, so the next run only pages newer
+ones, and how far back the first scan got, so a scan that stopped short of
+the target can carry on from there.
+"""
+import json
+import os
+import time
+
+from .extract import LAMPORTS_PER_SOL
+
+LEDGER_PATH = os.environ.get("SOLANA_LEDGER_FILE", "contributions_ledger.json")
+LEDGER_VERSION = 1
+
+# Presale tiers in lamports: 0.25, 0.5, 1 and 2 SOL
+TIER_LAMPORTS = frozenset({250_000_000, 500_000_000, 1_000_000_000, 2_000_000_000})
+TARGET_LAMPORTS = 24_250_000_000
+
+
+class ContributionLedger:
+    """Contributions by signature, with running aggregates.
+
+    The saved ledger at ``path`` is loaded unless ``load`` is false, which
+    starts an empty one that replaces it on ``save()``.
+    """
+
+    def __init__(self, path=LEDGER_PATH, load=True):
+        self.path = path
+        self.contributions = {}  # signature -> (sender, lamports, timestamp)
+        self.total_lamports = 0
+        self.tiers = dict.fromkeys(sorted(TIER_LAMPORTS), 0)
+        self.senders = {}  # sender -> [lamports, count]
+        # Scan boundaries: the newest signature seen, the oldest paged, and whether paging back is done
+        self.newest = None
+        self.oldest = None
+        self.backfilled = False
+        if load and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path) as f:
+            state = json.load(f)
+        if state.get("version") != LEDGER_VERSION:
+            raise ValueError(f"{self.path} is ledger version {state.get('version')}, expected {LEDGER_VERSION}")
+        self.newest = state["newest"]
+        self.oldest = state["oldest"]
+        self.backfilled = state["backfilled"]
+        self.total_lamports = state["total_lamports"]
+        self.tiers = {int(lamports): count for lamports, count in state["tiers"].items()}
+        self.senders = state["senders"]
+        self.contributions = {signature: tuple(entry) for signature, *entry in state["contributions"]}
+
+    @staticmethod
+    def is_tier(lamports):
+        return lamports in TIER_LAMPORTS
+
+    def add(self, signature, sender, lamports, timestamp=None):
+        """Record a contribution; return False for a repeat or an amount that is not a tier"""
+        if lamports not in TIER_LAMPORTS or signature in self.contributions:
+            return False
+        self.contributions[signature] = (sender, lamports, timestamp)
+        self.total_lamports += lamports
+        self.tiers[lamports] += 1
+        totals = self.senders.get(sender)
+        if totals is None:
+            totals = self.senders[sender] = [0, 0]
+        totals[0] += lamports
+        totals[1] += 1
+        return True
+
+    def __len__(self):
+        return len(self.contributions)
+
+    @property
+    def total_sol(self):
+        return self.total_lamports / LAMPORTS_PER_SOL
+
+    def reached(self, target_lamports=TARGET_LAMPORTS):
+        return self.total_lamports >= target_lamports
+
+    def sender_total(self, sender):
+        """(lamports, count) contributed by one sender"""
+        return tuple(self.senders.get(sender, (0, 0)))
+
+    def top_senders(self, count=10):
+        """The senders who contributed the most, as (sender, lamports, contributions)"""
+        ranked = sorted(self.senders.items(), key=lambda item: (-item[1][0], item[0]))
+        return [(sender, lamports, n) for sender, (lamports, n) in ranked[:count]]
+
+    def save(self):
+        """Write the ledger atomically so a crash never leaves a torn file"""
+        state = {
+            "version": LEDGER_VERSION,
+            "updated_at": int(time.time()),
+            "newest": self.newest,
+            "oldest": self.oldest,
+            "backfilled": self.backfilled,
+            "total_lamports": self.total_lamports,
+            "tiers": self.tiers,
+            "senders": self.senders,
+            "contributions": [[signature, *entry] for signature, entry in self.contributions.items()]
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
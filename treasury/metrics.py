@@ -0,0 +1,181 @@
+"""In-process metrics for the RPC layer and the scan stages.
+
+The client and the pipeline record into module-level counters and
+histograms: requests per method, endpoint and outcome, request latency,
+bytes received, retries, cache hits and the time each scan stage takes. At
+the end of a run ``write(path)`` dumps them in the Prometheus text
+exposition format (``.prom`` or ``.txt``) or as a JSON snapshot (anything
+else); the CLI does so when ``SOLANA_METRICS_FILE`` is set:
+
+    SOLANA_METRICS_FILE=metrics.prom python -m treasury transfers
+
+Endpoints are labelled by host only, since provider URLs often carry an API
+key in their path.
+"""
+import bisect
+import json
+import os
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Counter:
+    """Monotonic totals per label set"""
+
+    type = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self.values.get(self._key(labels), 0)
+
+    def samples(self):
+        for key, value in sorted(self.values.items()):
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+    def snapshot(self):
+        return [{"labels": dict(zip(self.labelnames, key)), "value": value}
+                for key, value in sorted(self.values.items())]
+
+
+class Histogram(Counter):
+    """Bucketed observations per label set, with their count and sum"""
+
+    type = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        state = self.values.get(key)
+        if state is None:
+            # Per-bucket (not cumulative) counts, with a final overflow bucket
+            state = self.values[key] = {"buckets": [0] * (len(self.buckets) + 1), "count": 0, "sum": 0.0}
+        state["buckets"][bisect.bisect_left(self.buckets, value)] += 1
+        state["count"] += 1
+        state["sum"] += value
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self):
+        for key, state in sorted(self.values.items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state["buckets"]):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_bound(bound)}, cumulative
+            yield f"{self.name}_sum", labels, state["sum"]
+            yield f"{self.name}_count", labels, state["count"]
+
+    def snapshot(self):
+        return [{"labels": dict(zip(self.labelnames, key)), "count": state["count"], "sum": state["sum"],
+                 "buckets": dict(zip(map(_format_bound, self.buckets + (float("inf"),)), state["buckets"]))}
+                for key, state in sorted(self.values.items())]
+
+
+class Registry:
+    """The set of metrics exported together"""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def _register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def reset(self):
+        for metric in self.metrics.values():
+            metric.values.clear()
+
+    def prometheus_text(self):
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        return {
+            "generated_at": int(time.time()),
+            "metrics": {name: {"type": metric.type, "help": metric.help, "samples": metric.snapshot()}
+                        for name, metric in self.metrics.items()}
+        }
+
+    def write(self, path):
+        """Write Prometheus text for .prom/.txt paths, a JSON snapshot otherwise, atomically"""
+        text = self.prometheus_text() if path.endswith((".prom", ".txt")) else json.dumps(self.snapshot(), indent=2)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+               for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+def endpoint_label(url):
+    """Host (and port) of an endpoint URL, without any key in its path"""
+    parts = urlsplit(url)
+    return parts.hostname + (f":{parts.port}" if parts.port else "") if parts.hostname else url
+
+
+REGISTRY = Registry()
+
+RPC_REQUESTS = REGISTRY.counter(
+    "solana_rpc_requests_total", "HTTP requests to RPC endpoints by outcome", ("method", "endpoint", "outcome"))
+RPC_LATENCY = REGISTRY.histogram(
+    "solana_rpc_request_seconds", "Round-trip time of successful RPC requests", ("method", "endpoint"))
+RPC_BYTES = REGISTRY.counter(
+    "solana_rpc_response_bytes_total", "Response body bytes received from RPC endpoints", ("method", "endpoint"))
+RPC_RETRIES = REGISTRY.counter(
+    "solana_rpc_retries_total", "RPC calls or batch items sent again after a failure", ("method",))
+RPC_COALESCED = REGISTRY.counter(
+    "solana_rpc_coalesced_total", "Calls answered by an identical in-flight request or the short memo",
+    ("method", "source"))
+CACHE_LOOKUPS = REGISTRY.counter(
+    "solana_tx_cache_lookups_total", "Transaction lookups answered by the on-disk cache or not", ("result",))
+STAGE_SECONDS = REGISTRY.histogram(
+    "treasury_scan_stage_seconds", "Time spent per scan stage and chunk", ("stage",))
@@ -0,0 +1,269 @@
+"""Push-based treasury monitoring over Solana's WebSocket PubSub API.
+
+The polling scripts page getSignaturesForAddress every few minutes. A
+``TreasuryMonitor`` keeps a ``logsSubscribe`` subscription for transactions
+mentioning the address instead, so each new signature arrives about a second
+after it lands, and only that transaction is fetched and run through the
+extractor. An ``accountSubscribe`` on the same address backs it up: if the
+balance changes and no signature at or past that slot has been announced
+within ``ACCOUNT_GRACE`` seconds, the monitor pages the signatures it missed.
+A transaction that cannot be fetched is retried, then dropped and reported.
+
+When the connection drops it reconnects with backoff, resubscribes and then
+backfills every signature since its watermark, so transactions that landed
+while it was away are still reported, once.
+
+    async with RpcClient() as client:
+        async for transfer in TreasuryMonitor(client, TREASURY_WALLET).run():
+            ...
+"""
+import asyncio
+import json
+from collections import OrderedDict
+
+import aiohttp
+
+from .config import RPC_TIMEOUT, ws_urls
+from .endpoints import backoff_delay
+from .extract import extract_sol_transfers
+from .rpc import RpcError
+
+# "confirmed" transactions are visible about a second after their slot
+MONITOR_COMMITMENT = "confirmed"
+# How long a balance change may go without a log notification before backfilling
+ACCOUNT_GRACE = 2.0
+# A notification can beat its transaction to the RPC node; retry the fetch this often
+FETCH_ATTEMPTS = 5
+FETCH_RETRY_DELAY = 0.5
+# A transaction still missing after that is tried again this often, more slowly, then dropped
+# so it no longer holds back the watermark
+LATE_ATTEMPTS = 3
+LATE_RETRY_DELAY = 30.0
+# Signatures remembered to drop duplicates between notifications and backfills
+SEEN_LIMIT = 10_000
+
+
+class TreasuryMonitor:
+    """Stream ``extract(sig_data, tx_data)`` results for an address's new transactions.
+
+    ``watermarks`` (a ``WatermarkStore``) keeps the newest signature that is
+    safe to resume after across restarts. Without a saved watermark the
+    monitor starts from the current head rather than replaying history.
+    Failed transactions are skipped, as the scanners' pre-filter does.
+    """
+
+    def __init__(self, client, address, urls=None, watermarks=None, commitment=MONITOR_COMMITMENT, extract=None):
+        self.client = client
+        self.address = address
+        self.urls = list(urls or ws_urls())
+        self.watermarks = watermarks
+        self.commitment = commitment
+        self.extract = extract or (lambda sig_data, tx_data: extract_sol_transfers(tx_data, address))
+
+        self.watermark = watermarks.get(address) if watermarks else None
+        self.connections = 0
+        self.notifications = 0
+        self.backfilled = 0
+        self.fetched = 0
+        self.skipped_failed = 0
+        self.failed = []
+
+        self._seen = OrderedDict()
+        self._queue = None
+        self._outstanding = 0
+        self._newest = None  # newest entry handled since the watermark last moved
+        self._newest_slot = self.watermark["slot"] if self.watermark else 0
+        self._expected_slot = 0
+        self._account_check = None
+
+    async def run(self):
+        """Yield records for new transactions as they land, until cancelled"""
+        self._queue = asyncio.Queue()
+        listener = asyncio.create_task(self._listen())
+        try:
+            while True:
+                batch = [await self._next(listener)]
+                while not self._queue.empty() and len(batch) < self.client.batch_size:
+                    batch.append(self._queue.get_nowait())
+                for record in await self._process(batch):
+                    yield record
+        finally:
+            listener.cancel()
+            if self._account_check:
+                self._account_check.cancel()
+
+    async def _next(self, listener):
+        """The next queued entry; re-raises whatever stopped the listener, which otherwise never ends"""
+        if not self._queue.empty():
+            return self._queue.get_nowait()
+        getter = asyncio.ensure_future(self._queue.get())
+        await asyncio.wait({getter, listener}, return_when=asyncio.FIRST_COMPLETED)
+        if getter.done():
+            return getter.result()
+        getter.cancel()
+        listener.result()
+        raise RuntimeError("the WebSocket listener stopped")
+
+    async def _listen(self):
+        """Keep a subscribed connection open, reconnecting and backfilling after drops"""
+        attempt = 0
+        while True:
+            url = self.urls[self.connections % len(self.urls)]
+            self.connections += 1
+            try:
+                async with self.client.ws_connect(url, heartbeat=30) as ws:
+                    await self._subscribe(ws)
+                    print(f"Subscribed to {self.address} on {url}")
+                    # Subscribing first means nothing can land unseen between the backfill and the stream
+                    await self._backfill()
+                    attempt = 0
+                    async for message in ws:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            self._handle(json.loads(message.data))
+                        elif message.type == aiohttp.WSMsgType.ERROR:
+                            break
+            except (aiohttp.ClientError, asyncio.TimeoutError, RpcError, TypeError, ValueError) as e:
+                print(f"WebSocket error ({url}): {e!r}")
+            delay = backoff_delay(attempt)
+            attempt += 1
+            print(f"Disconnected from {url}, reconnecting in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def _subscribe(self, ws):
+        requests = {
+            1: ("logsSubscribe", [{"mentions": [self.address]}, {"commitment": self.commitment}]),
+            2: ("accountSubscribe", [self.address, {"commitment": self.commitment, "encoding": "base64"}]),
+        }
+        for request_id, (method, params) in requests.items():
+            await ws.send_json({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+
+        confirmed = set()
+        while len(confirmed) < len(requests):
+            message = await ws.receive_json(timeout=RPC_TIMEOUT)
+            request_id = message.get("id")
+            if request_id not in requests:
+                self._handle(message)  # A notification racing the confirmations
+            elif "error" in message:
+                raise RpcError(f"{requests[request_id][0]} failed: {message['error'].get('message')}",
+                               message["error"].get("code"))
+            else:
+                confirmed.add(request_id)
+
+    def _handle(self, message):
+        method = message.get("method") if isinstance(message, dict) else None
+        if method not in ("logsNotification", "accountNotification"):
+            return
+        self.notifications += 1
+        try:
+            result = message["params"]["result"]
+            slot = result["context"]["slot"]
+            if method == "logsNotification":
+                value = result["value"]
+                entry = {"signature": value["signature"], "slot": slot, "err": value.get("err")}
+        except (KeyError, TypeError) as e:
+            # One odd notification must not take the listener down with it
+            print(f"Ignoring malformed {method} ({e!r}): {json.dumps(message)[:200]}")
+            return
+        if method == "logsNotification":
+            self._enqueue(entry)
+        else:
+            self._expected_slot = max(self._expected_slot, slot)
+            if self._account_check is None or self._account_check.done():
+                self._account_check = asyncio.create_task(self._check_account())
+
+    async def _check_account(self):
+        """Backfill if a balance change is not followed by its log notification"""
+        await asyncio.sleep(ACCOUNT_GRACE)
+        if self._newest_slot < self._expected_slot:
+            print(f"Balance changed at slot {self._expected_slot} without a log notification, backfilling")
+            try:
+                await self._backfill()
+            except RpcError as e:
+                print(f"Backfill failed: {e}")
+
+    async def _backfill(self):
+        """Queue every signature since the watermark, oldest first"""
+        if not self.watermark:
+            # Nothing processed yet: start from the current head instead of replaying history
+            head = await self.client.get_signatures(self.address, limit=1, commitment=self.commitment)
+            if head:
+                self._seen[head[0]["signature"]] = head[0]["slot"]
+                self._newest_slot = max(self._newest_slot, head[0]["slot"])
+                self._advance(head[0])
+            return
+
+        entries = []
+        async for page in self.client.iter_signatures(self.address, until=self.watermark["signature"],
+                                                      commitment=self.commitment):
+            entries.extend(page)
+        queued = sum(self._enqueue(entry) for entry in reversed(entries))
+        self.backfilled += queued
+        if queued:
+            print(f"Backfilled {queued} signatures since slot {self.watermark['slot']}")
+
+    def _enqueue(self, entry):
+        """Queue a signature for fetching unless it was already seen; return whether it was queued"""
+        signature = entry["signature"]
+        if signature in self._seen:
+            return False
+        self._seen[signature] = entry.get("slot")
+        if len(self._seen) > SEEN_LIMIT:
+            self._seen.popitem(last=False)
+        self._newest_slot = max(self._newest_slot, entry.get("slot") or 0)
+
+        if entry.get("err"):
+            # A failed transaction moves no SOL beyond its fee payer's fee
+            self.skipped_failed += 1
+            self._handled(entry)
+            return False
+        self._outstanding += 1
+        self._queue.put_nowait((entry, 1))
+        return True
+
+    async def _process(self, batch):
+        """Fetch a batch of queued signatures and return the records extracted from them"""
+        transactions = await self.client.get_transactions([entry["signature"] for entry, _ in batch],
+                                                          commitment=self.commitment, slim=True)
+        records = []
+        for (entry, attempt), tx_data in zip(batch, transactions):
+            if not tx_data:
+                if attempt < FETCH_ATTEMPTS + LATE_ATTEMPTS:
+                    delay = FETCH_RETRY_DELAY if attempt < FETCH_ATTEMPTS else LATE_RETRY_DELAY
+                    asyncio.get_running_loop().call_later(delay, self._queue.put_nowait, (entry, attempt + 1))
+                    continue
+                print(f"Giving up on {entry['signature']} after {attempt} attempts")
+                self.failed.append(entry)
+                self._outstanding -= 1
+                self._handled(entry)
+                continue
+
+            self.fetched += 1
+            record = self.extract(entry, tx_data)
+            if record:
+                records.append(record)
+            self._outstanding -= 1
+            self._handled(entry)
+        return records
+
+    def _handled(self, entry):
+        """Move the watermark once everything up to the newest handled entry is done"""
+        if entry.get("slot") is not None and (self._newest is None or entry["slot"] > self._newest["slot"]):
+            self._newest = entry
+        # Anything still in flight must be seen again after a restart; given-up entries are only reported
+        if self._newest and not self._outstanding:
+            self._advance(self._newest)
+            self._newest = None
+
+    def _advance(self, entry):
+        if self.watermark and entry["slot"] <= self.watermark["slot"]:
+            return
+        if self.watermarks:
+            self.watermark = self.watermarks.advance(self.address, [entry])
+            self.watermarks.save()
+        else:
+            self.watermark = {"signature": entry["signature"], "slot": entry["slot"]}
+
+    def summary(self):
+        return (f"{self.notifications} notifications over {self.connections} connections, "
+                f"{self.backfilled} signatures backfilled, {self.fetched} transactions fetched, "
+                f"{self.skipped_failed} failed transactions skipped, {len(self.failed)} not found")
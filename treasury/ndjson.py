@@ -0,0 +1,245 @@
+"""Streaming, append-only NDJSON dumps.
+
+The dump scripts used to keep every transaction in memory and write one
+indented JSON array at the end, so a crash lost the whole run and memory grew
+with the dump. ``NdjsonWriter`` appends one compact JSON record per line as
+records arrive and flushes every few records or seconds, so at most the last
+few records are lost on a crash. Compression follows the file suffix:
+``.gz`` (gzip) or ``.zst`` (zstandard, optional dependency); appending to a
+compressed dump adds a new gzip member / zstd frame, which readers
+concatenate transparently (a member left unfinished by a crash is salvaged
+first).
+
+``iter_records`` streams the records back one at a time. It also reads the
+older indented JSON array dumps, and skips a final line that a crash left
+half-written. ``JsonArrayWriter`` still writes those arrays, record by
+record, for the dump files that cron jobs read as JSON; ``open_dump`` picks
+the writer from the file name.
+"""
+import gzip
+import io
+import json
+import os
+import textwrap
+import time
+import zlib
+
+# Flush after this many records or seconds, whichever comes first
+FLUSH_EVERY = 100
+FLUSH_INTERVAL = 5.0
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd-compressed dumps need the zstandard package (pip install zstandard)") from None
+    return zstandard
+
+
+def compression(path):
+    """Compression implied by a dump's file name: "gzip", "zstd" or None"""
+    path = str(path)
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        return "zstd"
+    return None
+
+
+def open_text(path, mode="r"):
+    """Open a dump for text reading ("r") or appending/writing ("a"/"w"), decompressing by suffix"""
+    kind = compression(path)
+    if kind == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if kind == "zstd":
+        zstandard = _zstandard()
+        if mode == "r":
+            raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True,
+                                                             closefd=True)
+        else:
+            raw = zstandard.ZstdCompressor(level=3).stream_writer(open(path, mode + "b"), closefd=True)
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def stream_complete(path):
+    """Whether every gzip member / zstd frame in a compressed dump is finished.
+
+    A writer that died mid-stream leaves an unterminated one behind, and
+    appending a new member after it would make the rest of the file unreadable.
+    """
+    if compression(path) == "zstd":
+        new_decompressor = _zstandard().ZstdDecompressor().decompressobj
+    else:
+        new_decompressor = lambda: zlib.decompressobj(wbits=31)
+
+    decompressor, finished = new_decompressor(), True
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            while chunk:
+                decompressor.decompress(chunk)
+                chunk, finished = b"", decompressor.eof
+                if decompressor.eof:
+                    # The next member or frame starts in whatever is left over
+                    chunk = decompressor.unused_data
+                    decompressor = new_decompressor()
+    return finished
+
+
+def salvage(path):
+    """Rewrite a dump that was not closed cleanly, keeping every record that was flushed"""
+    print(f"{path} was not closed cleanly, recovering its records before appending")
+    # Keep the compression suffix so the temporary copy is written the same way
+    tmp_path = path + ".tmp" + os.path.splitext(path)[1]
+    with NdjsonWriter(tmp_path, append=False) as writer:
+        writer.write_many(iter_records(path))
+    os.replace(tmp_path, path)
+
+
+class NdjsonWriter:
+    """Append JSON records to an NDJSON file, one per line, flushing periodically"""
+
+    def __init__(self, path, append=True, flush_every=FLUSH_EVERY, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.count = 0
+        if append and compression(path) and os.path.exists(path) and not stream_complete(path):
+            salvage(path)
+        self._file = open_text(path, "a" if append else "w")
+        self._unflushed = 0
+        self._flushed_at = time.monotonic()
+
+    def write(self, record):
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.count += 1
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every or time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Push buffered records through the compressor and out to the OS"""
+        # gzip and zstd writers both end the current block on flush, so
+        # everything written so far is readable even if the run dies now
+        self._file.flush()
+        self._unflushed = 0
+        self._flushed_at = time.monotonic()
+
+    def close(self):
+        if self._file.closed:
+            return
+        if compression(self.path) == "zstd":
+            # Finish the frame so the next append starts a fresh one
+            self._file.flush()
+            self._file.buffer.flush(_zstandard().FLUSH_FRAME)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class JsonArrayWriter:
+    """Write records as one indented JSON array, as ``json.dump(records, f, indent=2)`` would.
+
+    The array is only valid once the writer is closed, and cannot be appended to.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open_text(path, "w")
+
+    def write(self, record):
+        self._file.write(("[\n" if not self.count else ",\n") + textwrap.indent(json.dumps(record, indent=2), "  "))
+        self.count += 1
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.write("\n]" if self.count else "[]")
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def is_ndjson(path):
+    return ".ndjson" in os.path.basename(str(path))
+
+
+def open_dump(path, append=False):
+    """An ``NdjsonWriter`` if the file name contains ``.ndjson``, else a ``JsonArrayWriter``"""
+    if is_ndjson(path):
+        return NdjsonWriter(path, append=append)
+    if append:
+        raise ValueError(f"{path} is a JSON array dump; only .ndjson dumps can be appended to")
+    return JsonArrayWriter(path)
+
+
+def iter_records(path):
+    """Yield the records of an NDJSON dump, or of a legacy JSON array dump"""
+    try:
+        yield from _iter_records(path)
+    except EOFError:
+        # A compressed dump whose writer died has no end-of-stream marker;
+        # everything it flushed before that was still read
+        print(f"{path} ends mid-stream, it was not closed cleanly")
+
+
+def iter_lines(path):
+    """Yield an NDJSON dump's lines unparsed, for callers that parse them elsewhere.
+
+    A legacy JSON array dump has no lines to hand out, so its records come
+    already parsed.
+    """
+    try:
+        yield from _iter_lines(path)
+    except EOFError:
+        print(f"{path} ends mid-stream, it was not closed cleanly")
+
+
+def _iter_lines(path):
+    with open_text(path) as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        if first == "[":
+            # Pre-NDJSON dumps are a single indented array
+            yield from json.loads(first + f.read())
+            return
+
+        pending = first
+        for line in f:
+            yield pending + line
+            pending = ""
+
+
+def _iter_records(path):
+    for line_number, line in enumerate(_iter_lines(path), 1):
+        if not isinstance(line, str):
+            yield line
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            if line.endswith("\n"):
+                raise ValueError(f"{path}:{line_number}: invalid NDJSON record") from None
+            # Only the last line can be cut short by a crash mid-write
+            print(f"Skipping truncated last record in {path}")
@@ -0,0 +1,251 @@
+"""Producer/consumer pipeline from signature pagination to extracted records.
+
+The scanners used to collect every signature before fetching a single
+transaction. Here a producer pages getSignaturesForAddress into a bounded
+queue while concurrent workers drain it, fetch the transactions in batches and
+run an extractor over each one. Records are yielded as soon as they are found,
+so the first result arrives about one round trip after the first page, and
+memory stays bounded by the queue size however long the history is.
+
+Transactions are fetched in ``TX_ENCODING`` unless an ``encoding`` is given;
+base64 transactions are decoded (see ``binary``) before the extractor sees
+them, so extractors are written against the jsonParsed shape either way.
+
+    pipeline = SignaturePipeline(client, TREASURY_WALLET, extract)
+    async for record in pipeline.run():
+        ...
+"""
+import asyncio
+import time
+
+from .backfill import PartitionedPager
+from .binary import BASE64, decode_transaction
+from .config import TX_ENCODING
+from .metrics import STAGE_SECONDS
+from .rpc import RpcError
+
+_DONE = object()
+
+
+class SignaturePipeline:
+    """Stream ``extract(sig_data, tx_data)`` results for an address's history.
+
+    After ``run()`` finishes, ``newest`` is the newest signature entry seen,
+    ``failed`` lists entries whose transaction could not be fetched and
+    ``complete`` says whether pagination reached its end without an error.
+
+    An optional ``signature_filter`` (see ``filters``) drops entries before
+    they are fetched; they count towards ``signatures_seen`` but are neither
+    fetched nor failed. Pagination stops once it is past the filter's window.
+
+    With a ``checkpoint`` (see ``checkpoint``) progress is saved as the run
+    goes; if it was loaded from an earlier run, that run's records are
+    yielded first and scanning continues where it stopped.
+
+    Transactions are decoded slim (see ``schema``) unless ``slim=False``; an
+    extractor that reads fields outside the schema needs the full payload.
+
+    With ``partitions`` above 1, an address paged from its newest signature
+    back to the start of its history, with no ``until`` or
+    ``max_signatures``, is paged as that many concurrent slot ranges (see
+    ``backfill``), bounded by the filter's slot window if it has one.
+    """
+
+    def __init__(self, client, address, extract, until=None, before=None, max_signatures=None,
+                 page_size=1000, chunk_size=None, workers=None, encoding=TX_ENCODING,
+                 signature_filter=None, checkpoint=None, slim=True, partitions=1):
+        self.client = client
+        self.address = address
+        self.extract = extract
+        self.until = until
+        self.before = before
+        self.max_signatures = max_signatures
+        self.page_size = page_size
+        self.chunk_size = chunk_size or client.batch_size
+        self.workers = workers or max(2, client.concurrency // 2)
+        self.encoding = encoding
+        self.slim = slim
+        self.signature_filter = signature_filter
+        self.checkpoint = checkpoint
+        self.partitions = partitions
+
+        self.newest_by_address = {}
+        self.failed = []
+        self.complete = False
+        self.signatures_seen = 0
+        self.transactions_fetched = 0
+
+    @property
+    def newest(self):
+        return self.newest_by_address.get(self.address)
+
+    async def run(self):
+        """Yield extracted records as they are found, in completion order"""
+        chunks = asyncio.Queue(maxsize=self.workers * 2)
+        results = asyncio.Queue(maxsize=self.workers * self.chunk_size)
+
+        if self.checkpoint and self.checkpoint.resumed:
+            self._restore()
+            for record in list(self.checkpoint.records):
+                yield record
+
+        tasks = [asyncio.create_task(self._produce(chunks))]
+        tasks += [asyncio.create_task(self._work(chunks, results)) for _ in range(self.workers)]
+
+        try:
+            finished = 0
+            while finished < self.workers:
+                item = await results.get()
+                if item is _DONE:
+                    finished += 1
+                else:
+                    yield item
+            # Surface a worker's exception instead of silently dropping its chunks
+            await asyncio.gather(*tasks[1:])
+            await tasks[0]
+        finally:
+            for task in tasks:
+                task.cancel()
+            if self.checkpoint:
+                self._save_checkpoint()
+
+    def _restore(self):
+        """Pick the counters of a resumed run back up from its checkpoint"""
+        stats = self.checkpoint.stats
+        self.signatures_seen = stats.get("signatures_seen", 0)
+        self.transactions_fetched = stats.get("transactions_fetched", 0)
+        self.newest_by_address.update(self.checkpoint.newest)
+        if self.signature_filter and "filter" in stats:
+            f = self.signature_filter
+            f.seen, f.skipped_failed, f.skipped_window = stats["filter"]
+
+    def _save_checkpoint(self):
+        stats = {"signatures_seen": self.signatures_seen, "transactions_fetched": self.transactions_fetched}
+        if self.signature_filter:
+            f = self.signature_filter
+            stats["filter"] = [f.seen, f.skipped_failed, f.skipped_window]
+        self.checkpoint.newest = dict(self.newest_by_address)
+        self.checkpoint.save(stats)
+
+    async def _requeue(self, chunks):
+        """Queue the signatures a resumed run had paged but not yet processed"""
+        if self.checkpoint and self.checkpoint.pending:
+            pending = list(self.checkpoint.pending.values())
+            print(f"Resuming: {len(pending)} signatures left from the previous run")
+            for start in range(0, len(pending), self.chunk_size):
+                await chunks.put(pending[start:start + self.chunk_size])
+
+    async def _produce(self, chunks):
+        """Page through signatures, feeding fetch-sized chunks to the workers"""
+        try:
+            await self._requeue(chunks)
+            self.complete = await self._page(self.address, self.until, chunks)
+        finally:
+            for _ in range(self.workers):
+                await chunks.put(_DONE)
+
+    async def _page(self, address, until, chunks):
+        """Page one address's signatures into chunks; return whether pagination finished"""
+        checkpoint = self.checkpoint
+        before, seen = self.before, 0
+        if checkpoint:
+            if address in checkpoint.paged:
+                return checkpoint.paged[address]
+            before = checkpoint.cursors.get(address, before)
+            seen = checkpoint.seen.get(address, 0)
+            if before != self.before:
+                print(f"Resuming pagination of {address[:16]}... after {seen} signatures")
+        if self.max_signatures is not None and seen >= self.max_signatures:
+            return self._end_paging(address, False)
+        pages = self._signature_pages(address, before, until)
+        try:
+            waited = time.perf_counter()
+            async for page in pages:
+                STAGE_SECONDS.observe(time.perf_counter() - waited, stage="paginate")
+                self.newest_by_address.setdefault(address, page[0])
+                if self.max_signatures is not None:
+                    page = page[:self.max_signatures - seen]
+                seen += len(page)
+                self.signatures_seen += len(page)
+                print(f"Fetched batch of {len(page)} signatures, total: {self.signatures_seen}")
+
+                wanted = self._claim(page)
+                if self.signature_filter:
+                    wanted = self.signature_filter.apply(wanted)
+                if checkpoint:
+                    checkpoint.add_page(address, wanted, page[-1]["signature"], seen)
+                for start in range(0, len(wanted), self.chunk_size):
+                    await chunks.put(wanted[start:start + self.chunk_size])
+
+                if checkpoint and checkpoint.save_due():
+                    self._save_checkpoint()
+                # Time spent blocked on a full queue is the workers' share, not pagination's
+                waited = time.perf_counter()
+
+                if self.max_signatures is not None and seen >= self.max_signatures:
+                    return self._end_paging(address, False)
+                if page and self.signature_filter and self.signature_filter.past_window(page[-1]):
+                    # Everything older is before the window too
+                    return self._end_paging(address, True)
+            return self._end_paging(address, True)
+        except RpcError as e:
+            print(f"Error fetching signatures: {e}")
+            return False
+        finally:
+            # Stops a partitioned pager's range tasks when paging ends early
+            await pages.aclose()
+
+    def _signature_pages(self, address, before, until):
+        """Signature pages of an address, newest first"""
+        if self.partitions > 1 and before is None and until is None and self.max_signatures is None:
+            signature_filter = self.signature_filter
+            pager = PartitionedPager(self.client, address, self.partitions, self.page_size,
+                                     min_slot=signature_filter.min_slot if signature_filter else None,
+                                     max_slot=signature_filter.max_slot if signature_filter else None)
+            return pager.pages()
+        return self.client.iter_signatures(address, before=before, until=until, limit=self.page_size)
+
+    def _end_paging(self, address, complete):
+        """Note that an address's pagination stopped by itself, not on an error"""
+        if self.checkpoint:
+            self.checkpoint.end_paging(address, complete)
+        return complete
+
+    def _claim(self, page):
+        """Entries of a page that still need fetching"""
+        return page
+
+    async def _work(self, chunks, results):
+        """Fetch each chunk of transactions and push extracted records downstream"""
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is _DONE:
+                    return
+
+                with STAGE_SECONDS.time(stage="fetch"):
+                    transactions = await self.client.get_transactions([entry["signature"] for entry in chunk],
+                                                                      encoding=self.encoding, slim=self.slim)
+                fetched = []
+                for sig_data, tx_data in zip(chunk, transactions):
+                    if not tx_data:
+                        self.failed.append(sig_data)
+                        continue
+                    fetched.append((sig_data, tx_data))
+                self.transactions_fetched += len(fetched)
+                if self.encoding == BASE64:
+                    with STAGE_SECONDS.time(stage="decode"):
+                        fetched = [(sig_data, decode_transaction(tx_data)) for sig_data, tx_data in fetched]
+
+                with STAGE_SECONDS.time(stage="extract"):
+                    records = [record for record in (self.extract(sig_data, tx_data) for sig_data, tx_data in fetched)
+                               if record]
+                if self.checkpoint:
+                    # Failed entries stay pending, so a resumed run retries them
+                    self.checkpoint.chunk_done([sig_data for sig_data, _ in fetched], records)
+                    if self.checkpoint.save_due():
+                        self._save_checkpoint()
+                for record in records:
+                    await results.put(record)
+        finally:
+            await results.put(_DONE)
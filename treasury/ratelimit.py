@@ -0,0 +1,177 @@
+"""Adaptive request-rate limiting driven by 429s and latency.
+
+The scanners used to sleep a hard-coded 0.1-0.5 s between calls, which is too
+slow on paid endpoints and still too fast on the public one. ``AdaptiveRate``
+is a token bucket whose refill rate follows AIMD: it grows additively while
+requests succeed and is cut multiplicatively on HTTP 429 / rate-limit errors
+or when latency climbs well above its baseline, so each provider settles at
+the highest rate it accepts. ``Retry-After`` pauses the bucket outright.
+
+One ``AdaptiveLimiter`` keeps a rate per endpoint and per (endpoint, method)
+and is shared by every ``RpcClient`` in the process.
+"""
+import email.utils
+import time
+
+from .config import RPC_BURST, RPC_MAX_RATE, RPC_MIN_RATE, RPC_RATE
+
+# Multiplicative cuts on throttling and on a latency spike
+THROTTLE_DECREASE = 0.5
+LATENCY_DECREASE = 0.8
+# Latency above this multiple of the baseline counts as congestion
+LATENCY_FACTOR = 2.5
+# Concurrent 429s from one burst should only cut the rate once
+DECREASE_INTERVAL = 1.0
+EWMA_ALPHA = 0.2
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` per second up to ``burst`` tokens"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, now=None):
+        """Seconds until at least one token is available"""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, cost=1, now=None):
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens -= cost
+
+
+class AdaptiveRate(TokenBucket):
+    """Token bucket whose rate is tuned by additive increase, multiplicative decrease"""
+
+    def __init__(self, rate=RPC_RATE, min_rate=RPC_MIN_RATE, max_rate=RPC_MAX_RATE, burst=RPC_BURST):
+        super().__init__(rate, min(burst, max(1.0, rate)))
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.max_burst = burst
+        self.blocked_until = 0.0
+        self.latency = None
+        self.baseline = None
+        self._last_decrease = 0.0
+        self.throttled = 0
+
+    def wait_time(self, now=None):
+        now = time.monotonic() if now is None else now
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        return super().wait_time(now)
+
+    def _set_rate(self, rate, now):
+        self._refill(now)
+        self.rate = max(self.min_rate, min(self.max_rate, rate))
+        self.burst = min(self.max_burst, max(1.0, self.rate))
+
+    def on_success(self, latency=None, now=None):
+        """Grow by about one request/second per second of clean traffic"""
+        now = time.monotonic() if now is None else now
+        if latency is None:
+            self._set_rate(self.rate + 1 / self.rate, now)
+            return
+
+        self.latency = latency if self.latency is None else (
+            EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency)
+        # The baseline follows the best latency seen, drifting up slowly so it can recover
+        self.baseline = self.latency if self.baseline is None else min(self.latency, self.baseline * 1.01)
+
+        if self.latency > LATENCY_FACTOR * self.baseline:
+            self._decrease(LATENCY_DECREASE, now)
+        else:
+            self._set_rate(self.rate + 1 / self.rate, now)
+
+    def on_throttle(self, retry_after=None, now=None):
+        """Halve the rate; honor the server's Retry-After if it sent one"""
+        now = time.monotonic() if now is None else now
+        self.throttled += 1
+        self._decrease(THROTTLE_DECREASE, now)
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+            self.tokens = min(self.tokens, 0)
+
+    def _decrease(self, factor, now):
+        if now - self._last_decrease < DECREASE_INTERVAL:
+            return
+        self._last_decrease = now
+        self._set_rate(self.rate * factor, now)
+
+
+class AdaptiveLimiter:
+    """AIMD rates per endpoint and per (endpoint, method)"""
+
+    def __init__(self, rate=RPC_RATE, min_rate=RPC_MIN_RATE, max_rate=RPC_MAX_RATE, burst=RPC_BURST):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self._rates = {}
+
+    def rates(self, url, method=None):
+        """The endpoint-wide rate and, if a method is given, the per-method one"""
+        keys = [(url, None)] if method is None else [(url, None), (url, method)]
+        rates = []
+        for key in keys:
+            if key not in self._rates:
+                self._rates[key] = AdaptiveRate(self.rate, self.min_rate, self.max_rate, self.burst)
+            rates.append(self._rates[key])
+        return rates
+
+    def wait_time(self, url, method=None, now=None):
+        now = time.monotonic() if now is None else now
+        return max(rate.wait_time(now) for rate in self.rates(url, method))
+
+    def take(self, url, method=None, now=None):
+        now = time.monotonic() if now is None else now
+        for rate in self.rates(url, method):
+            rate.take(1, now)
+
+    def refund(self, url, method=None):
+        for rate in self.rates(url, method):
+            rate.tokens += 1
+
+    def on_success(self, url, method, latency):
+        # Latency only steers the per-method rate; mixing methods would make
+        # any slow call look like congestion for the whole endpoint
+        endpoint_rate, *method_rates = self.rates(url, method)
+        endpoint_rate.on_success()
+        for rate in method_rates:
+            rate.on_success(latency)
+
+    def on_throttle(self, url, method, retry_after=None):
+        for rate in self.rates(url, method):
+            rate.on_throttle(retry_after)
+
+    def current_rate(self, url, method=None):
+        """Effective requests/second allowed right now"""
+        return min(rate.rate for rate in self.rates(url, method))
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+# Shared by every RpcClient so all fetch paths back off together
+DEFAULT_LIMITER = AdaptiveLimiter()
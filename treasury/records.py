@@ -0,0 +1,167 @@
+"""Compact record types and a shared pubkey intern table.
+
+A scan that keeps its results as dicts pays for a hash table per record plus
+a fresh string for every value: a 44-character base58 counterparty, a
+formatted time, a float amount. The same few hundred contributor pubkeys
+appear over and over. The record types here keep their fields in
+``__slots__`` instead, amounts as integer lamports, derived fields (SOL
+amounts, formatted times) computed on demand, and account keys as small
+integer ids into a ``PubkeyTable``. Comparing two keys is then an integer
+compare, and each distinct pubkey is stored once, as its base58 string and
+its 32 raw bytes.
+
+Records convert to and from the dicts the output files hold (``to_dict``,
+``from_dict``).
+"""
+import base58
+
+from .extract import LAMPORTS_PER_SOL, format_timestamp
+
+PUBKEY_SIZE = 32
+UNKNOWN_KEY = -1
+
+
+class PubkeyTable:
+    """Interns base58 pubkeys as small integer ids.
+
+    Ids are assigned in first-seen order, so ``raw_bytes()`` is a packed
+    array of 32-byte keys indexed by id.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self._keys = []
+        self._raw = bytearray()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self.ids
+
+    def intern(self, key):
+        """Id of a base58 pubkey, adding it on first sight"""
+        key_id = self.ids.get(key)
+        if key_id is None:
+            raw = base58.b58decode(key)
+            if len(raw) != PUBKEY_SIZE:
+                raise ValueError(f"{key!r} is not a {PUBKEY_SIZE}-byte base58 pubkey")
+            key_id = self.ids[key] = len(self._keys)
+            self._keys.append(key)
+            self._raw += raw
+        return key_id
+
+    def get(self, key, default=UNKNOWN_KEY):
+        """Id of a pubkey already interned, without adding it"""
+        return self.ids.get(key, default)
+
+    def key(self, key_id):
+        """Base58 pubkey of an id"""
+        return self._keys[key_id]
+
+    def raw(self, key_id):
+        """32 raw bytes of an id"""
+        return bytes(self._raw[key_id * PUBKEY_SIZE:(key_id + 1) * PUBKEY_SIZE])
+
+    def raw_bytes(self):
+        """Every interned key's raw bytes, packed in id order"""
+        return bytes(self._raw)
+
+
+# Shared by every record in the process, so ids are comparable across scans
+PUBKEYS = PubkeyTable()
+
+
+def _intern_key(key, pubkeys, placeholders):
+    return UNKNOWN_KEY if key is None or key in placeholders else pubkeys.intern(key)
+
+
+class Transfer:
+    """A treasury balance change, as in ``sol_transfers.json``"""
+
+    __slots__ = ("signature", "timestamp", "lamports", "counterparty", "is_system_transfer", "description")
+
+    # Descriptions repeat per counterparty and amount, so each distinct one is kept once
+    _descriptions = {}
+
+    def __init__(self, signature, timestamp, lamports, counterparty=UNKNOWN_KEY, is_system_transfer=False,
+                 description=""):
+        self.signature = signature
+        self.timestamp = timestamp
+        self.lamports = lamports
+        self.counterparty = counterparty
+        self.is_system_transfer = is_system_transfer
+        self.description = self._descriptions.setdefault(description, description)
+
+    @classmethod
+    def from_dict(cls, record, pubkeys=PUBKEYS):
+        # Files written before counterparty was recorded for both directions name the sender
+        return cls(record["signature"], record["timestamp"], round(record["balance_change"] * LAMPORTS_PER_SOL),
+                   _intern_key(record.get("counterparty", record.get("sender")), pubkeys, ("Unknown",)),
+                   record.get("is_system_transfer", False), record.get("description", ""))
+
+    @property
+    def balance_change(self):
+        return self.lamports / LAMPORTS_PER_SOL
+
+    def to_dict(self, pubkeys=PUBKEYS):
+        return {
+            "timestamp": self.timestamp,
+            "formatted_time": format_timestamp(self.timestamp),
+            "signature": self.signature,
+            "balance_change": self.balance_change,
+            "counterparty": "Unknown" if self.counterparty == UNKNOWN_KEY else pubkeys.key(self.counterparty),
+            "is_system_transfer": self.is_system_transfer,
+            "description": self.description
+        }
+
+
+class Contribution:
+    """An incoming transfer to the treasury, as in ``all_incoming_txs.json``"""
+
+    __slots__ = ("signature", "timestamp", "lamports", "sender")
+
+    def __init__(self, signature, timestamp, lamports, sender=UNKNOWN_KEY):
+        self.signature = signature
+        self.timestamp = timestamp
+        self.lamports = lamports
+        self.sender = sender
+
+    @classmethod
+    def from_dict(cls, record, pubkeys=PUBKEYS):
+        return cls(record["signature"], record.get("timestamp"), round(record["amount"] * LAMPORTS_PER_SOL),
+                   _intern_key(record.get("sender"), pubkeys, ("unknown",)))
+
+    @property
+    def amount(self):
+        return self.lamports / LAMPORTS_PER_SOL
+
+    def to_dict(self, pubkeys=PUBKEYS):
+        return {
+            "sender": "unknown" if self.sender == UNKNOWN_KEY else pubkeys.key(self.sender),
+            "amount": self.amount,
+            "time": format_timestamp(self.timestamp) if self.timestamp else "unknown",
+            "timestamp": self.timestamp,
+            "signature": self.signature
+        }
+
+
+class SignatureRecord:
+    """One ``getSignaturesForAddress`` entry, as the signatures command lists it"""
+
+    __slots__ = ("signature", "slot", "block_time", "success")
+
+    def __init__(self, signature, slot, block_time=None, success=True):
+        self.signature = signature
+        self.slot = slot
+        self.block_time = block_time
+        self.success = success
+
+    @classmethod
+    def from_entry(cls, entry):
+        return cls(entry["signature"], entry["slot"], entry.get("blockTime"), entry.get("err") is None)
+
+    def to_dict(self):
+        return {"signature": self.signature, "slot": self.slot, "block_time": self.block_time,
+                "success": self.success}
+
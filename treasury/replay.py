@@ -0,0 +1,192 @@
+"""Offline replay of extractors over saved transactions.
+
+The scanners only run their extractors inline with network fetches, so a
+fix to the extraction logic used to mean downloading every transaction
+again. A ``Replay`` runs an extractor over what is already on disk:
+
+    txns.json, txns.ndjson     {"signature", "data"} records (``dump --format full``)
+    all_raw_txs.json, .ndjson  {"signature", "block_time", "full_data"} records (``dump --format raw``)
+    .tx_cache.sqlite3          the transaction cache (see ``cache``), in any stored encoding
+
+Dumps may be compressed or legacy JSON arrays, as ``ndjson`` reads them.
+The main process only reads lines and cache rows and hands them out in
+chunks to a process pool; the workers parse, decode, pre-filter and
+extract. Results come back in input order, and a signature found in more
+than one source is replayed once.
+
+    replay = Replay(["txns.ndjson", CACHE_PATH], extract)
+    for sig_data, record in replay.run():
+        ...
+"""
+import copy
+import json
+import os
+import sqlite3
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .binary import decode_transaction
+from .cache import CACHEABLE_COMMITMENT
+from .filters import SignatureFilter
+from .ndjson import iter_lines
+
+# Dump lines or cache rows per chunk handed to a worker
+CHUNK_SIZE = 256
+# Chunks queued per worker, so reading stays ahead of the pool without holding the whole dump
+CHUNKS_AHEAD = 4
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+
+def is_cache(path):
+    """Whether a file is a transaction cache rather than a dump"""
+    with open(path, "rb") as f:
+        return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+
+
+def iter_items(path):
+    """Undecoded transactions of a dump or cache: NDJSON lines, array records or cache rows"""
+    if is_cache(path):
+        yield from _cache_rows(path)
+    else:
+        yield from iter_lines(path)
+
+
+def _cache_rows(path):
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        yield from db.execute("SELECT signature, encoding, payload FROM transactions WHERE commitment = ?",
+                              (CACHEABLE_COMMITMENT,))
+    finally:
+        db.close()
+
+
+def load_transaction(item):
+    """(signature entry, transaction) for an item of ``iter_items``, or (None, None) if it holds none.
+
+    The entry has the fields of a getSignaturesForAddress entry, so the
+    pre-filter and the extractors see what the online scanners pass them.
+    """
+    block_time = None
+    try:
+        if isinstance(item, tuple):
+            signature, _, payload = item
+            tx_data = json.loads(zlib.decompress(payload))
+        else:
+            record = json.loads(item) if isinstance(item, str) else item
+            if not isinstance(record, dict):
+                return None, None
+            signature, block_time = record.get("signature"), record.get("block_time")
+            tx_data = record.get("data")
+            if tx_data is None and "full_data" in record:
+                tx_data = json.loads(record["full_data"])
+    except (ValueError, zlib.error):
+        # Blank lines and the half-written last line of a crashed dump
+        return None, None
+    if not signature or not isinstance(tx_data, dict) or not tx_data.get("meta"):
+        # Compact dumps keep balances only, not a transaction to extract from
+        return None, None
+
+    tx_data = decode_transaction(tx_data)
+    entry = {
+        "signature": signature,
+        "slot": tx_data.get("slot"),
+        "blockTime": tx_data.get("blockTime", block_time),
+        "err": tx_data["meta"].get("err"),
+    }
+    return entry, tx_data
+
+
+def replay_chunk(extract, signature_filter, chunk):
+    """(entry, record) for every item of a chunk; runs in the worker processes"""
+    results = []
+    for item in chunk:
+        entry, tx_data = load_transaction(item)
+        record = None
+        if entry is not None and signature_filter.apply([entry]):
+            record = extract(entry, tx_data)
+        results.append((entry, record))
+    return results
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class Replay:
+    """Run ``extract(sig_data, tx_data)`` over saved transactions on ``workers`` processes.
+
+    ``extract`` must be a module-level function so the workers can unpickle
+    it. ``signature_filter`` applies as in the online scanners, so failed
+    transactions are skipped unless it says otherwise. With ``workers=1``
+    everything runs in this process.
+    """
+
+    def __init__(self, sources, extract, signature_filter=None, workers=None, chunk_size=CHUNK_SIZE):
+        self.sources = list(sources)
+        self.extract = extract
+        self.signature_filter = signature_filter or SignatureFilter()
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+        self.transactions = 0
+        self.duplicates = 0
+        self.unreadable = 0
+        self.records = 0
+        self._seen = set()
+
+    def run(self):
+        """Yield (sig_data, record) for every transaction the extractor returned a record for, in source order"""
+        chunks = _chunks((item for path in self.sources for item in iter_items(path)), self.chunk_size)
+        # The workers' filter decides, this one counts (see _collect)
+        work = partial(replay_chunk, self.extract, copy.copy(self.signature_filter))
+        if self.workers == 1:
+            results = map(work, chunks)
+            yield from self._collect(results)
+            return
+        with ProcessPoolExecutor(self.workers) as pool:
+            yield from self._collect(self._ordered(pool, work, chunks))
+
+    def _ordered(self, pool, work, chunks):
+        """Chunk results in submission order, with a bounded number of chunks in flight"""
+        pending = deque()
+        try:
+            for chunk in chunks:
+                pending.append(pool.submit(work, chunk))
+                if len(pending) >= self.workers * CHUNKS_AHEAD:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _collect(self, results):
+        for chunk in results:
+            for entry, record in chunk:
+                if entry is None:
+                    self.unreadable += 1
+                    continue
+                if entry["signature"] in self._seen:
+                    self.duplicates += 1
+                    continue
+                self._seen.add(entry["signature"])
+                self.transactions += 1
+                self.signature_filter.apply([entry])
+                if record:
+                    self.records += 1
+                    yield entry, record
+
+    def summary(self):
+        return (f"Replayed {self.transactions} transactions from {len(self.sources)} source(s) into "
+                f"{self.records} records ({self.duplicates} duplicates, {self.unreadable} entries without a "
+                f"readable transaction)")
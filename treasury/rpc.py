@@ -0,0 +1,504 @@
+"""Pooled asyncio Solana JSON-RPC client shared by the treasury scanners.
+
+Every scanner used to call ``requests.post`` per request, opening a new TLS
+connection each time and sleeping between calls. ``RpcClient`` keeps one
+aiohttp session with keep-alive connection pools per endpoint and bounds the
+number of in-flight requests with a semaphore instead. Bulk lookups go out as
+JSON-RPC batch arrays (``call_batch``), so a backfill costs one POST per
+``RPC_BATCH_SIZE`` transactions rather than one per signature. Transaction
+lookups consult the on-disk ``TransactionCache`` first, so re-running over
+history we already have does not touch the network. Every request is routed by
+an ``EndpointPool`` to the healthiest configured endpoint, so throughput adds
+up across providers instead of failing over one URL at a time.
+
+Identical requests are single-flight: a call, or a transaction lookup, made
+while the same one is already in flight waits for that request and shares its
+decoded result instead of going out again. ``getBalance`` results are also
+reused for ``RPC_MEMO_TTL`` seconds. Shared results are the same objects, so
+callers must not modify them.
+
+``get_transactions(..., slim=True)`` decodes responses against the schemas in
+``schema``, materializing only the fields the extractors read.
+
+    async with RpcClient() as client:
+        balance = await client.get_balance(TREASURY_WALLET)
+"""
+import asyncio
+import json
+import time
+
+import aiohttp
+
+from .cache import CACHEABLE_COMMITMENT, TransactionCache
+from .config import RPC_BATCH_SIZE, RPC_CONCURRENCY, RPC_MEMO_TTL, RPC_TIMEOUT, rpc_urls
+from .endpoints import EndpointPool, backoff_delay
+from .metrics import (CACHE_LOOKUPS, RPC_BYTES, RPC_COALESCED, RPC_LATENCY, RPC_REQUESTS, RPC_RETRIES,
+                      endpoint_label)
+from .ratelimit import parse_retry_after
+from .schema import reply_decoder, result_decoder
+
+# HTTP statuses providers use to refuse an oversized batch
+BATCH_REJECT_STATUSES = {400, 413}
+# JSON-RPC error codes that mean the node, not the request, is at fault
+NODE_ERROR_CODES = {-32005, -32603}
+# JSON-RPC error codes providers use for rate limiting
+THROTTLE_CODES = {429, -32429}
+# Reads whose answer moves with the chain head, briefly reused instead of re-sent
+MEMO_METHODS = {"getBalance"}
+# Expired memo entries are pruned once the memo grows past this many
+MEMO_LIMIT = 1024
+
+
+class RpcError(Exception):
+    """Raised when a request failed on every configured endpoint."""
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+class _Flight:
+    """An in-flight request shared by every caller that asks for the same thing.
+
+    Each caller awaits it through a shield, so one caller being cancelled
+    does not cancel the request under the others; it is cancelled once no
+    caller is left waiting.
+    """
+
+    def __init__(self, coro):
+        self.task = asyncio.ensure_future(coro)
+        self.waiters = 0
+
+    def wait(self):
+        # Count the caller now, not when the coroutine first runs
+        self.waiters += 1
+        return self._wait()
+
+    async def _wait(self):
+        try:
+            return await asyncio.shield(self.task)
+        finally:
+            self.waiters -= 1
+            if not self.waiters and not self.task.done():
+                self.task.cancel()
+
+
+class RpcClient:
+    """Solana JSON-RPC client with keep-alive pools and a concurrency limit"""
+
+    def __init__(self, urls=None, concurrency=RPC_CONCURRENCY, timeout=RPC_TIMEOUT,
+                 batch_size=RPC_BATCH_SIZE, cache=True, memo_ttl=RPC_MEMO_TTL):
+        self.urls = list(urls or rpc_urls())
+        self.pool = EndpointPool(self.urls)
+        self.max_attempts = len(self.urls) + 2
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.batch_size = batch_size
+        # Largest batch each endpoint has accepted, learned from rejections
+        self._batch_limits = {}
+        # True opens the default on-disk cache, a TransactionCache is used as-is
+        self._cache_option = cache
+        self.cache = None
+        self._session = None
+        self._semaphore = None
+        self._next_id = 0
+        self.memo_ttl = memo_ttl
+        # Request key -> _Flight for calls and transaction lookups in progress
+        self._inflight = {}
+        # Request key -> (expiry, result) for MEMO_METHODS
+        self._memo = {}
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.concurrency,
+            keepalive_timeout=60,
+            ttl_dns_cache=300
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers={"Content-Type": "application/json"},
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        if self._cache_option is True:
+            self.cache = TransactionCache()
+        elif self._cache_option:
+            self.cache = self._cache_option
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+        self._session = None
+        if self._cache_option is True:
+            self.cache.close()
+        self.cache = None
+
+    def ws_connect(self, url, **kwargs):
+        """Open a WebSocket (PubSub) connection on the client's session"""
+        return self._session.ws_connect(url, **kwargs)
+
+    def _payload(self, method, params):
+        self._next_id += 1
+        return {
+            "jsonrpc": "2.0",
+            "id": self._next_id,
+            "method": method,
+            "params": params if params is not None else []
+        }
+
+    async def _post(self, url, payload):
+        """POST one payload to one endpoint and return the raw response body"""
+        async with self._semaphore:
+            async with self._session.post(url, json=payload) as response:
+                response.raise_for_status()
+                return await response.read()
+
+    async def _send(self, endpoint, payload, method=None, decode=json.loads):
+        """Send a payload to an acquired endpoint and release it with the outcome.
+
+        Transport failures are recorded against the endpoint's health and
+        re-raised; rate-limit responses slow the endpoint's rate down instead.
+        The response body is parsed with ``decode``.
+        """
+        started = time.monotonic()
+        labels = {"method": method or payload.get("method"), "endpoint": endpoint_label(endpoint.url)}
+        try:
+            raw = await self._post(endpoint.url, payload)
+        except aiohttp.ClientResponseError as e:
+            RPC_REQUESTS.inc(outcome="throttled" if e.status == 429 else f"http_{e.status}", **labels)
+            if e.status == 429:
+                retry_after = parse_retry_after((e.headers or {}).get("Retry-After"))
+                self.pool.release(endpoint, method, throttled=True, retry_after=retry_after)
+            else:
+                # A refused batch says nothing about the endpoint's health
+                self.pool.release(endpoint, method, time.monotonic() - started,
+                                  failed=e.status not in BATCH_REJECT_STATUSES)
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            RPC_REQUESTS.inc(outcome="timeout" if isinstance(e, asyncio.TimeoutError) else "transport_error", **labels)
+            self.pool.release(endpoint, method, failed=True)
+            raise
+
+        latency = time.monotonic() - started
+        RPC_BYTES.inc(len(raw), **labels)
+        try:
+            body = decode(raw)
+        except ValueError:
+            RPC_REQUESTS.inc(outcome="bad_response", **labels)
+            self.pool.release(endpoint, method, failed=True)
+            raise aiohttp.ClientPayloadError(f"Undecodable response from {endpoint.url}") from None
+
+        items = body if isinstance(body, list) else [body]
+        errors = [item["error"] for item in items if isinstance(item, dict) and isinstance(item.get("error"), dict)]
+        if any(is_throttle_error(error) for error in errors):
+            RPC_REQUESTS.inc(outcome="throttled", **labels)
+            self.pool.release(endpoint, method, throttled=True)
+        else:
+            node_error = any(error.get("code") in NODE_ERROR_CODES for error in errors)
+            RPC_REQUESTS.inc(outcome="node_error" if node_error else "error" if errors else "ok", **labels)
+            RPC_LATENCY.observe(latency, **labels)
+            self.pool.release(endpoint, method, latency, failed=node_error)
+        return body
+
+    async def call(self, method, params=None, slim=False):
+        """Make a request, sharing the result of an identical one already in flight.
+
+        With ``slim`` a getTransaction result is decoded to its slim fields only.
+        """
+        key = (method, json.dumps(params, sort_keys=True), slim)
+        if method in MEMO_METHODS and key in self._memo:
+            expires, result = self._memo[key]
+            if expires > time.monotonic():
+                RPC_COALESCED.inc(method=method, source="memo")
+                return result
+            del self._memo[key]
+
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = self._inflight[key] = _Flight(self._call(method, params, slim))
+            flight.task.add_done_callback(lambda task: self._landed(key, flight))
+        else:
+            RPC_COALESCED.inc(method=method, source="inflight")
+        return await flight.wait()
+
+    def _landed(self, key, flight):
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        task = flight.task
+        if key[0] in MEMO_METHODS and self.memo_ttl > 0 and not task.cancelled() and task.exception() is None:
+            now = time.monotonic()
+            if len(self._memo) >= MEMO_LIMIT:
+                self._memo = {k: entry for k, entry in self._memo.items() if entry[0] > now}
+            self._memo[key] = (now + self.memo_ttl, task.result())
+
+    async def _call(self, method, params, slim=False):
+        """Make a request on the healthiest endpoint, retrying elsewhere on failure"""
+        payload = self._payload(method, params)
+        decode = reply_decoder() if slim else json.loads
+        tried = set()
+        last_error = None
+
+        for attempt in range(self.max_attempts):
+            if attempt:
+                RPC_RETRIES.inc(method=method)
+            endpoint = await self.pool.acquire(method, exclude=tried)
+            try:
+                body = await self._send(endpoint, payload, method, decode)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"Exception calling RPC ({endpoint.url}): {e}")
+                last_error = e
+                tried.add(endpoint.url)
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+
+            if "error" in body:
+                print(f"Error from RPC ({endpoint.url}): {body['error']}")
+                last_error = RpcError(body["error"].get("message"), body["error"].get("code"))
+                tried.add(endpoint.url)
+                if is_throttle_error(body["error"]) or last_error.code in NODE_ERROR_CODES:
+                    await asyncio.sleep(backoff_delay(attempt))
+                elif len(tried) >= len(self.urls):
+                    break  # Every provider gave the same answer
+                continue
+
+            return body.get("result")
+
+        raise RpcError(f"All RPC attempts failed for {method}: {last_error}",
+                       getattr(last_error, "code", None))
+
+    async def call_batch(self, calls, slim=False):
+        """Send (method, params) pairs as JSON-RPC batches.
+
+        Results come back in input order. An item that still fails after being
+        retried on its own holds the ``RpcError`` instead of a result.
+        """
+        results = [None] * len(calls)
+        indexes = list(range(len(calls)))
+        chunks = [indexes[i:i + self.batch_size] for i in range(0, len(indexes), self.batch_size)]
+        await asyncio.gather(*(self._run_batch(calls, chunk, results, slim) for chunk in chunks))
+        return results
+
+    async def _run_batch(self, calls, indexes, results, slim=False):
+        """Send one chunk of a batch, splitting it if a provider rejects its size"""
+        retry = indexes
+        tried = set()
+        # Batches get their own rate state: their latency is not comparable to single calls
+        method = f"{calls[indexes[0]][0]}[batch]"
+
+        for attempt in range(self.max_attempts):
+            if attempt:
+                RPC_RETRIES.inc(method=method)
+            # Providers rate-limit per HTTP request, so a batch costs one token
+            endpoint = await self.pool.acquire(method, exclude=tried)
+            limit = self._batch_limits.get(endpoint.url)
+            if limit and len(indexes) > limit:
+                # This provider is known to refuse batches this large
+                self.pool.cancel(endpoint, method)
+                await self._split_batch(calls, indexes, results, limit, slim)
+                return
+
+            payloads = [self._payload(*calls[i]) for i in indexes]
+            try:
+                body = await self._send(endpoint, payloads, method, reply_decoder() if slim else json.loads)
+            except aiohttp.ClientResponseError as e:
+                if e.status in BATCH_REJECT_STATUSES and len(indexes) > 1:
+                    size = self._shrink_batch(endpoint.url, len(indexes))
+                    await self._split_batch(calls, indexes, results, size, slim)
+                    return
+                print(f"Exception calling RPC ({endpoint.url}): {e}")
+                tried.add(endpoint.url)
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"Exception calling RPC ({endpoint.url}): {e}")
+                tried.add(endpoint.url)
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+
+            if not isinstance(body, list):
+                tried.add(endpoint.url)
+                if is_throttle_error(body.get("error") or {}):
+                    await asyncio.sleep(backoff_delay(attempt))
+                    continue
+
+                # A single error object in place of the array means the batch was refused
+                print(f"Batch of {len(indexes)} rejected by RPC ({endpoint.url}): {body.get('error')}")
+                if len(indexes) > 1:
+                    size = self._shrink_batch(endpoint.url, len(indexes))
+                    await self._split_batch(calls, indexes, results, size, slim)
+                    return
+                continue
+
+            responses = {item.get("id"): item for item in body if isinstance(item, dict)}
+            retry = []
+            for i, payload in zip(indexes, payloads):
+                response = responses.get(payload["id"])
+                if response is None or "error" in response:
+                    retry.append(i)
+                else:
+                    results[i] = response.get("result")
+            break
+
+        # Items missing from the batch response, or that errored, are retried one by one
+        if retry:
+            RPC_RETRIES.inc(len(retry), method=method)
+        await asyncio.gather(*(self._call_item(calls, i, results, slim) for i in retry))
+
+    async def _split_batch(self, calls, indexes, results, size, slim=False):
+        chunks = [indexes[i:i + size] for i in range(0, len(indexes), size)]
+        await asyncio.gather(*(self._run_batch(calls, chunk, results, slim) for chunk in chunks))
+
+    async def _call_item(self, calls, index, results, slim=False):
+        try:
+            results[index] = await self.call(*calls[index], slim=slim)
+        except RpcError as e:
+            results[index] = e
+
+    def _shrink_batch(self, url, size):
+        """Lower the batch size an endpoint accepts below a refused size and return it"""
+        limit = max(1, size // 2)
+        self._batch_limits[url] = min(limit, self._batch_limits.get(url, limit))
+        print(f"Reducing batch size for {url} to {self._batch_limits[url]}")
+        return self._batch_limits[url]
+
+    async def get_balance(self, address):
+        """Get the balance of an address in lamports"""
+        result = await self.call("getBalance", [address])
+        return result["value"]
+
+    async def get_signatures(self, address, before=None, until=None, limit=1000, commitment=None):
+        """Get one page of signatures for an address, newest first"""
+        options = {"limit": limit}
+        if before:
+            options["before"] = before
+        if until:
+            options["until"] = until
+        if commitment:
+            options["commitment"] = commitment
+        return await self.call("getSignaturesForAddress", [address, options]) or []
+
+    async def iter_signatures(self, address, before=None, until=None, limit=1000, max_pages=None, commitment=None):
+        """Page backwards through an address's signatures, yielding one page at a time"""
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            batch = await self.get_signatures(address, before=before, until=until, limit=limit,
+                                              commitment=commitment)
+            if not batch:
+                break
+
+            pages += 1
+            yield batch
+
+            if len(batch) < limit:  # No more signatures to fetch
+                break
+            before = batch[-1]["signature"]
+
+    async def get_transaction(self, signature, encoding="jsonParsed", commitment=CACHEABLE_COMMITMENT):
+        """Get detailed transaction data"""
+        results = await self.get_transactions([signature], encoding, commitment)
+        return results[0]
+
+    async def get_transactions(self, signatures, encoding="jsonParsed", commitment=CACHEABLE_COMMITMENT, slim=False):
+        """Fetch many transactions, cache first, then in batches.
+
+        Results keep input order, with None for failed or unknown signatures.
+        With ``slim`` only the fields in ``schema`` are decoded; slim results
+        are cached apart from full ones, and a full cached copy serves a slim
+        lookup too.
+        """
+        cached = {}
+        if self.cache:
+            cached = self.cache.get_many(signatures, slim_encoding(encoding) if slim else encoding, commitment,
+                                         result_decoder() if slim else json.loads)
+            if slim:
+                unseen = [signature for signature in signatures if signature not in cached]
+                cached.update(self.cache.get_many(unseen, encoding, commitment, result_decoder()))
+        missing = [signature for signature in dict.fromkeys(signatures) if signature not in cached]
+        if self.cache:
+            CACHE_LOOKUPS.inc(len(cached), result="hit")
+            CACHE_LOOKUPS.inc(len(missing), result="miss")
+
+        # Signatures another caller is already fetching are waited for, not requested again
+        flights = {}
+        new = []
+        for signature in missing:
+            flight = self._inflight.get(("getTransaction", signature, encoding, commitment, slim))
+            if flight is None:
+                new.append(signature)
+            else:
+                flights[flight] = None
+        if len(new) < len(missing):
+            RPC_COALESCED.inc(len(missing) - len(new), method="getTransaction", source="inflight")
+        if new:
+            keys = [("getTransaction", signature, encoding, commitment, slim) for signature in new]
+            flight = _Flight(self._fetch_transactions(new, encoding, commitment, slim))
+            for key in keys:
+                self._inflight[key] = flight
+            flight.task.add_done_callback(lambda task: self._landed_many(keys, flight))
+            flights[flight] = None
+
+        fetched = {}
+        for results in await asyncio.gather(*(flight.wait() for flight in flights)):
+            fetched.update(results)
+        return [cached.get(signature) or fetched.get(signature) for signature in signatures]
+
+    async def _fetch_transactions(self, signatures, encoding, commitment, slim=False):
+        """Fetch uncached transactions in batches and cache them; return signature -> transaction"""
+        calls = [("getTransaction", transaction_params(signature, encoding, commitment)) for signature in signatures]
+        fetched = {}
+        for signature, result in zip(signatures, await self.call_batch(calls, slim)):
+            if isinstance(result, RpcError):
+                print(f"Error fetching transaction {signature}: {result}")
+                continue
+            fetched[signature] = result
+
+        if self.cache and fetched:
+            self.cache.put_many(fetched.items(), slim_encoding(encoding) if slim else encoding, commitment)
+        return fetched
+
+    def _landed_many(self, keys, flight):
+        for key in keys:
+            if self._inflight.get(key) is flight:
+                del self._inflight[key]
+
+    async def iter_transactions(self, signatures, encoding="jsonParsed", commitment=CACHEABLE_COMMITMENT):
+        """Yield (signature, transaction) pairs chunk by chunk as each batch completes.
+
+        At most ``concurrency`` chunks are in flight, so memory stays bounded
+        and a consumer can write results out while the rest are fetched.
+        Pairs come in completion order; failed lookups yield None.
+        """
+        chunks = [signatures[start:start + self.batch_size] for start in range(0, len(signatures), self.batch_size)]
+        pending = {}
+        next_chunk = 0
+        try:
+            while next_chunk < len(chunks) or pending:
+                while next_chunk < len(chunks) and len(pending) < self.concurrency:
+                    chunk = chunks[next_chunk]
+                    pending[asyncio.ensure_future(self.get_transactions(chunk, encoding, commitment))] = chunk
+                    next_chunk += 1
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    chunk = pending.pop(task)
+                    for pair in zip(chunk, task.result()):
+                        yield pair
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def is_throttle_error(error):
+    """Whether a JSON-RPC error object is a rate-limit response"""
+    message = str(error.get("message", "")).lower()
+    return error.get("code") in THROTTLE_CODES or "too many requests" in message or "rate limit" in message
+
+
+def slim_encoding(encoding):
+    """Cache key encoding for slim transactions, so they never stand in for full ones"""
+    return f"{encoding}/slim"
+
+
+def transaction_params(signature, encoding="jsonParsed", commitment=CACHEABLE_COMMITMENT):
+    """Build getTransaction params"""
+    return [signature, {"encoding": encoding, "commitment": commitment, "maxSupportedTransactionVersion": 0}]
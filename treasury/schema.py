@@ -0,0 +1,107 @@
+"""Partial decoding of getTransaction responses with msgspec.
+
+``json.loads`` builds a full dict tree for every transaction in a batch
+response: each log line, instruction, inner instruction, token balance and
+reward. The extractors only read the balances, fee, error, account keys,
+parsed instructions and which programs ran. The ``TypedDict`` schemas below
+list exactly those fields; msgspec decodes the response bytes against them in one pass and
+skips everything else without materializing it, so a "slim" transaction is an
+ordinary dict of the same shape with the unused fields missing:
+
+    meta          err, fee, preBalances, postBalances, loadedAddresses,
+                  innerInstructions (program ids only)
+    transaction   signatures; message accountKeys (pubkey only), recentBlockhash,
+                  instructions (program, programId, parsed), or the base64 pair
+
+Log messages are left out: they are usually the largest field, and
+``extract.describe_transfer`` reads the invoked programs from the instructions
+when a transaction has no logs.
+
+msgspec is optional: without it ``reply_decoder`` and ``result_decoder``
+return ``json.loads`` and slim requests simply get full transactions.
+"""
+import json
+from typing import Any, Dict, List, Optional, TypedDict, Union
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class AccountKey(TypedDict, total=False):
+    pubkey: str
+
+
+class Instruction(TypedDict, total=False):
+    program: str
+    programId: str
+    parsed: Any
+
+
+class Message(TypedDict, total=False):
+    # Plain strings with "json" encoding, {"pubkey", ...} objects with jsonParsed
+    accountKeys: List[Union[str, AccountKey]]
+    recentBlockhash: str
+    instructions: List[Instruction]
+
+
+class Transaction(TypedDict, total=False):
+    signatures: List[str]
+    message: Message
+
+
+class InnerInstruction(TypedDict, total=False):
+    # jsonParsed names the program, the json and binary encodings index it
+    programId: str
+    programIdIndex: int
+
+
+class InnerInstructions(TypedDict, total=False):
+    index: int
+    instructions: List[InnerInstruction]
+
+
+class Meta(TypedDict, total=False):
+    err: Any
+    fee: int
+    preBalances: List[int]
+    postBalances: List[int]
+    innerInstructions: Optional[List[InnerInstructions]]
+    loadedAddresses: Dict[str, List[str]]
+
+
+class SlimTransaction(TypedDict, total=False):
+    slot: int
+    blockTime: Optional[int]
+    version: Any
+    meta: Optional[Meta]
+    # [data, encoding] for binary encodings (see ``binary``)
+    transaction: Union[List[str], Transaction]
+
+
+class Reply(TypedDict, total=False):
+    id: Any
+    result: Optional[SlimTransaction]
+    error: Dict[str, Any]
+
+
+_decoders = {}
+
+
+def _decoder(name, schema):
+    if msgspec is None:
+        return json.loads
+    if name not in _decoders:
+        _decoders[name] = msgspec.json.Decoder(schema).decode
+    return _decoders[name]
+
+
+def reply_decoder():
+    """Decode a getTransaction response body, single or batched, keeping only the slim fields"""
+    return _decoder("reply", Union[List[Reply], Reply])
+
+
+def result_decoder():
+    """Decode one stored transaction (see ``cache``) down to its slim fields"""
+    return _decoder("result", Optional[SlimTransaction])
@@ -0,0 +1,243 @@
+"""Bulk loading of contributions into the presale database.
+
+The JS import scripts insert ``public.contributions`` one row per request
+and bump ``distribution_records`` through ``update_distribution_record`` one
+call per contribution. A ``ContributionSink`` buffers contributions and
+loads each batch in a single transaction instead:
+
+1. the batch is copied into a temporary staging table (``COPY`` on Postgres),
+2. new rows are inserted into ``contributions``; a ``transaction_id``
+   already there is left as it is, so reloading a contribution never counts
+   it twice or moves its ``created_at``, and
+3. ``distribution_records.total_contributed`` is recomputed, in one
+   statement, for every wallet in the batch from the contributions table.
+
+Batches are flushed once ``batch_rows`` contributions are buffered or the
+oldest has waited ``flush_interval`` seconds, so the same sink serves a
+bulk load of the whole ledger and the live monitor's trickle.
+
+``open_sink(url)`` takes a ``postgresql://`` URL (needs psycopg) or a
+``sqlite:///path`` one. The SQLite stand-in creates the two tables with the
+columns and constraints of ``sql/schema.sql`` and runs the same steps, for
+trying the loader without a Postgres server.
+"""
+import abc
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+DATABASE_URL = os.environ.get("TREASURY_DATABASE_URL")
+BATCH_ROWS = 500
+FLUSH_INTERVAL = 2.0
+
+STAGING_COLUMNS = ("wallet_address", "amount", "transaction_id", "created_at")
+
+
+def _psycopg():
+    try:
+        import psycopg
+    except ImportError:
+        raise RuntimeError("loading into Postgres needs the psycopg package (pip install 'psycopg[binary]')") from None
+    return psycopg
+
+
+class ContributionSink(abc.ABC):
+    """Buffer contributions and load them into the database in batches.
+
+    A batch that fails to load stays buffered and is retried by the next
+    flush; ``errors`` holds the driver's exception types for callers that
+    keep running through a database outage.
+    """
+
+    errors = ()
+
+    def __init__(self, batch_rows=BATCH_ROWS, flush_interval=FLUSH_INTERVAL):
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.loaded = 0
+        self.batches = 0
+        self._rows = {}  # transaction_id -> staging row, so a batch never holds a signature twice
+        self._first_buffered = None
+
+    def add(self, signature, sender, lamports, timestamp=None):
+        """Buffer a contribution, flushing if the batch is due"""
+        if not self._rows:
+            self._first_buffered = time.monotonic()
+        created_at = datetime.fromtimestamp(timestamp, timezone.utc) if timestamp else None
+        self._rows[signature] = (sender, Decimal(lamports).scaleb(-9), signature, created_at)
+        if self.due():
+            self.flush()
+
+    def due(self):
+        return bool(self._rows) and (len(self._rows) >= self.batch_rows
+                                     or time.monotonic() - self._first_buffered >= self.flush_interval)
+
+    @property
+    def pending(self):
+        """Contributions buffered but not loaded yet"""
+        return len(self._rows)
+
+    def flush(self):
+        """Load the buffered contributions in one transaction; return how many there were"""
+        if not self._rows:
+            return 0
+        rows = list(self._rows.values())
+        self._load(rows)
+        self._rows.clear()
+        self.loaded += len(rows)
+        self.batches += 1
+        return len(rows)
+
+    @abc.abstractmethod
+    def _load(self, rows):
+        """Load staging rows into the database in one transaction"""
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._close()
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PostgresSink(ContributionSink):
+    """Load into the ``public`` tables of ``sql/schema.sql`` with COPY"""
+
+    STAGING = """
+        CREATE TEMP TABLE IF NOT EXISTS contribution_staging (
+            wallet_address TEXT NOT NULL,
+            amount NUMERIC(20, 9) NOT NULL,
+            transaction_id TEXT NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE
+        ) ON COMMIT DELETE ROWS
+    """
+    COPY = f"COPY contribution_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN"
+    INSERT = """
+        INSERT INTO public.contributions (wallet_address, amount, transaction_id, created_at)
+        SELECT wallet_address, amount, transaction_id, COALESCE(created_at, NOW()) FROM contribution_staging
+        ON CONFLICT (transaction_id) DO NOTHING
+    """
+    RECOMPUTE = """
+        INSERT INTO public.distribution_records AS d (wallet_address, total_contributed, updated_at)
+        SELECT wallet_address, SUM(amount), NOW() FROM public.contributions
+        WHERE wallet_address IN (SELECT wallet_address FROM contribution_staging)
+        GROUP BY wallet_address
+        ON CONFLICT (wallet_address) DO UPDATE
+        SET total_contributed = EXCLUDED.total_contributed, updated_at = EXCLUDED.updated_at
+        WHERE d.total_contributed IS DISTINCT FROM EXCLUDED.total_contributed
+    """
+
+    def __init__(self, url, **options):
+        super().__init__(**options)
+        # Autocommit, so each batch's transaction block is a real BEGIN/COMMIT
+        psycopg = _psycopg()
+        self.errors = (psycopg.Error,)
+        self.connection = psycopg.connect(url, autocommit=True)
+        self.connection.execute(self.STAGING)
+
+    def _load(self, rows):
+        with self.connection.transaction():
+            with self.connection.cursor() as cursor:
+                with cursor.copy(self.COPY) as copy:
+                    for row in rows:
+                        copy.write_row(row)
+                cursor.execute(self.INSERT)
+                cursor.execute(self.RECOMPUTE)
+
+    def _close(self):
+        self.connection.close()
+
+
+class SqliteSink(ContributionSink):
+    """Stand-in with the same tables and load steps in a SQLite file"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS contributions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            wallet_address TEXT NOT NULL,
+            amount NUMERIC NOT NULL,
+            transaction_id TEXT UNIQUE,
+            tier TEXT DEFAULT 'public',
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT valid_amount CHECK (amount > 0),
+            CONSTRAINT valid_wallet_address CHECK (LENGTH(wallet_address) >= 32 AND LENGTH(wallet_address) <= 44)
+        );
+        CREATE TABLE IF NOT EXISTS distribution_records (
+            wallet_address TEXT PRIMARY KEY,
+            total_contributed NUMERIC DEFAULT 0,
+            token_allocation NUMERIC DEFAULT 0,
+            distribution_status TEXT DEFAULT 'pending',
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT valid_wallet_address CHECK (LENGTH(wallet_address) >= 32 AND LENGTH(wallet_address) <= 44)
+        );
+        CREATE TEMP TABLE IF NOT EXISTS contribution_staging (
+            wallet_address TEXT NOT NULL,
+            amount NUMERIC NOT NULL,
+            transaction_id TEXT NOT NULL,
+            created_at TEXT
+        );
+    """
+    STAGE = (f"INSERT INTO contribution_staging ({', '.join(STAGING_COLUMNS)}) "
+             f"VALUES ({', '.join('?' * len(STAGING_COLUMNS))})")
+    # "WHERE true" keeps SQLite from reading ON CONFLICT as part of the SELECT's join
+    INSERT = """
+        INSERT INTO contributions (wallet_address, amount, transaction_id, created_at)
+        SELECT wallet_address, amount, transaction_id, COALESCE(created_at, CURRENT_TIMESTAMP)
+        FROM contribution_staging WHERE true
+        ON CONFLICT (transaction_id) DO NOTHING
+    """
+    RECOMPUTE = """
+        INSERT INTO distribution_records (wallet_address, total_contributed, updated_at)
+        SELECT wallet_address, SUM(amount), CURRENT_TIMESTAMP FROM contributions
+        WHERE wallet_address IN (SELECT wallet_address FROM contribution_staging)
+        GROUP BY wallet_address
+        ON CONFLICT (wallet_address) DO UPDATE
+        SET total_contributed = excluded.total_contributed, updated_at = excluded.updated_at
+        WHERE total_contributed IS NOT excluded.total_contributed
+    """
+
+    def __init__(self, path, **options):
+        super().__init__(**options)
+        self.path = path
+        self.errors = (sqlite3.Error,)
+        # The monitor loads from worker threads, one batch at a time
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.executescript(self.SCHEMA)
+
+    def _load(self, rows):
+        rows = [(sender, str(amount), signature, created_at.strftime("%Y-%m-%d %H:%M:%S") if created_at else None)
+                for sender, amount, signature, created_at in rows]
+        db = self.connection
+        db.execute("BEGIN")
+        try:
+            db.executemany(self.STAGE, rows)
+            db.execute(self.INSERT)
+            db.execute(self.RECOMPUTE)
+            db.execute("DELETE FROM contribution_staging")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def _close(self):
+        self.connection.close()
+
+
+def open_sink(url, **options):
+    """A sink for a ``postgresql://`` or ``sqlite:///path`` database URL"""
+    if url.startswith(("postgresql://", "postgres://")):
+        return PostgresSink(url, **options)
+    if url.startswith("sqlite://"):
+        # sqlite:///relative.db, sqlite:////absolute.db, or sqlite:// for an in-memory database
+        return SqliteSink(url[len("sqlite:///"):] or ":memory:", **options)
+    raise ValueError(f"unsupported database URL {url!r}: expected postgresql:// or sqlite:///")
@@ -0,0 +1,99 @@
+"""Scan several watched wallets at once.
+
+Each scanner used to track a single hard-coded wallet and locate it with a
+linear scan of the account keys, so following N wallets meant N complete
+passes over overlapping histories. ``MultiWalletScanner`` pages every watched
+address's signatures concurrently, fetches each transaction once even when
+several watched wallets appear in it, and ``WalletIndex`` attributes balance
+deltas to all of them in one pass over the account keys using a dict lookup.
+
+    scanner = MultiWalletScanner(client, watched_wallets())
+    async for activity in scanner.run():
+        activity["deltas"]  # {address: lamports}
+"""
+import asyncio
+
+from .pipeline import _DONE, SignaturePipeline
+
+
+class WalletIndex:
+    """Hashed lookup of watched addresses (address -> label)"""
+
+    def __init__(self, wallets):
+        self.wallets = dict(wallets)
+
+    def __contains__(self, address):
+        return address in self.wallets
+
+    def label(self, address):
+        return self.wallets.get(address, address)
+
+    def deltas(self, tx_data):
+        """Lamport balance change of every watched account in a transaction"""
+        meta = tx_data.get("meta") if tx_data else None
+        if not meta:
+            return {}
+
+        pre_balances, post_balances = meta["preBalances"], meta["postBalances"]
+        deltas = {}
+        for i, key in enumerate(tx_data["transaction"]["message"]["accountKeys"][:len(pre_balances)]):
+            if isinstance(key, dict):
+                key = key["pubkey"]
+            if key in self.wallets and key not in deltas:
+                deltas[key] = post_balances[i] - pre_balances[i]
+        return deltas
+
+    def activity(self, sig_data, tx_data):
+        """Record of a transaction's effect on the watched wallets, or None if it moved nothing"""
+        deltas = {address: delta for address, delta in self.deltas(tx_data).items() if delta}
+        if not deltas:
+            return None
+        return {
+            "signature": sig_data["signature"],
+            "slot": tx_data.get("slot", sig_data.get("slot")),
+            "timestamp": tx_data.get("blockTime") or sig_data.get("blockTime") or 0,
+            "success": not tx_data["meta"].get("err"),
+            "fee": tx_data["meta"].get("fee", 0),
+            "deltas": deltas
+        }
+
+
+class MultiWalletScanner(SignaturePipeline):
+    """``SignaturePipeline`` over the union of several addresses' histories.
+
+    ``until`` maps addresses to the signature to stop at. Signatures shared
+    between watched wallets are fetched once; ``duplicates`` counts the
+    fetches that saved. ``complete`` is only true if every address's
+    pagination finished, and ``newest_by_address`` holds each one's newest
+    entry for advancing watermarks. ``max_signatures`` applies per address.
+    """
+
+    def __init__(self, client, wallets, extract=None, until=None, **kwargs):
+        self.index = WalletIndex(wallets)
+        super().__init__(client, None, extract or self.index.activity, **kwargs)
+        self.addresses = list(self.index.wallets)
+        self.untils = until or {}
+        self.completed = {}
+        self.duplicates = 0
+        self._claimed = set()
+
+    async def _produce(self, chunks):
+        try:
+            # One pager per address, all feeding the same workers
+            results = await asyncio.gather(*(self._page(address, self.untils.get(address), chunks)
+                                             for address in self.addresses))
+            self.completed = dict(zip(self.addresses, results))
+            self.complete = all(results)
+        finally:
+            for _ in range(self.workers):
+                await chunks.put(_DONE)
+
+    def _claim(self, page):
+        wanted = []
+        for entry in page:
+            if entry["signature"] in self._claimed:
+                self.duplicates += 1
+            else:
+                self._claimed.add(entry["signature"])
+                wanted.append(entry)
+        return wanted
@@ -0,0 +1,88 @@
+"""Persisted sync watermarks for incremental treasury scans.
+
+A watermark is the newest signature (and its slot) a scan has fully processed
+for a wallet. Passing it as ``until`` to getSignaturesForAddress returns only
+the signatures that arrived since, so a periodic rescan costs O(new
+transactions) instead of paging back through the whole history.
+"""
+import json
+import os
+import time
+
+WATERMARK_PATH = os.environ.get("SOLANA_WATERMARK_FILE", "sync_state.json")
+
+
+class WatermarkStore:
+    """Per-scope, per-wallet watermarks kept in a small JSON file"""
+
+    def __init__(self, scope, path=WATERMARK_PATH):
+        self.scope = scope
+        self.path = path
+        self._state = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self._state = json.load(f)
+
+    def get(self, address):
+        """Return {"signature", "slot", "updated_at"} for an address, or None"""
+        return self._state.get(self.scope, {}).get(address)
+
+    def until(self, address):
+        """Signature to pass as ``until`` for the next incremental fetch"""
+        watermark = self.get(address)
+        return watermark["signature"] if watermark else None
+
+    def advance(self, address, signatures, failed=()):
+        """Move the watermark up to the newest signature that is safe to skip next time.
+
+        ``signatures`` are getSignaturesForAddress entries, newest first. If
+        any of them failed to process, the watermark stops below the oldest
+        failure so that it is retried on the next run.
+        """
+        failed = set(failed)
+        start = 0
+        for i, entry in enumerate(signatures):
+            if entry["signature"] in failed:
+                start = i + 1
+        if start >= len(signatures):
+            return self.get(address)
+
+        newest = signatures[start]
+        watermark = {
+            "signature": newest["signature"],
+            "slot": newest.get("slot"),
+            "updated_at": int(time.time())
+        }
+        self._state.setdefault(self.scope, {})[address] = watermark
+        return watermark
+
+    def save(self):
+        """Write the state atomically so a crash never leaves a torn file"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+def merge_by_signature(existing, new):
+    """Merge two record lists, keeping one record per signature (new wins).
+
+    Records may be dicts or record objects (see ``records``).
+    """
+    merged = {_signature(record): record for record in existing}
+    merged.update((_signature(record), record) for record in new)
+    return list(merged.values())
+
+
+def _signature(record):
+    return record["signature"] if isinstance(record, dict) else record.signature
+
+
+def load_json(path, default):
+    """Load a previous output file, or return default if there is none"""
+    if not os.path.exists(path):
+        return default
+    with open(path) as f:
+        return json.load(f)